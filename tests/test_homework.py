@@ -5,6 +5,7 @@ from django.contrib.admin.sites import site
 from django.contrib.auth import get_user_model
 from django.db.models import fields
 from django.template.loader import select_template
+from django.utils import timezone
 
 try:
     from posts.models import Post
@@ -47,7 +48,10 @@ class TestPost:
         assert type(pub_date_field) == fields.DateTimeField, (
             'Свойство `pub_date` модели `Post` должно быть датой и время `DateTimeField`'
         )
-        assert pub_date_field.auto_now_add, 'Свойство `pub_date` модели `Post` должно быть `auto_now_add`'
+        assert pub_date_field.default is timezone.now and not pub_date_field.editable, (
+            'Свойство `pub_date` модели `Post` должно заполняться датой создания: '
+            '`default=timezone.now, editable=False`'
+        )
 
         author_field = search_field(model_fields, 'author_id')
         assert author_field is not None, 'Добавьте пользователя, автор который создал событие `author` модели `Post`'
@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+User = get_user_model()
+
+
+def get_cache():
+    return caches[settings.AUTH_USER_CACHE_ALIAS]
+
+
+def ensure_shared_caches():
+    """Вне DEBUG сессии, пользователи и корзины ограничения запросов не
+    должны жить в памяти процесса: другие процессы не увидели бы
+    выхода, смены пароля и блокировки, а каждый из N процессов
+    пропускал бы свою долю запросов и лимит вырос бы в N раз."""
+    if settings.DEBUG:
+        return
+    aliases = {
+        'SESSION_CACHE_ALIAS': settings.SESSION_CACHE_ALIAS,
+        'AUTH_USER_CACHE_ALIAS': settings.AUTH_USER_CACHE_ALIAS,
+        'THROTTLE_CACHE_ALIAS': settings.THROTTLE_CACHE_ALIAS,
+    }
+    for setting, alias in aliases.items():
+        if isinstance(caches[alias], LocMemCache):
+            raise ImproperlyConfigured(
+                f'{setting} = {alias!r} указывает на LocMemCache: нужен '
+                'общий для процессов кэш (memcached, redis, файлы)'
+            )
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя запроса из кэша.
+
+    Хэш пароля приходит вместе с пользователем, поэтому проверка
+    сессии в django.contrib.auth.get_user работает как раньше: после
+    смены пароля запись в кэше удаляется и старые сессии
+    разлогиниваются.
+    """
+
+    def get_user(self, user_id):
+        cache = get_cache()
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+            return user
+        return user if self.user_can_authenticate(user) else None
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    get_cache().delete(user_cache_key(instance.pk))
@@ -0,0 +1,28 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite с PRAGMA из OPTIONS и транзакциями BEGIN IMMEDIATE.
+
+    OPTIONS['pragmas'] выполняются на каждом новом соединении.
+    OPTIONS['transaction_mode'] задаёт вид BEGIN: при обычном DEFERRED
+    транзакция, начавшая с чтения, не может взять блокировку на запись и
+    сразу падает с «database is locked», не дожидаясь busy_timeout.
+    """
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pragmas', None)
+        params.pop('transaction_mode', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        pragmas = self.settings_dict['OPTIONS'].get('pragmas', {})
+        for name, value in pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode')
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
@@ -0,0 +1,98 @@
+import os
+import re
+
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loaders import base, cached, filesystem
+
+# Содержимое <pre> и <textarea> выводится как есть, его не трогаем
+PRESERVED = re.compile(r'(<(?:pre|textarea)\b.*?</(?:pre|textarea)\s*>)',
+                       re.S | re.I)
+INDENT = re.compile(r'[ \t\r]*\n\s*')
+# Строка только из тегов, которые сами ничего не выводят, оставляет
+# в странице лишь перевод строки. {% trans %}, {% url %}, {% include %}
+# и другие теги с выводом в этот список не входят
+SILENT_TAG = (
+    r'{%\s*(?:if|elif|else|for|empty|with|load|block|comment|end\w*)\b'
+    r'[^\n]*?%}'
+)
+TAG_LINE = re.compile(
+    rf'^((?:{SILENT_TAG}|{{#[^\n]*?#}})+)\n', re.M
+)
+
+
+def strip_whitespace(source):
+    """Убирает отступы, пустые строки и переводы строки после строк из
+    одних тегов без вывода.
+
+    Пробелы с переводом строки схлопываются в один перевод строки:
+    браузер показывает его так же, как пробел, и вывод страницы не
+    меняется.
+    """
+    parts = PRESERVED.split(source)
+    for index in range(0, len(parts), 2):
+        parts[index] = TAG_LINE.sub(r'\1', INDENT.sub('\n', parts[index]))
+    return ''.join(parts)
+
+
+def is_page(template_name):
+    """HTML-страница, в которой пробелы можно схлопнуть; текстовые
+    шаблоны вроде писем выводятся как есть."""
+    return template_name.endswith('.html') and 'email' not in template_name
+
+
+class FilesystemLoader(filesystem.Loader):
+    """Загрузчик шаблонов проекта, убирающий отступы в страницах.
+
+    Шаблоны приложений, в том числе django.contrib, читает обычный
+    app_directories.Loader: среди них есть текстовые письма.
+    """
+
+    def get_contents(self, origin):
+        contents = super().get_contents(origin)
+        if is_page(origin.template_name):
+            return strip_whitespace(contents)
+        return contents
+
+
+class CachedLoader(cached.Loader):
+    """Кэширует скомпилированные шаблоны на время жизни процесса.
+
+    В режиме отладки шаблоны читаются заново, чтобы правки были видны
+    без перезапуска сервера.
+    """
+
+    def get_template(self, template_name, skip=None):
+        if self.engine.debug:
+            return base.Loader.get_template(self, template_name, skip)
+        return super().get_template(template_name, skip)
+
+    def template_names(self):
+        names = set()
+        for loader in self.loaders:
+            for directory in loader.get_dirs():
+                for root, _, files in os.walk(directory):
+                    for name in files:
+                        if name.endswith('.html'):
+                            path = os.path.join(root, name)
+                            names.add(os.path.relpath(path, directory))
+        return sorted(name.replace(os.sep, '/') for name in names)
+
+    def warm(self):
+        """Компилирует все шаблоны заранее; возвращает их число."""
+        names = self.template_names()
+        for name in names:
+            self.get_template(name)
+        return len(names)
+
+
+def warm_templates():
+    """Прогрев кэша шаблонов при старте процесса."""
+    count = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for loader in backend.engine.template_loaders:
+            if isinstance(loader, CachedLoader) and not loader.engine.debug:
+                count += loader.warm()
+    return count
@@ -0,0 +1,229 @@
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from io import BytesIO
+from urllib.parse import urlencode
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY
+from django.contrib.auth import SESSION_KEY
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.http import HttpRequest
+from django.middleware.csrf import get_token
+from django.urls import get_resolver, reverse
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(values, percent):
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(
+        values, n=100, method='inclusive')[percent - 1]
+
+
+def login_cookie(user):
+    """Создаёт сессию пользователя и возвращает значение заголовка Cookie.
+    """
+    engine = import_module(settings.SESSION_ENGINE)
+    session = engine.SessionStore()
+    session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    return f'{settings.SESSION_COOKIE_NAME}={session.session_key}'
+
+
+class Route:
+    def __init__(self, name, path, cookie=None, method='GET', query=''):
+        self.name = name
+        self.path = path
+        self.cookie = cookie
+        self.method = method
+        self.query = query
+
+
+# Маршруты posts, которым нужен вошедший пользователь, и изменяющие
+# маршруты, которые принимают только POST
+LOGIN_REQUIRED = {
+    'post_create', 'post_edit', 'follow_index', 'profile_follow',
+    'profile_unfollow',
+}
+POST_ONLY = {'profile_follow', 'profile_unfollow'}
+QUERIES = {'search': urlencode({'q': 'пост'})}
+
+
+def csrf_cookie():
+    """Cookie и заголовок CSRF для POST-маршрутов нагрузки."""
+    request = HttpRequest()
+    token = get_token(request)
+    cookie = f'{settings.CSRF_COOKIE_NAME}={request.META["CSRF_COOKIE"]}'
+    return cookie, token
+
+
+def posts_routes(post, group, author, cookie=None):
+    """Все маршруты posts.urls: аргументы адресов берутся из
+    существующих строк по имени параметра, поэтому новые маршруты
+    попадают в нагрузку без правок здесь."""
+    arguments = {
+        'slug': group.slug,
+        'username': author.username,
+        'post_id': post.id,
+    }
+    _, resolver = get_resolver().namespace_dict['posts']
+    routes = []
+    for pattern in resolver.url_patterns:
+        kwargs = {
+            name: arguments[name] for name in pattern.pattern.converters
+        }
+        route = Route(
+            f'posts:{pattern.name}',
+            reverse(f'posts:{pattern.name}', kwargs=kwargs),
+            query=QUERIES.get(pattern.name, ''),
+        )
+        if pattern.name in LOGIN_REQUIRED:
+            route.cookie = cookie
+        if pattern.name in POST_ONLY:
+            route.method = 'POST'
+        routes.append(route)
+    return routes
+
+
+def build_routes(post, group, author, viewer=None):
+    """Маршруты posts, users и about с аргументами из существующих строк.
+
+    Без viewer страницы, требующие входа, проверяются как редирект
+    анонимного читателя. Выход проверяется только анонимно: он сбросил бы
+    сессию нагрузки.
+    """
+    cookie = login_cookie(viewer) if viewer is not None else None
+    routes = posts_routes(post, group, author, cookie)
+    routes += [
+        Route('users:signup', reverse('users:signup')),
+        Route('users:login', reverse('users:login')),
+        Route('users:logged_out', reverse('users:logged_out')),
+        Route('about:author', reverse('about:author')),
+        Route('about:tech', reverse('about:tech')),
+    ]
+    return routes
+
+
+class LoadDriver:
+    """Гоняет запросы через WSGIHandler в нескольких потоках и собирает
+    задержки и число SQL-запросов по каждому маршруту."""
+
+    def __init__(self, routes, requests, concurrency=1, seed=None):
+        self.routes = routes
+        self.requests = requests
+        self.concurrency = concurrency
+        self.random = random.Random(seed)
+        self.handler = WSGIHandler()
+        self.lock = threading.Lock()
+        self.samples = {route.name: [] for route in routes}
+        self.csrf = csrf_cookie()
+
+    def environ(self, route):
+        environ = {
+            'PATH_INFO': route.path,
+            'QUERY_STRING': route.query,
+            'REQUEST_METHOD': route.method,
+            'SERVER_NAME': 'localhost',
+            'wsgi.input': BytesIO(),
+        }
+        cookies = [route.cookie] if route.cookie else []
+        if route.method == 'POST':
+            cookie, token = self.csrf
+            cookies.append(cookie)
+            environ['HTTP_X_CSRFTOKEN'] = token
+            environ['CONTENT_TYPE'] = 'application/x-www-form-urlencoded'
+            environ['CONTENT_LENGTH'] = '0'
+        if cookies:
+            environ['HTTP_COOKIE'] = '; '.join(cookies)
+        setup_testing_defaults(environ)
+        return environ
+
+    def call(self, route):
+        counter = QueryCounter()
+        statuses = []
+
+        def start_response(status, headers, exc_info=None):
+            statuses.append(int(status.split()[0]))
+
+        started = time.perf_counter()
+        with connections['default'].execute_wrapper(counter):
+            response = self.handler(self.environ(route), start_response)
+            for _ in response:
+                pass
+            response.close()
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.samples[route.name].append(
+                (elapsed, counter.count, statuses[0]))
+
+    def worker(self, plan):
+        try:
+            for route in plan:
+                self.call(route)
+        finally:
+            if self.concurrency > 1:
+                connections.close_all()
+
+    def run(self):
+        plan = [self.random.choice(self.routes) for _ in range(self.requests)]
+        started = time.perf_counter()
+        if self.concurrency == 1:
+            self.worker(plan)
+        else:
+            chunks = [plan[i::self.concurrency]
+                      for i in range(self.concurrency)]
+            with ThreadPoolExecutor(self.concurrency) as executor:
+                list(executor.map(self.worker, chunks))
+        return self.report(time.perf_counter() - started)
+
+    def summary(self, samples):
+        latencies = sorted(elapsed * 1000 for elapsed, _, _ in samples)
+        queries = [count for _, count, _ in samples]
+        return {
+            'requests': len(samples),
+            'errors': sum(1 for _, _, status in samples if status >= 500),
+            'latency_ms': {
+                'p50': percentile(latencies, 50),
+                'p95': percentile(latencies, 95),
+                'p99': percentile(latencies, 99),
+                'max': latencies[-1] if latencies else None,
+            },
+            'queries_per_request': {
+                'mean': statistics.mean(queries) if queries else None,
+                'max': max(queries) if queries else None,
+            },
+        }
+
+    def report(self, duration):
+        all_samples = [
+            sample for samples in self.samples.values() for sample in samples
+        ]
+        total = self.summary(all_samples)
+        total['duration_s'] = duration
+        total['throughput_rps'] = len(all_samples) / duration
+        return {
+            'concurrency': self.concurrency,
+            'total': total,
+            'routes': {
+                name: self.summary(samples)
+                for name, samples in self.samples.items() if samples
+            },
+        }
@@ -0,0 +1,60 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Post
+
+# Сессии в базе и пользователь из базы на каждом запросе
+DB_AUTH = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+    'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает число SQL-запросов на страницу для сессий и '
+        'пользователя из базы и из кэша'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20)
+
+    def handle(self, *args, **options):
+        post = Post.objects.select_related('author', 'group').filter(
+            group__isnull=False).first()
+        if post is None:
+            raise CommandError(
+                'Нужен пост с группой: заполните базу командой seed_dataset'
+            )
+        urls = [
+            reverse('posts:index'),
+            reverse('posts:group_list', args=[post.group.slug]),
+            reverse('posts:profile', args=[post.author.username]),
+            reverse('posts:post_detail', args=[post.id]),
+        ]
+        with override_settings(**DB_AUTH):
+            before = self.measure(urls, post.author, options['requests'])
+        after = self.measure(urls, post.author, options['requests'])
+        report = {
+            url: {'db': before[url], 'cached': after[url]} for url in urls
+        }
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+
+    def measure(self, urls, user, requests):
+        """Среднее число запросов на страницу после прогрева кэшей."""
+        clients = {'anonymous': Client(), 'authenticated': Client()}
+        clients['authenticated'].force_login(user)
+        result = {url: {} for url in urls}
+        for name, client in clients.items():
+            for url in urls:
+                client.get(url)
+                with CaptureQueriesContext(connections['default']) as queries:
+                    for _ in range(requests):
+                        client.get(url)
+                result[url][name] = len(queries) / requests
+        return result
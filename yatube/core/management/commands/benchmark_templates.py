@@ -0,0 +1,73 @@
+import copy
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+# Загрузчики Django по умолчанию: шаблон с отступами, без кэша
+PLAIN_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def plain_templates():
+    templates = copy.deepcopy(settings.TEMPLATES)
+    for template in templates:
+        template['OPTIONS']['loaders'] = PLAIN_LOADERS
+    return templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает размер страниц и время ответа с обычными загрузчиками '
+        'шаблонов и с загрузчиком без отступов и с кэшем'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20)
+
+    def handle(self, *args, **options):
+        post = Post.objects.select_related('author', 'group').filter(
+            group__isnull=False).first()
+        if post is None:
+            raise CommandError(
+                'Нужен пост с группой: заполните базу командой seed_dataset'
+            )
+        urls = [
+            reverse('posts:index'),
+            reverse('posts:group_list', args=[post.group.slug]),
+            reverse('posts:profile', args=[post.author.username]),
+            reverse('posts:post_detail', args=[post.id]),
+        ]
+        # DEBUG отключает кэш шаблонов, замер идёт как в продакшене
+        with override_settings(DEBUG=False):
+            with override_settings(TEMPLATES=plain_templates()):
+                before = self.measure(urls, options['requests'])
+            after = self.measure(urls, options['requests'])
+        report = {}
+        for url in urls:
+            report[url] = {
+                'bytes': {'plain': before[url][0], 'stripped': after[url][0]},
+                'bytes_saved': before[url][0] - after[url][0],
+                'ms': {'plain': before[url][1], 'stripped': after[url][1]},
+            }
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+
+    def measure(self, urls, requests):
+        """Размер страницы и среднее время ответа в миллисекундах."""
+        client = Client()
+        result = {}
+        for url in urls:
+            size = len(client.get(url).content)
+            started = time.perf_counter()
+            for _ in range(requests):
+                client.get(url)
+            elapsed = (time.perf_counter() - started) / requests
+            result[url] = (size, round(elapsed * 1000, 3))
+        return result
@@ -0,0 +1,51 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.loadtest import LoadDriver, build_routes
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогоняет запросы ко всем страницам через WSGI-обработчик и '
+        'выводит задержки, число SQL-запросов и пропускную способность '
+        'в JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument(
+            '--post-id', type=int, default=None,
+            help='Пост для страниц поста; по умолчанию последний с группой'
+        )
+        parser.add_argument(
+            '--anonymous', action='store_true',
+            help='Не входить под автором поста на страницах с авторизацией'
+        )
+        parser.add_argument('--output', default=None)
+
+    def handle(self, *args, **options):
+        posts = Post.objects.select_related('author', 'group')
+        if options['post_id'] is not None:
+            post = posts.filter(pk=options['post_id']).first()
+        else:
+            post = posts.filter(group__isnull=False).first()
+        if post is None or post.group is None:
+            raise CommandError(
+                'Нужен пост с группой: заполните базу командой seed_dataset'
+            )
+        viewer = None if options['anonymous'] else post.author
+        driver = LoadDriver(
+            build_routes(post, post.group, post.author, viewer),
+            requests=options['requests'],
+            concurrency=options['concurrency'],
+            seed=options['seed'],
+        )
+        report = json.dumps(driver.run(), indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(report)
+        self.stdout.write(report)
@@ -0,0 +1,192 @@
+import heapq
+import json
+import logging
+import mimetypes
+import os
+import re
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import connections
+from django.http import FileResponse
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from core.routers import read_alias
+
+logger = logging.getLogger('core.query_budget')
+
+# Имя с хешем содержимого от ManifestStaticFilesStorage: name.<12 hex>.ext
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+# Сначала лучший вариант сжатия
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class QueryStats:
+    """Число запросов, суммарное время в базе и самые медленные запросы."""
+
+    def __init__(self, keep_slowest):
+        self.count = 0
+        self.duration = 0.0
+        self.keep_slowest = keep_slowest
+        self.slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            entry = (elapsed, self.count, sql)
+            if len(self.slowest) < self.keep_slowest:
+                heapq.heappush(self.slowest, entry)
+            elif self.slowest and elapsed > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def slowest_statements(self):
+        return [
+            {'sql': sql, 'ms': round(elapsed * 1000, 3)}
+            for elapsed, _, sql in sorted(self.slowest, reverse=True)
+        ]
+
+
+class QueryBudgetMiddleware:
+    """Считает SQL-запросы запроса и сверяет их с бюджетом из
+    settings.SQL_BUDGETS по имени URL.
+
+    Итог пишется в лог строкой JSON и в заголовок Server-Timing; при
+    превышении бюджета строка уходит в лог с уровнем WARNING.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats(settings.SQL_BUDGET_SLOWEST)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        url_name = match.view_name if match else None
+        budget = settings.SQL_BUDGETS.get(url_name)
+        response.query_stats = stats
+        response.query_budget = budget
+
+        timing = f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} q"'
+        if response.has_header('Server-Timing'):
+            timing = f'{response["Server-Timing"]}, {timing}'
+        response['Server-Timing'] = timing
+
+        exceeded = budget is not None and stats.count > budget
+        level = logging.WARNING if exceeded else logging.INFO
+        if logger.isEnabledFor(level):
+            logger.log(level, json.dumps({
+                'path': request.path,
+                'url_name': url_name,
+                'status': response.status_code,
+                'queries': stats.count,
+                'db_ms': round(stats.duration * 1000, 3),
+                'budget': budget,
+                'exceeded': exceeded,
+                'slowest': stats.slowest_statements(),
+            }, ensure_ascii=False))
+        return response
+
+
+class ReadReplicaMiddleware:
+    """Включает чтение из реплики для представлений с @read_replica.
+
+    После POST и других изменяющих запросов клиент получает cookie и на
+    время отставания реплики читает из основной базы, чтобы видеть свои
+    изменения.
+    """
+
+    pin_cookie = 'read_primary'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.read_alias_token = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request.read_alias_token is not None:
+                read_alias.reset(request.read_alias_token)
+        replicated = settings.DATABASE_READ_ALIAS != 'default'
+        if replicated and request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            response.set_cookie(
+                self.pin_cookie, '1', max_age=settings.DATABASE_REPLICA_LAG,
+                httponly=True, samesite='Lax'
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        alias = settings.DATABASE_READ_ALIAS
+        if (
+            alias != 'default'
+            and getattr(view_func, 'read_replica', False)
+            and request.method in ('GET', 'HEAD')
+            and self.pin_cookie not in request.COOKIES
+        ):
+            request.read_alias_token = read_alias.set(alias)
+
+
+class StaticFilesMiddleware:
+    """Отдаёт файлы STATIC_ROOT, выбирая заранее сжатый вариант по
+    Accept-Encoding.
+
+    Файлы с хешем в имени не меняются, поэтому кэшируются на год с
+    immutable; остальные клиент перепроверяет при каждом запросе.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = None
+        if (
+            settings.STATIC_ROOT
+            and request.method in ('GET', 'HEAD')
+            and request.path.startswith(settings.STATIC_URL)
+        ):
+            response = self.serve(request)
+        return response or self.get_response(request)
+
+    def serve(self, request):
+        name = request.path[len(settings.STATIC_URL):]
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+        accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        encoding = None
+        for candidate, suffix in ENCODINGS:
+            if candidate in accepted and os.path.isfile(path + suffix):
+                encoding = candidate
+                path += suffix
+                break
+        content_type, _ = mimetypes.guess_type(name)
+        response = FileResponse(
+            open(path, 'rb'),
+            content_type=content_type or 'application/octet-stream'
+        )
+        if encoding:
+            response['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if HASHED_NAME.search(name):
+            patch_cache_control(
+                response, public=True, max_age=365 * 24 * 60 * 60,
+                immutable=True
+            )
+        else:
+            patch_cache_control(response, public=True, no_cache=True)
+        return response
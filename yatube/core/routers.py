@@ -0,0 +1,36 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Алиас базы для чтения в текущем запросе; None — основная база
+read_alias = ContextVar('read_alias', default=None)
+
+
+def read_replica(view_func):
+    """Помечает представление только для чтения: его запросы на чтение
+    уходят в settings.DATABASE_READ_ALIAS."""
+    view_func.read_replica = True
+    return view_func
+
+
+class ReadReplicaRouter:
+    """Чтение в представлениях только для чтения — из реплики, всё
+    остальное — из основной базы."""
+
+    def db_for_read(self, model, **hints):
+        return read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика — копия основной базы, связи между ними допустимы
+        aliases = {'default', settings.DATABASE_READ_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db != 'default' and db == settings.DATABASE_READ_ALIAS:
+            return False
+        return None
@@ -0,0 +1,204 @@
+import gzip
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Текстовые форматы, которые имеет смысл сжимать заранее
+COMPRESSIBLE = ('.css', '.js', '.svg', '.ico', '.txt', '.json', '.map')
+
+COMMENT = re.compile(r'/\*(?!!).*?\*/', re.S)
+BANNER = re.compile(r'/\*!.*?\*/', re.S)
+TOKEN = re.compile(r'[\w-]+')
+CLASS_NAME = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+NEGATION = re.compile(r':not\([^)]*\)')
+# Внутри этих блоков правила, а не объявления: в них ищем селекторы
+NESTED_AT_RULES = ('@media', '@supports')
+
+
+def template_tokens():
+    """Все слова из шаблонов каталогов TEMPLATES: имена классов среди
+    них, в том числе аргументы фильтра addclass."""
+    tokens = set(settings.STATIC_CSS_SAFELIST)
+    for template in settings.TEMPLATES:
+        for directory in template['DIRS']:
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    if name.endswith('.html'):
+                        path = os.path.join(root, name)
+                        with open(path, encoding='utf-8') as file:
+                            tokens.update(TOKEN.findall(file.read()))
+    return tokens
+
+
+def find_block_end(css, start):
+    """Индекс закрывающей скобки блока, открытого в css[start]."""
+    depth = 0
+    quote = None
+    escaped = False
+    for index in range(start, len(css)):
+        char = css[index]
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return index
+    raise ValueError('Незакрытый блок CSS')
+
+
+def split_selectors(prelude):
+    """Делит список селекторов по запятым верхнего уровня."""
+    selectors = []
+    depth = 0
+    current = ''
+    for char in prelude:
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        if char == ',' and depth == 0:
+            selectors.append(current)
+            current = ''
+        else:
+            current += char
+    selectors.append(current)
+    return [selector.strip() for selector in selectors if selector.strip()]
+
+
+def selector_used(selector, used):
+    # .btn:not(.disabled) нужен и тогда, когда .disabled не встречается
+    classes = CLASS_NAME.findall(NEGATION.sub('', selector))
+    return all(name in used for name in classes)
+
+
+def purge_rules(css, used):
+    """Оставляет правила, все классы селектора которых используются.
+
+    Блоки @media и @supports разбираются рекурсивно, остальные
+    at-правила (@font-face, @keyframes) сохраняются как есть.
+    """
+    kept = []
+    position = 0
+    while True:
+        start = css.find('{', position)
+        if start == -1:
+            break
+        prelude = css[position:start].strip()
+        end = find_block_end(css, start)
+        body = css[start + 1:end]
+        position = end + 1
+        # Правила без блока (@charset, @import) стоят перед селектором
+        while prelude.startswith('@') and ';' in prelude:
+            statement, prelude = prelude.split(';', 1)
+            kept.append(statement + ';')
+            prelude = prelude.strip()
+        if prelude.startswith(NESTED_AT_RULES):
+            inner = purge_rules(body, used)
+            if inner:
+                kept.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@'):
+            kept.append(f'{prelude}{{{body}}}')
+        else:
+            selectors = [
+                selector for selector in split_selectors(prelude)
+                if selector_used(selector, used)
+            ]
+            if selectors:
+                kept.append(f'{",".join(selectors)}{{{body}}}')
+    return ''.join(kept)
+
+
+def purge_css(css, used):
+    """Убирает из таблицы стилей правила для неиспользуемых классов.
+
+    Комментарии /*! с лицензией переносятся в конец: в начале файла
+    может стоять только @charset.
+    """
+    css = COMMENT.sub('', css)
+    banners = BANNER.findall(css)
+    return purge_rules(BANNER.sub('', css), used) + ''.join(banners)
+
+
+def compress(data):
+    """Сжатые варианты файла: расширение -> содержимое."""
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data)
+    return {
+        suffix: content for suffix, content in variants.items()
+        if len(content) < len(data)
+    }
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хешем содержимого в имени и заранее сжатыми копиями.
+
+    При collectstatic из файлов settings.STATIC_CSS_PURGE удаляются
+    правила для классов, которых нет в шаблонах; хеш считается уже по
+    урезанному файлу. Рядом с каждым текстовым файлом кладутся .gz и,
+    если установлен пакет brotli, .br.
+    """
+
+    # Файл, которого нет в манифесте, хешируется по собранной копии;
+    # если нет и её, ValueError доходит до шаблона
+    manifest_strict = False
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            return
+        self.purge_unused_css(paths)
+        yield from super().post_process(paths, dry_run, **options)
+        for name in self.compressible_names(paths):
+            with self.open(name) as file:
+                data = file.read()
+            for suffix, content in compress(data).items():
+                if self.exists(name + suffix):
+                    self.delete(name + suffix)
+                self._save(name + suffix, ContentFile(content))
+
+    def purge_unused_css(self, paths):
+        purge = [name for name in settings.STATIC_CSS_PURGE if name in paths]
+        if not purge:
+            return
+        used = template_tokens()
+        for name in purge:
+            storage, path = paths[name]
+            with storage.open(path) as file:
+                css = file.read().decode('utf-8')
+            if self.exists(name):
+                self.delete(name)
+            self._save(name, ContentFile(purge_css(css, used).encode()))
+            # Хеш и копия с хешем строятся из урезанного файла
+            paths[name] = (self, name)
+
+    def compressible_names(self, paths):
+        for name in paths:
+            if name.endswith(COMPRESSIBLE):
+                yield name
+                hashed = self.hashed_files.get(self.hash_key(name))
+                if hashed and hashed != name:
+                    yield hashed
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            # Манифеста нет, collectstatic ещё не запускался (разработка,
+            # тесты): ссылка ведёт на исходный файл
+            return name
+        return super().stored_name(name)
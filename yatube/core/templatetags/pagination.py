@@ -0,0 +1,38 @@
+from django import template
+
+register = template.Library()
+
+# Сколько соседних страниц показывать по обе стороны от текущей
+PAGE_WINDOW = 2
+
+
+@register.simple_tag
+def page_window(page_obj, size=PAGE_WINDOW):
+    """Номера страниц вокруг текущей плюс первая и последняя; None —
+    пропуск между ними.
+
+    Без числа страниц (NoCountPaginator) последняя страница неизвестна:
+    окно заканчивается следующей страницей и пропуском, если она есть.
+    """
+    number = page_obj.number
+    first = max(1, number - size)
+    if getattr(page_obj.paginator, 'counts_pages', True):
+        last_page = page_obj.paginator.num_pages
+        pages = [1, *range(first, min(number + size, last_page) + 1)]
+        pages.append(last_page)
+        tail = []
+    else:
+        last = number + 1 if page_obj.has_next() else number
+        pages = [1, *range(first, last + 1)]
+        tail = [None] if page_obj.has_next() else []
+    window = []
+    previous = 0
+    for page in sorted(set(pages)):
+        # Пропуск в одну страницу короче показать номером
+        if page - previous == 2:
+            window.append(previous + 1)
+        elif page - previous > 2:
+            window.append(None)
+        window.append(page)
+        previous = page
+    return window + tail
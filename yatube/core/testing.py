@@ -0,0 +1,28 @@
+from django.conf import settings
+
+
+class QueryBudgetMixin:
+    """Проверки бюджетов SQL-запросов из settings.SQL_BUDGETS для TestCase.
+
+    Число запросов берётся из QueryBudgetMiddleware, поэтому тесты
+    считают ровно то же, что видно в логе и Server-Timing.
+    """
+
+    def assertQueryBudget(self, response, url_name=None):
+        stats = getattr(response, 'query_stats', None)
+        self.assertIsNotNone(
+            stats, 'QueryBudgetMiddleware не подключён в MIDDLEWARE')
+        match = response.resolver_match
+        url_name = url_name or (match.view_name if match else None)
+        self.assertIn(
+            url_name, settings.SQL_BUDGETS,
+            f'Для {url_name} не задан бюджет в SQL_BUDGETS'
+        )
+        budget = settings.SQL_BUDGETS[url_name]
+        statements = '\n'.join(
+            entry['sql'] for entry in stats.slowest_statements())
+        self.assertLessEqual(
+            stats.count, budget,
+            f'{url_name}: {stats.count} запросов при бюджете {budget}. '
+            f'Самые медленные:\n{statements}'
+        )
@@ -0,0 +1,103 @@
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """'10/m' -> токенов в секунду."""
+    count, period = rate.split('/')
+    return int(count) / PERIODS[period[0]]
+
+
+class TokenBucket:
+    """Корзина токенов: пополняется со скоростью rate до burst."""
+
+    def __init__(self, key, rate, burst):
+        self.key = key
+        self.rate = parse_rate(rate)
+        self.burst = burst
+        # Через столько секунд простоя корзина снова полна и не нужна
+        self.timeout = math.ceil(burst / self.rate) + 1
+
+    def tokens(self, state, now):
+        tokens, checked = state or (self.burst, now)
+        return min(self.burst, tokens + (now - checked) * self.rate)
+
+
+def take_tokens(buckets, cache=None):
+    """Берёт по токену из каждой корзины или возвращает, через сколько
+    секунд придёт недостающий токен; тогда токены не тратятся.
+
+    Состояние (токены, время) лежит в кэше: одно чтение и одна запись на
+    корзину, к базе проверка не обращается. Между чтением и записью
+    конкурентный запрос может потратить тот же токен; для защиты от
+    всплесков такой погрешности достаточно.
+    """
+    cache = cache or caches[settings.THROTTLE_CACHE_ALIAS]
+    now = time.time()
+    stored = cache.get_many([bucket.key for bucket in buckets])
+    remaining = {}
+    wait = 0.0
+    for bucket in buckets:
+        tokens = bucket.tokens(stored.get(bucket.key), now)
+        if tokens < 1:
+            wait = max(wait, (1 - tokens) / bucket.rate)
+        remaining[bucket] = tokens - 1
+    if wait:
+        return wait
+    for bucket, tokens in remaining.items():
+        cache.set(bucket.key, (tokens, now), bucket.timeout)
+    return 0.0
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def request_buckets(scope, request):
+    """Корзины запроса по settings.THROTTLE_RATES[scope]: 'user' —
+    для вошедшего пользователя, 'ip' — для адреса клиента."""
+    rates = settings.THROTTLE_RATES.get(scope, {})
+    buckets = []
+    if 'user' in rates and request.user.is_authenticated:
+        buckets.append(TokenBucket(
+            f'throttle:{scope}:user:{request.user.pk}', *rates['user']))
+    if 'ip' in rates:
+        buckets.append(TokenBucket(
+            f'throttle:{scope}:ip:{client_ip(request)}', *rates['ip']))
+    return buckets
+
+
+def too_many_requests(wait):
+    response = HttpResponse(
+        'Слишком много запросов, попробуйте позже',
+        status=429, content_type='text/plain; charset=utf-8'
+    )
+    response['Retry-After'] = str(math.ceil(wait))
+    return response
+
+
+def throttle(scope):
+    """Ограничивает изменяющие запросы представления; при исчерпании
+    корзины отвечает 429 с Retry-After.
+
+    Для корзины пользователя декоратор ставится под login_required,
+    чтобы пользователь уже был загружен.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            if request.method not in SAFE_METHODS:
+                wait = take_tokens(request_buckets(scope, request))
+                if wait:
+                    return too_many_requests(wait)
+            return view_func(request, *args, **kwargs)
+        return wrapped
+    return decorator
@@ -1,5 +1,44 @@
+from django.conf import settings
 from django.contrib import admin
-from posts.models import Post, Group
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import PermissionDenied
+from django.forms import ModelForm
+
+from posts.feed_cache import GROUPS_SCOPE, get_cache, get_generation
+from posts.models import Follow, Post, Group
+from posts.paginators import EstimatedCountPaginator
+
+
+class PreloadedAutocompleteSelect(AutocompleteSelect):
+    """Поле автодополнения, которое берёт выбранную группу из уже
+    загруженной строки вместо отдельного запроса на каждую строку."""
+
+    selected_objects = None
+
+    def optgroups(self, name, value, attr=None):
+        if self.selected_objects is None:
+            return super().optgroups(name, value, attr)
+        default = (None, [], 0)
+        if not self.is_required:
+            default[1].append(self.create_option(name, '', '', False, 0))
+        label = self.choices.field.label_from_instance
+        selected = {str(item) for item in value}
+        for index, obj in enumerate(self.selected_objects, start=1):
+            if str(obj.pk) in selected:
+                default[1].append(self.create_option(
+                    name, obj.pk, label(obj), True, index))
+        return [default]
+
+
+class PostChangelistForm(ModelForm):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        field = self.fields.get('group')
+        widget = getattr(field, 'widget', None)
+        widget = getattr(widget, 'widget', widget)
+        if isinstance(widget, PreloadedAutocompleteSelect):
+            group = self.instance.group if self.instance.group_id else None
+            widget.selected_objects = [group] if group else []
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -10,17 +49,64 @@ class PostAdmin(admin.ModelAdmin):
         'author',
         'group')
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
+    autocomplete_fields = ('group',)
+    raw_id_fields = ('author',)
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    date_hierarchy = 'pub_date'
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     empty_value_display = '-пусто-'
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'group':
+            kwargs['widget'] = PreloadedAutocompleteSelect(
+                db_field.remote_field, self.admin_site,
+                using=kwargs.get('using')
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_changelist_form(self, request, **kwargs):
+        kwargs.setdefault('form', PostChangelistForm)
+        return super().get_changelist_form(request, **kwargs)
+
 
 class GroupAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'title', 'slug', 'description')
+    list_display = ('pk', 'title', 'slug', 'description', 'posts_count')
     search_fields = ('title',)
-    list_filter = ('title',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     empty_value_display = '-пусто-'
 
+    def autocomplete_view(self, request):
+        # Ответы выбора группы общие для всех строк и всех сотрудников,
+        # поэтому кэшируем их до следующего изменения групп
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        cache = get_cache()
+        key = (
+            f'admin:group_autocomplete:{get_generation(GROUPS_SCOPE)}:'
+            f'{request.GET.urlencode()}'
+        )
+        response = cache.get(key)
+        if response is None:
+            response = super().autocomplete_view(request)
+            if response.status_code == 200:
+                cache.set(
+                    key, response, settings.POSTS_FEED_CACHE_TIMEOUT)
+        return response
+
+
+class FollowAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'user', 'author')
+    list_select_related = ('user', 'author')
+    raw_id_fields = ('user', 'author')
+    search_fields = ('user__username', 'author__username')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group, GroupAdmin)
+admin.site.register(Follow, FollowAdmin)
@@ -0,0 +1,269 @@
+import json
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.functions import Coalesce
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_safe
+
+from posts.conditional import Validators
+from posts.feed_cache import (
+    FEED_SHARED_SCOPES, GLOBAL_SCOPE, GROUPS_SCOPE, author_scope, get_cache,
+    group_scope
+)
+from posts.models import Group, Post, User
+from posts.paginators import TitleCursorPaginator
+from posts.views import POSTS_PER_PAGE, get_cursor_page
+
+MAX_LIMIT = 100
+
+# Имя поля в ответе -> выражение для values_list
+POST_FIELDS = {
+    'id': 'pk',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'updated_at': 'updated_at',
+    'author': 'author__username',
+    'group': 'group__slug',
+}
+GROUP_FIELDS = {
+    'id': 'pk',
+    'title': 'title',
+    'slug': 'slug',
+    'description': 'description',
+    'posts_count': 'posts_count',
+}
+PROFILE_FIELDS = {
+    'id': 'pk',
+    'username': 'username',
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'posts_count': 'author_posts_count',
+}
+# Без этих колонок не построить курсор
+CURSOR_COLUMNS = ('pk', 'pub_date')
+GROUP_CURSOR_COLUMNS = ('pk', 'title')
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def error_response(error):
+    return JsonResponse(
+        {'error': str(error)}, status=error.status,
+        json_dumps_params={'ensure_ascii': False}
+    )
+
+
+def selected_fields(request, available):
+    """Поля из ?fields=a,b; без параметра — все поля ресурса."""
+    raw = request.GET.get('fields')
+    if not raw:
+        return list(available)
+    fields = list(dict.fromkeys(
+        name.strip() for name in raw.split(',') if name.strip()
+    ))
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise ApiError(f'Неизвестные поля: {", ".join(unknown)}')
+    return fields
+
+
+def columns_for(fields, available, required=()):
+    columns = list(required)
+    for name in fields:
+        if available[name] not in columns:
+            columns.append(available[name])
+    return columns
+
+
+def serialize(row, fields, available):
+    return {name: getattr(row, available[name]) for name in fields}
+
+
+def get_limit(request):
+    try:
+        limit = int(request.GET.get('limit', POSTS_PER_PAGE))
+    except ValueError:
+        raise ApiError('limit должен быть числом')
+    return min(max(limit, 1), MAX_LIMIT)
+
+
+def page_link(request, cursor):
+    if cursor is None:
+        return None
+    params = request.GET.copy()
+    params['cursor'] = cursor
+    return f'{request.path}?{urlencode(sorted(params.items()))}'
+
+
+def cached_json(request, scopes, build):
+    """Ответ JSON с ETag по поколениям областей.
+
+    Тело кэшируется под ключом ETag, который включает путь и параметры
+    запроса; совпавший If-None-Match получает 304 без обращения к базе.
+    """
+    validators = Validators(
+        request, scopes, request.get_full_path(), per_viewer=False
+    )
+    response = validators.not_modified(request)
+    if response is None:
+        cache = get_cache()
+        key = f'posts:api:{validators.etag}'
+        content = cache.get(key)
+        if content is None:
+            try:
+                data = build()
+            except ApiError as error:
+                return error_response(error)
+            content = json.dumps(
+                data, cls=DjangoJSONEncoder, ensure_ascii=False
+            ).encode()
+            cache.set(key, content, settings.POSTS_FEED_CACHE_TIMEOUT)
+        response = HttpResponse(content, content_type='application/json')
+        validators.apply(response)
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+def posts_page(request, post_list):
+    fields = selected_fields(request, POST_FIELDS)
+    rows = post_list.values_list(
+        *columns_for(fields, POST_FIELDS, CURSOR_COLUMNS), named=True
+    )
+    page = get_cursor_page(request, rows, get_limit(request))
+    return {
+        'results': [serialize(row, fields, POST_FIELDS) for row in page],
+        'next': page_link(request, page.next_cursor),
+        'previous': page_link(request, page.previous_cursor),
+    }
+
+
+def find_group(slug):
+    group = Group.objects.filter(slug=slug).only('pk').first()
+    if group is None:
+        raise ApiError('Группа не найдена', status=404)
+    return group
+
+
+def find_author(username):
+    author = User.objects.filter(username=username).only('pk').first()
+    if author is None:
+        raise ApiError('Пользователь не найден', status=404)
+    return author
+
+
+@require_safe
+def post_list(request):
+    return cached_json(
+        request, (GLOBAL_SCOPE, *FEED_SHARED_SCOPES),
+        lambda: posts_page(request, Post.objects.all())
+    )
+
+
+@require_safe
+def post_detail(request, post_id):
+    try:
+        fields = selected_fields(request, POST_FIELDS)
+    except ApiError as error:
+        return error_response(error)
+    row = (
+        Post.objects.filter(pk=post_id)
+        .values_list(
+            *columns_for(fields, POST_FIELDS, ('author_id',)), named=True
+        )
+        .first()
+    )
+    if row is None:
+        return error_response(ApiError('Пост не найден', status=404))
+    return cached_json(
+        request, (author_scope(row.author_id), GROUPS_SCOPE),
+        lambda: serialize(row, fields, POST_FIELDS)
+    )
+
+
+@require_safe
+def group_list(request):
+    def build():
+        fields = selected_fields(request, GROUP_FIELDS)
+        rows = Group.objects.order_by('title', 'pk').values_list(
+            *columns_for(fields, GROUP_FIELDS, GROUP_CURSOR_COLUMNS),
+            named=True
+        )
+        paginator = TitleCursorPaginator(rows, get_limit(request))
+        page = paginator.get_cursor_page(request.GET.get('cursor'))
+        return {
+            'results': [serialize(row, fields, GROUP_FIELDS) for row in page],
+            'next': page_link(request, page.next_cursor),
+            'previous': page_link(request, page.previous_cursor),
+        }
+    # posts_count меняется с любым постом
+    return cached_json(request, (GLOBAL_SCOPE, GROUPS_SCOPE), build)
+
+
+@require_safe
+def group_detail(request, slug):
+    try:
+        group = find_group(slug)
+    except ApiError as error:
+        return error_response(error)
+
+    def build():
+        fields = selected_fields(request, GROUP_FIELDS)
+        row = Group.objects.filter(pk=group.pk).values_list(
+            *columns_for(fields, GROUP_FIELDS), named=True
+        ).get()
+        return serialize(row, fields, GROUP_FIELDS)
+    return cached_json(
+        request, (group_scope(group.pk), GROUPS_SCOPE), build
+    )
+
+
+@require_safe
+def group_posts(request, slug):
+    try:
+        group = find_group(slug)
+    except ApiError as error:
+        return error_response(error)
+    return cached_json(
+        request, (group_scope(group.pk), *FEED_SHARED_SCOPES),
+        lambda: posts_page(request, Post.objects.filter(group=group))
+    )
+
+
+@require_safe
+def profile_detail(request, username):
+    try:
+        author = find_author(username)
+    except ApiError as error:
+        return error_response(error)
+
+    def build():
+        fields = selected_fields(request, PROFILE_FIELDS)
+        row = (
+            User.objects.filter(pk=author.pk)
+            .annotate(
+                author_posts_count=Coalesce('stats__posts_count', 0)
+            )
+            .values_list(*columns_for(fields, PROFILE_FIELDS), named=True)
+            .get()
+        )
+        return serialize(row, fields, PROFILE_FIELDS)
+    return cached_json(request, (author_scope(author.pk),), build)
+
+
+@require_safe
+def profile_posts(request, username):
+    try:
+        author = find_author(username)
+    except ApiError as error:
+        return error_response(error)
+    return cached_json(
+        request, (author_scope(author.pk), GROUPS_SCOPE),
+        lambda: posts_page(request, Post.objects.filter(author=author))
+    )
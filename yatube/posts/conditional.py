@@ -0,0 +1,60 @@
+import hashlib
+import math
+import time
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from posts.feed_cache import get_generation, get_last_modified
+
+
+class Validators:
+    """ETag и Last-Modified страницы, собранные из поколений кэша лент.
+
+    Поколения меняются при любой записи в области, включая удаление
+    постов, поэтому для проверки не нужны запросы к базе.
+    """
+
+    def __init__(self, request, scopes, position='', per_viewer=True):
+        viewer = ''
+        if per_viewer and request.user.is_authenticated:
+            viewer = request.user.pk
+        generations = ':'.join(
+            f'{scope}={get_generation(scope)}' for scope in scopes
+        )
+        raw = f'{generations}|{position}|{viewer}'
+        self.etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+        modified = math.floor(get_last_modified(*scopes))
+        # Заголовок точен до секунды: изменение в текущей секунде
+        # ещё может повториться и остаться незамеченным
+        self.last_modified = (
+            modified if modified < math.floor(time.time()) else None
+        )
+
+    def not_modified(self, request):
+        """Ответ 304 (или 412), если у клиента актуальная версия."""
+        response = get_conditional_response(
+            request, etag=self.etag, last_modified=self.last_modified
+        )
+        return response and self.apply(response)
+
+    def apply(self, response):
+        response['ETag'] = self.etag
+        if self.last_modified is not None:
+            response['Last-Modified'] = http_date(self.last_modified)
+        return response
+
+
+def page_position(request):
+    """Позиция страницы в ленте по параметрам запроса."""
+    cursor = request.GET.get('cursor')
+    if cursor is not None:
+        return 'c' + cursor
+    return 'p' + request.GET.get('page', '')
+
+
+def is_conditional(request):
+    return (
+        'HTTP_IF_NONE_MATCH' in request.META
+        or 'HTTP_IF_MODIFIED_SINCE' in request.META
+    )
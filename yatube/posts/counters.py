@@ -0,0 +1,105 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from posts.models import AuthorStats, Follow, Group, Post, User
+
+
+def author_posts_count(author):
+    try:
+        return author.stats.posts_count
+    except AuthorStats.DoesNotExist:
+        return author.posts.count()
+
+
+def change_author_count(author_id, delta):
+    updated = AuthorStats.objects.filter(user_id=author_id).update(
+        posts_count=F('posts_count') + delta
+    )
+    if not updated and delta > 0:
+        AuthorStats.objects.get_or_create(
+            user_id=author_id,
+            defaults={
+                'posts_count': Post.objects.filter(author_id=author_id).count()
+            }
+        )
+
+
+def change_followers_count(author_id, delta):
+    updated = AuthorStats.objects.filter(user_id=author_id).update(
+        followers_count=F('followers_count') + delta
+    )
+    if not updated and delta > 0:
+        AuthorStats.objects.get_or_create(
+            user_id=author_id,
+            defaults={
+                'followers_count': Follow.objects.filter(
+                    author_id=author_id).count()
+            }
+        )
+
+
+def change_group_count(group_id, delta):
+    if group_id is None:
+        return
+    Group.objects.filter(pk=group_id).update(
+        posts_count=F('posts_count') + delta
+    )
+
+
+def count_created_posts(posts):
+    authors = Counter(post.author_id for post in posts)
+    groups = Counter(post.group_id for post in posts if post.group_id)
+    with transaction.atomic():
+        for author_id, delta in authors.items():
+            change_author_count(author_id, delta)
+        for group_id, delta in groups.items():
+            change_group_count(group_id, delta)
+
+
+def refresh_last_posts(group_ids=None):
+    """Перечитывает последний пост групп одним UPDATE по индексу ленты
+    группы; без group_ids — у всех групп."""
+    groups = Group.objects.all()
+    if group_ids is not None:
+        group_ids = {pk for pk in group_ids if pk is not None}
+        if not group_ids:
+            return
+        groups = groups.filter(pk__in=group_ids)
+    latest = Post.objects.filter(group_id=OuterRef('pk')).order_by(
+        '-pub_date', '-pk')
+    groups.update(
+        last_post=Subquery(latest.values('pk')[:1]),
+        last_post_at=Subquery(latest.values('pub_date')[:1]),
+    )
+
+
+def count_subquery(field, model=Post):
+    counts = (
+        model.objects.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def rebuild_counters():
+    """Пересчитывает счётчики постов и подписчиков авторов, постов
+    групп и последние посты групп одним UPDATE на таблицу."""
+    with transaction.atomic():
+        missing = User.objects.filter(stats__isnull=True).values_list(
+            'pk', flat=True)
+        AuthorStats.objects.bulk_create(
+            [AuthorStats(user_id=pk) for pk in missing],
+            ignore_conflicts=True
+        )
+        AuthorStats.objects.update(
+            posts_count=count_subquery('author'),
+            followers_count=count_subquery('author', Follow),
+        )
+        Group.objects.update(posts_count=count_subquery('group'))
+        refresh_last_posts()
@@ -0,0 +1,90 @@
+import csv
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from posts.models import Post
+
+# Имена колонок совпадают с форматом import_posts
+EXPORT_COLUMNS = ('id', 'text', 'pub_date', 'author', 'group')
+EXPORT_FIELDS = ('id', 'text', 'pub_date', 'author__username', 'group__slug')
+EXPORT_FORMATS = ('jsonl', 'csv')
+CHUNK_SIZE = 2000
+# Сколько байт копить перед отправкой: мелкие куски замедляют и сеть,
+# и сжатие
+BUFFER_SIZE = 64 * 1024
+
+
+def export_rows(queryset, chunk_size=CHUNK_SIZE):
+    """Построчно отдаёт посты словарями, не загружая queryset в память.
+
+    Сортировка снимается: иначе база сортировала бы всю выборку целиком.
+    """
+    rows = queryset.order_by().values_list(*EXPORT_FIELDS)
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield dict(zip(EXPORT_COLUMNS, row))
+
+
+class LineBuffer:
+    """Файлоподобный приёмник для csv.writer: возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def iter_jsonl(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+        yield '\n'
+
+
+def iter_csv(rows):
+    writer = csv.writer(LineBuffer())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        pub_date = row['pub_date'].isoformat()
+        yield writer.writerow([row['id'], row['text'], pub_date,
+                               row['author'], row['group'] or ''])
+
+
+def buffered(pieces, size=BUFFER_SIZE):
+    """Склеивает строки в куски байт примерно по size."""
+    buffer = []
+    length = 0
+    for piece in pieces:
+        data = piece.encode()
+        buffer.append(data)
+        length += len(data)
+        if length >= size:
+            yield b''.join(buffer)
+            buffer = []
+            length = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def gzip_chunks(chunks):
+    """Сжимает поток кусков в формат gzip по мере поступления."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(queryset, file_format, compress=False):
+    rows = export_rows(queryset)
+    lines = iter_csv(rows) if file_format == 'csv' else iter_jsonl(rows)
+    chunks = buffered(lines)
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def export_queryset(author=None, group=None):
+    posts = Post.objects.all()
+    if author is not None:
+        posts = posts.filter(author=author)
+    if group is not None:
+        posts = posts.filter(group=group)
+    return posts
@@ -0,0 +1,115 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+GLOBAL_SCOPE = 'all'
+GROUPS_SCOPE = 'groups'
+USERS_SCOPE = 'users'
+# Имена и ссылки авторов в лентах, где посты разных авторов
+AUTHORS_SCOPE = 'authors'
+# Данные групп и авторов, которые выводятся в постах лент
+FEED_SHARED_SCOPES = (GROUPS_SCOPE, AUTHORS_SCOPE)
+
+
+def get_cache():
+    return caches[settings.POSTS_CACHE_ALIAS]
+
+
+def group_scope(group_id):
+    return f'group:{group_id}'
+
+
+def author_scope(author_id):
+    return f'author:{author_id}'
+
+
+def generation_key(scope):
+    return f'posts:generation:{scope}'
+
+
+def modified_key(scope):
+    return f'posts:modified:{scope}'
+
+
+def initial_generation():
+    # Счётчик, вытесненный из кэша, не должен начаться заново с тех же
+    # значений и попасть на старые фрагменты
+    return time.time_ns()
+
+
+def get_generation(scope):
+    cache = get_cache()
+    key = generation_key(scope)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, initial_generation(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def get_generations(*scopes):
+    """Поколения нескольких областей одним обращением к кэшу."""
+    keys = [generation_key(scope) for scope in scopes]
+    found = get_cache().get_many(keys)
+    if len(found) < len(keys):
+        return tuple(get_generation(scope) for scope in scopes)
+    return tuple(found[key] for key in keys)
+
+
+def bump_generations(*scopes):
+    cache = get_cache()
+    scopes = set(scopes)
+    for scope in scopes:
+        key = generation_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, initial_generation(), timeout=None)
+    now = time.time()
+    cache.set_many(
+        {modified_key(scope): now for scope in scopes}, timeout=None
+    )
+
+
+def get_last_modified(*scopes):
+    """Время последнего изменения среди областей (timestamp).
+
+    Область без отметки (новая или вытесненная) считается изменённой
+    только что.
+    """
+    cache = get_cache()
+    keys = [modified_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        now = time.time()
+        for key in missing:
+            cache.add(key, now, timeout=None)
+        found = cache.get_many(keys)
+    return max(found.values(), default=time.time())
+
+
+def post_scopes(author_id, *group_ids):
+    scopes = [GLOBAL_SCOPE, author_scope(author_id)]
+    scopes.extend(
+        group_scope(group_id) for group_id in group_ids
+        if group_id is not None
+    )
+    return scopes
+
+
+def feed_fragment_key(scope, page_obj, request, *shared_scopes):
+    """Часть ключа фрагмента ленты: поколения области и общих областей,
+    данные которых выводятся в постах (группы, авторы), и позиция
+    страницы.
+    """
+    if getattr(page_obj, 'is_cursor', False):
+        position = 'c' + (request.GET.get('cursor') or '')
+    else:
+        position = f'p{page_obj.number}'
+    generations = ':'.join(
+        str(generation)
+        for generation in get_generations(scope, *shared_scopes)
+    )
+    return f'{scope}:{generations}:{position}'
@@ -0,0 +1,151 @@
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.text import Truncator
+
+from posts.conditional import Validators
+from posts.feed_cache import (
+    FEED_SHARED_SCOPES, GLOBAL_SCOPE, author_scope, get_cache, group_scope
+)
+from posts.lookups import get_author, get_group
+from posts.models import Post
+
+FEED_ITEMS = 20
+TITLE_WORDS = 10
+
+
+class PostsFeed(Feed):
+    """Лента последних постов области с кэшированным XML.
+
+    Готовый XML лежит в кэше под ключом с поколением области, поэтому
+    запись поста в области сама делает его недоступным.
+    """
+
+    feed_type = Rss201rev2Feed
+    kind = 'rss'
+
+    def __call__(self, request, *args, **kwargs):
+        obj = self.get_object(request, *args, **kwargs)
+        validators = Validators(
+            request, (self.scope(obj), *FEED_SHARED_SCOPES), self.kind,
+            per_viewer=False
+        )
+        not_modified = validators.not_modified(request)
+        if not_modified:
+            return not_modified
+        cache = get_cache()
+        # В XML абсолютные ссылки, они зависят от домена запроса
+        key = f'posts:feed:{request.get_host()}:{validators.etag}'
+        content = cache.get(key)
+        if content is None:
+            feedgen = self.get_feed(obj, request)
+            response = HttpResponse(content_type=feedgen.content_type)
+            feedgen.write(response, 'utf-8')
+            cache.set(
+                key, response.content, settings.POSTS_FEED_CACHE_TIMEOUT
+            )
+        else:
+            response = HttpResponse(
+                content, content_type=self.feed_type.content_type
+            )
+        return validators.apply(response)
+
+    def scope(self, obj):
+        return GLOBAL_SCOPE
+
+    def title(self):
+        return 'Yatube: последние записи'
+
+    def link(self):
+        return reverse('posts:index')
+
+    def description(self):
+        return 'Последние обновления на сайте'
+
+    def posts(self, obj):
+        return Post.objects.all()
+
+    def items(self, obj):
+        return self.posts(obj).select_related('author', 'group')[:FEED_ITEMS]
+
+    def item_title(self, item):
+        return Truncator(item.text).words(TITLE_WORDS)
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=[item.id])
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_categories(self, item):
+        return [item.group.title] if item.group else []
+
+
+class GroupPostsFeed(PostsFeed):
+    def get_object(self, request, slug):
+        return get_group(slug)
+
+    def scope(self, group):
+        return group_scope(group.id)
+
+    def title(self, group):
+        return f'Yatube: {group.title}'
+
+    def link(self, group):
+        return reverse('posts:group_list', args=[group.slug])
+
+    def description(self, group):
+        return group.description
+
+    def posts(self, group):
+        return Post.objects.filter(group=group)
+
+
+class AuthorPostsFeed(PostsFeed):
+    def get_object(self, request, username):
+        return get_author(username)
+
+    def scope(self, author):
+        return author_scope(author.id)
+
+    def title(self, author):
+        name = author.get_full_name() or author.username
+        return f'Yatube: записи {name}'
+
+    def link(self, author):
+        return reverse('posts:profile', args=[author.username])
+
+    def description(self, author):
+        return f'Последние записи пользователя {author.username}'
+
+    def posts(self, author):
+        return author.posts.all()
+
+
+class AtomMixin:
+    feed_type = Atom1Feed
+    kind = 'atom'
+    subtitle = PostsFeed.description
+
+
+class PostsAtomFeed(AtomMixin, PostsFeed):
+    pass
+
+
+class GroupPostsAtomFeed(AtomMixin, GroupPostsFeed):
+    subtitle = GroupPostsFeed.description
+
+
+class AuthorPostsAtomFeed(AtomMixin, AuthorPostsFeed):
+    subtitle = AuthorPostsFeed.description
@@ -0,0 +1,181 @@
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.http import Http404
+
+from posts.feed_cache import (
+    GROUPS_SCOPE, USERS_SCOPE, author_scope, get_cache, get_generations,
+    group_scope
+)
+from posts.models import Group, User
+
+STATS_KINDS = ('local_hits', 'shared_hits', 'misses', 'not_found')
+
+
+def stats_key(name, kind):
+    return f'posts:lookup_stats:{name}:{kind}'
+
+
+class ObjectLookup:
+    """Поиск объекта по уникальному полю через два кэша: словарь LRU в
+    процессе и общий кэш, база — при промахе обоих.
+
+    Запись хранит поколения областей кэша лент, которые растут при
+    любом изменении объекта и его счётчиков; запись с устаревшими
+    поколениями считается промахом, поэтому локальный словарь не
+    отстаёт от других процессов. Отсутствие объекта тоже кэшируется
+    и сверяется с поколением области модели, которое растёт при
+    создании объектов.
+
+    Объекты общие для запросов процесса: views их только читают.
+    """
+
+    def __init__(self, name, queryset, field, object_scopes, missing_scope):
+        self.name = name
+        self.queryset = queryset
+        self.field = field
+        self.object_scopes = object_scopes
+        self.missing_scope = missing_scope
+        self.local = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = Counter()
+        self.pending = Counter()
+
+    def key(self, value):
+        # В адресах бывают пробелы и длинный мусор, недопустимые
+        # в ключах memcached
+        digest = hashlib.md5(value.encode()).hexdigest()
+        return f'posts:lookup:{self.name}:{digest}'
+
+    def scopes(self, obj):
+        if obj is None:
+            return (self.missing_scope,)
+        return self.object_scopes(obj.pk)
+
+    def is_fresh(self, entry):
+        obj, generations = entry
+        return get_generations(*self.scopes(obj)) == generations
+
+    def load(self, value):
+        missing = get_generations(self.missing_scope)
+        try:
+            obj = self.queryset.get(**{self.field: value})
+        except self.queryset.model.DoesNotExist:
+            return None, missing
+        return obj, get_generations(*self.object_scopes(obj.pk))
+
+    def local_get(self, value):
+        with self.lock:
+            entry = self.local.get(value)
+            if entry is not None:
+                self.local.move_to_end(value)
+            return entry
+
+    def remember(self, value, entry):
+        with self.lock:
+            self.local[value] = entry
+            self.local.move_to_end(value)
+            while len(self.local) > settings.POSTS_LOOKUP_LOCAL_SIZE:
+                self.local.popitem(last=False)
+
+    def get(self, value):
+        """Объект по значению поля или Http404."""
+        entry = self.local_get(value)
+        if entry is not None and self.is_fresh(entry):
+            kind = 'local_hits'
+        else:
+            cache = get_cache()
+            key = self.key(value)
+            entry = cache.get(key)
+            if entry is not None and self.is_fresh(entry):
+                kind = 'shared_hits'
+            else:
+                kind = 'misses'
+                entry = self.load(value)
+                cache.set(key, entry, settings.POSTS_LOOKUP_CACHE_TIMEOUT)
+            self.remember(value, entry)
+        obj = entry[0]
+        self.count(kind, obj is None)
+        if obj is None:
+            raise Http404(
+                f'{self.queryset.model._meta.object_name} не найден'
+            )
+        return obj
+
+    def count(self, kind, not_found):
+        with self.lock:
+            self.stats[kind] += 1
+            self.pending[kind] += 1
+            if not_found:
+                self.stats['not_found'] += 1
+                self.pending['not_found'] += 1
+            if sum(self.pending.values()) < settings.POSTS_LOOKUP_STATS_FLUSH:
+                return
+            pending, self.pending = self.pending, Counter()
+        self.flush(pending)
+
+    def flush(self, pending):
+        """Добавляет счётчики процесса к общим в кэше."""
+        cache = get_cache()
+        for kind, value in pending.items():
+            key = stats_key(self.name, kind)
+            try:
+                cache.incr(key, value)
+            except ValueError:
+                cache.add(key, value, timeout=None)
+
+    def clear(self):
+        with self.lock:
+            self.local.clear()
+            self.stats.clear()
+            self.pending.clear()
+
+
+def group_scopes(pk):
+    return (group_scope(pk), GROUPS_SCOPE)
+
+
+def user_scopes(pk):
+    return (author_scope(pk),)
+
+
+group_lookup = ObjectLookup(
+    'group', Group.objects.all(), 'slug', group_scopes, GROUPS_SCOPE
+)
+author_lookup = ObjectLookup(
+    'author', User.objects.select_related('stats'), 'username',
+    user_scopes, USERS_SCOPE
+)
+LOOKUPS = (group_lookup, author_lookup)
+
+
+def get_group(slug):
+    return group_lookup.get(slug)
+
+
+def get_author(username):
+    return author_lookup.get(username)
+
+
+def shared_stats():
+    """Счётчики всех процессов, сброшенные в общий кэш."""
+    cache = get_cache()
+    keys = {
+        stats_key(lookup.name, kind): (lookup.name, kind)
+        for lookup in LOOKUPS for kind in STATS_KINDS
+    }
+    found = cache.get_many(keys)
+    stats = {lookup.name: dict.fromkeys(STATS_KINDS, 0) for lookup in LOOKUPS}
+    for key, value in found.items():
+        name, kind = keys[key]
+        stats[name][kind] = value
+    return stats
+
+
+def reset_shared_stats():
+    get_cache().delete_many(
+        [stats_key(lookup.name, kind)
+         for lookup in LOOKUPS for kind in STATS_KINDS]
+    )
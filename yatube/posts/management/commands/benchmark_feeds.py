@@ -0,0 +1,67 @@
+import json
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from posts.feed_cache import get_cache
+from posts.management.commands.benchmark_search import measure
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет стоимость лент RSS/Atom: генерацию без кэша, отдачу '
+        'из кэша и ответ 304. Очищает кэш постов'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        post = Post.objects.select_related('author', 'group').filter(
+            group__isnull=False).first()
+        if post is None:
+            raise CommandError('Нет постов с группой, запустите seed_dataset')
+        urls = [
+            reverse('posts:index_rss'),
+            reverse('posts:index_atom'),
+            reverse('posts:group_rss', args=[post.group.slug]),
+            reverse('posts:profile_atom', args=[post.author.username]),
+        ]
+        factory = RequestFactory()
+        repeat = options['repeat']
+        report = {}
+        for url in urls:
+            view = resolve(url)
+
+            def fetch(**headers):
+                request = factory.get(url, **headers)
+                request.user = AnonymousUser()
+                return view.func(request, *view.args, **view.kwargs)
+
+            def cold():
+                get_cache().clear()
+                return fetch()
+
+            generate = measure(cold, repeat)
+            etag = fetch()['ETag']
+            report[url] = {
+                'generate': generate,
+                'cache_hit': measure(fetch, repeat),
+                'not_modified': measure(
+                    lambda: fetch(HTTP_IF_NONE_MATCH=etag), repeat),
+                'queries': {
+                    'generate': self.count_queries(cold),
+                    'cache_hit': self.count_queries(fetch),
+                },
+            }
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+
+    def count_queries(self, function):
+        with CaptureQueriesContext(connection) as queries:
+            function()
+        return len(queries)
@@ -0,0 +1,56 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template import Context, Template
+from django.template.loader import get_template
+
+from posts.management.commands.benchmark_search import measure
+from posts.paginators import NoCountPaginator
+from posts.views import POSTS_PER_PAGE
+
+PAGE_COUNTS = (10, 10 ** 3, 10 ** 5)
+
+# Прежний вариант: ссылка на каждую страницу из page_range
+FULL_RANGE = (
+    '{% for i in page_obj.paginator.page_range %}'
+    '{% if page_obj.number == i %}'
+    '<li class="page-item active"><span class="page-link">{{ i }}</span>'
+    '</li>{% else %}<li class="page-item">'
+    '<a class="page-link" href="?page={{ i }}">{{ i }}</a></li>'
+    '{% endif %}{% endfor %}'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает отрисовку пагинатора со всеми страницами и с окном '
+        'вокруг текущей на 10, 1000 и 100000 страниц'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        full_range = Template(FULL_RANGE)
+        window = get_template('includes/paginator.html')
+        repeat = options['repeat']
+        report = {}
+        for pages in PAGE_COUNTS:
+            # Пагинатору нужны только длина и срезы, посты не читаются
+            objects = range(pages * POSTS_PER_PAGE)
+            middle = pages // 2 or 1
+            page_obj = Paginator(objects, POSTS_PER_PAGE).page(middle)
+            no_count = NoCountPaginator(objects, POSTS_PER_PAGE).page(middle)
+            renders = {
+                'full_range': lambda: full_range.render(
+                    Context({'page_obj': page_obj})),
+                'window': lambda: window.render({'page_obj': page_obj}),
+                'window_no_count': lambda: window.render(
+                    {'page_obj': no_count}),
+            }
+            report[pages] = {
+                name: {'bytes': len(render()), **measure(render, repeat)}
+                for name, render in renders.items()
+            }
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
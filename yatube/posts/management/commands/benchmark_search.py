@@ -0,0 +1,58 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+from posts.search import SearchPaginator
+
+PER_PAGE = 10
+
+
+def measure(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'median_ms': statistics.median(timings),
+        'max_ms': max(timings),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает первую страницу поиска через FTS5 с поиском '
+        'LIKE %term% по тексту постов'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('terms', nargs='+')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        report = {}
+        for term in options['terms']:
+            def fts():
+                page = SearchPaginator(term, PER_PAGE).get_cursor_page(None)
+                return list(page)
+
+            def like():
+                return list(
+                    Post.objects.select_related('author', 'group')
+                    .filter(text__icontains=term)
+                    .order_by('-pub_date', '-id')[:PER_PAGE]
+                )
+
+            report[term] = {
+                'fts5': measure(fts, options['repeat']),
+                'like': measure(like, options['repeat']),
+                'like_full_count': measure(
+                    lambda: Post.objects.filter(
+                        text__icontains=term).count(),
+                    options['repeat']
+                ),
+            }
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
@@ -0,0 +1,52 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.export import EXPORT_FORMATS, export_queryset, export_stream
+from posts.models import Group, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает посты автора или группы в JSONL или CSV потоком, '
+        'не загружая их в память'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--author', help='username автора')
+        parser.add_argument('--group', help='slug группы')
+        parser.add_argument(
+            '--format', choices=EXPORT_FORMATS, default='jsonl'
+        )
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument(
+            '--output', default='-',
+            help='Путь к файлу или - для stdout'
+        )
+
+    def handle(self, *args, **options):
+        author = group = None
+        if options['author']:
+            author = User.objects.filter(username=options['author']).first()
+            if author is None:
+                raise CommandError(f'Автор {options["author"]} не найден')
+        if options['group']:
+            group = Group.objects.filter(slug=options['group']).first()
+            if group is None:
+                raise CommandError(f'Группа {options["group"]} не найдена')
+
+        chunks = export_stream(
+            export_queryset(author=author, group=group),
+            options['format'], options['gzip']
+        )
+        if options['output'] == '-':
+            output = sys.stdout.buffer
+            self.write_chunks(output, chunks)
+            output.flush()
+        else:
+            with open(options['output'], 'wb') as output:
+                self.write_chunks(output, chunks)
+
+    def write_chunks(self, output, chunks):
+        for chunk in chunks:
+            output.write(chunk)
@@ -0,0 +1,190 @@
+import csv
+import io
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from posts.models import Group, Post, User
+from posts.search import optimize_index
+
+
+class LookupCache:
+    """Кэш id по натуральному ключу: незнакомые ключи пачки
+    разрешаются одним запросом, отсутствующие тоже запоминаются."""
+
+    def __init__(self, queryset, key):
+        self.queryset = queryset
+        self.key = key
+        self.ids = {}
+
+    def resolve(self, keys):
+        missing = {
+            key for key in keys
+            if isinstance(key, str) and key and key not in self.ids
+        }
+        if missing:
+            found = dict(
+                self.queryset.filter(**{f'{self.key}__in': missing})
+                .values_list(self.key, 'pk')
+            )
+            for key in missing:
+                self.ids[key] = found.get(key)
+
+    def get(self, key):
+        return self.ids.get(key) if isinstance(key, str) else None
+
+
+def read_records(stream, file_format):
+    if file_format == 'csv':
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            # Битая строка отклоняется при импорте, а не обрывает его:
+            # иначе --resume останавливался бы на ней же
+            yield line
+
+
+def write_checkpoint(path, position):
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w') as checkpoint:
+        checkpoint.write(str(position))
+    os.replace(temporary, path)
+
+
+def read_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path) as checkpoint:
+        return int(checkpoint.read().strip() or 0)
+
+
+class Command(BaseCommand):
+    help = (
+        'Импортирует посты из JSONL или CSV (файл или stdin) пачками '
+        'bulk_create с точкой возобновления'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'source', nargs='?', default='-',
+            help='Путь к файлу или - для stdin'
+        )
+        parser.add_argument('--format', choices=('jsonl', 'csv'))
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument(
+            '--checkpoint',
+            help='Файл с числом уже импортированных записей'
+        )
+
+    def handle(self, *args, **options):
+        source = options['source']
+        file_format = options['format']
+        if file_format is None:
+            file_format = 'csv' if source.endswith('.csv') else 'jsonl'
+        checkpoint = options['checkpoint']
+        skip = read_checkpoint(checkpoint)
+
+        if source == '-':
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+        else:
+            try:
+                stream = open(source, encoding='utf-8', newline='')
+            except OSError as error:
+                raise CommandError(f'Не удалось открыть {source}: {error}')
+
+        self.authors = LookupCache(User.objects.all(), 'username')
+        self.groups = LookupCache(Group.objects.all(), 'slug')
+        self.imported = 0
+        self.rejected = 0
+        position = skip
+        started = time.monotonic()
+        with stream:
+            records = islice(read_records(stream, file_format), skip, None)
+            while True:
+                chunk = list(islice(records, options['chunk_size']))
+                if not chunk:
+                    break
+                self.import_chunk(chunk, position)
+                position += len(chunk)
+                if checkpoint:
+                    write_checkpoint(checkpoint, position)
+                self.report(started, position)
+
+        optimize_index()
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Импортировано {self.imported}, отклонено {self.rejected} '
+            f'за {elapsed:.1f} с ({self.imported / max(elapsed, 1e-9):.0f} '
+            'строк/с)'
+        ))
+
+    def import_chunk(self, chunk, position):
+        records = [record for record in chunk if isinstance(record, dict)]
+        self.authors.resolve(record.get('author') for record in records)
+        self.groups.resolve(record.get('group') for record in records)
+        posts = []
+        for number, record in enumerate(chunk, start=position + 1):
+            post = self.build_post(record)
+            if post is None:
+                self.rejected += 1
+                self.stderr.write(f'Запись {number} отклонена: {record!r}')
+            else:
+                posts.append(post)
+        with transaction.atomic():
+            Post.objects.bulk_create(posts)
+        self.imported += len(posts)
+
+    def build_post(self, record):
+        if not isinstance(record, dict):
+            return None
+        text = record.get('text')
+        author_id = self.authors.get(record.get('author'))
+        group_slug = record.get('group') or None
+        group_id = self.groups.get(group_slug) if group_slug else None
+        if (
+            not text or not isinstance(text, str) or author_id is None
+            or (group_slug and not group_id)
+        ):
+            return None
+        raw_date = record.get('pub_date')
+        if raw_date is None or raw_date == '':
+            # Даты нет (в CSV — пустая ячейка): пост датируется импортом
+            pub_date = timezone.now()
+        else:
+            # Нераспознанная дата — такая же ошибка, как поле не того
+            # типа, а не повод подставить текущую
+            try:
+                pub_date = parse_datetime(raw_date)
+            except (TypeError, ValueError):
+                return None
+            if pub_date is None:
+                return None
+            if timezone.is_naive(pub_date):
+                pub_date = timezone.make_aware(pub_date)
+        return Post(
+            text=text, author_id=author_id, group_id=group_id,
+            pub_date=pub_date
+        )
+
+    def report(self, started, position):
+        elapsed = time.monotonic() - started
+        self.stderr.write(
+            f'{position} записей, {self.imported / max(elapsed, 1e-9):.0f} '
+            'строк/с',
+            ending='\r'
+        )
@@ -0,0 +1,22 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from posts.lookups import reset_shared_stats, shared_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает попадания и промахи кэша групп по slug и авторов '
+        'по username, сброшенные процессами в общий кэш'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true')
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            json.dumps(shared_stats(), indent=2, ensure_ascii=False)
+        )
+        if options['reset']:
+            reset_shared_stats()
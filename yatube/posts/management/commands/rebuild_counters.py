@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает счётчики постов и подписчиков у авторов и постов '
+        'у групп'
+    )
+
+    def handle(self, *args, **options):
+        rebuild_counters()
+        self.stdout.write(self.style.SUCCESS('Счётчики пересчитаны'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from posts.summary import BATCH_SIZE, rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересобирает сводки авторов: даты первого и последнего поста, '
+        'посты по месяцам и группам'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        total = rebuild_summaries(options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Сводки пересобраны, авторов: {total}')
+        )
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import User
+from posts.timeline import rebuild_timelines
+
+
+class Command(BaseCommand):
+    help = (
+        'Собирает ленты подписок заново из подписок и постов; нужна после '
+        'смены POSTS_TIMELINE_FANOUT_LIMIT'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'usernames', nargs='*',
+            help='Чьи ленты пересобрать; по умолчанию все'
+        )
+
+    def handle(self, *args, **options):
+        owner_ids = None
+        if options['usernames']:
+            owner_ids = list(
+                User.objects.filter(username__in=options['usernames'])
+                .values_list('pk', flat=True)
+            )
+        rebuild_timelines(owner_ids)
+        self.stdout.write(self.style.SUCCESS('Ленты подписок пересобраны'))
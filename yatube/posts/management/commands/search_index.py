@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from posts.search import optimize_index, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает или оптимизирует полнотекстовый индекс постов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'action', choices=('rebuild', 'optimize'), nargs='?',
+            default='rebuild'
+        )
+
+    def handle(self, *args, **options):
+        if options['action'] == 'rebuild':
+            rebuild_index()
+        optimize_index()
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс готов'))
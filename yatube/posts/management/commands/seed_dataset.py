@@ -0,0 +1,144 @@
+import random
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from posts.models import AuthorStats, Group, Post, User
+
+TEXT_POOL_SIZE = 2000
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, группами и постами '
+        'для нагрузочного тестирования'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5000)
+        parser.add_argument('--groups', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=1000000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--group-share', type=float, default=0.7,
+            help='Доля постов, привязанных к группе'
+        )
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='За сколько последних дней раскидать даты постов'
+        )
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--prefix', default='load')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.faker = Faker('ru_RU')
+        if options['seed'] is not None:
+            self.faker.seed_instance(options['seed'])
+        self.batch_size = options['batch_size']
+        prefix = options['prefix']
+        started = time.monotonic()
+
+        if options['posts'] and not options['users']:
+            raise CommandError('Для постов нужен хотя бы один пользователь')
+        user_ids = self.create_users(prefix, options['users'])
+        group_ids = self.create_groups(prefix, options['groups'])
+        self.create_posts(
+            options['posts'], user_ids, group_ids, options['group_share'],
+            options['days']
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано {len(user_ids)} пользователей, {len(group_ids)} групп, '
+            f'{options["posts"]} постов за {elapsed:.1f} с'
+        ))
+
+    def write_batches(self, model, objects):
+        for batch in batches(objects, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+
+    def create_users(self, prefix, count):
+        # Один хэш на всех: PBKDF2 на каждого пользователя занял бы часы
+        password = make_password('password')
+        self.write_batches(User, (
+            User(
+                username=f'{prefix}_user_{number}',
+                first_name=self.faker.first_name(),
+                last_name=self.faker.last_name(),
+                password=password,
+            )
+            for number in range(count)
+        ))
+        user_ids = list(
+            User.objects.filter(username__startswith=f'{prefix}_user_')
+            .values_list('pk', flat=True)
+        )
+        # bulk_create не отправляет post_save, поэтому строки статистики
+        # создаём сами
+        self.write_batches(AuthorStats, (
+            AuthorStats(user_id=pk) for pk in user_ids
+        ))
+        return user_ids
+
+    def create_groups(self, prefix, count):
+        self.write_batches(Group, (
+            Group(
+                title=self.faker.catch_phrase()[:200],
+                slug=f'{prefix}-group-{number}',
+                description=self.faker.paragraph(),
+            )
+            for number in range(count)
+        ))
+        return list(
+            Group.objects.filter(slug__startswith=f'{prefix}-group-')
+            .values_list('pk', flat=True)
+        )
+
+    def create_posts(self, count, user_ids, group_ids, group_share, days):
+        # Faker медленный: тексты берём из заранее подготовленного пула
+        texts = [
+            self.faker.paragraph(nb_sentences=self.random.randint(1, 8))
+            for _ in range(min(TEXT_POOL_SIZE, max(count, 1)))
+        ]
+        choice = self.random.choice
+        chance = self.random.random
+        uniform = self.random.uniform
+        now = timezone.now()
+        span = timedelta(days=days).total_seconds()
+        created = 0
+        posts = (
+            Post(
+                text=choice(texts),
+                author_id=choice(user_ids),
+                group_id=(
+                    choice(group_ids)
+                    if group_ids and chance() < group_share else None
+                ),
+                # С одной датой на всех порядок лент и планы запросов
+                # по pub_date были бы нереалистичными
+                pub_date=now - timedelta(seconds=uniform(0, span)),
+            )
+            for _ in range(count)
+        )
+        for batch in batches(posts, self.batch_size):
+            with transaction.atomic():
+                Post.objects.bulk_create(batch)
+            created += len(batch)
+            self.stdout.write(f'Постов: {created}/{count}', ending='\r')
+        self.stdout.write('')
@@ -0,0 +1,59 @@
+# Generated by Django 2.2.28 on 2026-10-18 03:34
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+fts = import_module('posts.migrations.0006_post_search_fts')
+
+# SQLite пересоздаёт posts_group при добавлении внешнего ключа, а
+# триггеры полнотекстового поиска ссылаются на неё: на время
+# пересоздания они удаляются
+TRIGGERS_SQL = fts.CREATE_SQL[1:5]
+DROP_TRIGGERS_SQL = fts.DROP_SQL[:4]
+
+
+def fill_last_posts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Group = apps.get_model('posts', 'Group')
+    latest = Post.objects.filter(group_id=OuterRef('pk')).order_by(
+        '-pub_date', '-pk')
+    Group.objects.update(
+        last_post=Subquery(latest.values('pk')[:1]),
+        last_post_at=Subquery(latest.values('pub_date')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_author_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            fts.run_on_sqlite(DROP_TRIGGERS_SQL),
+            fts.run_on_sqlite(TRIGGERS_SQL)
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='last_post',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='posts.Post'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='last_post_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='group',
+            index=models.Index(fields=['title', 'id'], name='group_title_idx'),
+        ),
+        migrations.RunPython(fill_last_posts, migrations.RunPython.noop),
+        migrations.RunPython(
+            fts.run_on_sqlite(TRIGGERS_SQL),
+            fts.run_on_sqlite(DROP_TRIGGERS_SQL)
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.2.28 on 2026-10-18 04:29
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_group_last_post'),
+    ]
+
+    # default и editable в схему не попадают, а AlterField на SQLite
+    # пересоздал бы таблицу постов вместе с триггерами поиска
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='post',
+                    name='pub_date',
+                    field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+                ),
+            ],
+        ),
+    ]
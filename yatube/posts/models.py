@@ -1,9 +1,14 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.dispatch import Signal
 
 
 User = get_user_model()
 
+# bulk_create не отправляет post_save, поэтому о пачке сообщаем отдельно
+posts_bulk_created = Signal(providing_args=['posts'])
+
 
 class Group(models.Model):
     title = models.CharField(max_length=200)
@@ -12,14 +17,46 @@ class Group(models.Model):
         unique=True
     )
     description = models.TextField()
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+    # Последний пост группы для каталога; обновляется вместе со счётчиком
+    last_post = models.ForeignKey(
+        'Post',
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name='+'
+    )
+    last_post_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['title', 'id'], name='group_title_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """bulk_create с сигналом posts_bulk_created."""
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if not kwargs.get('ignore_conflicts'):
+            posts_bulk_created.send(sender=self.model, posts=objs)
+        return objs
+
+
 class Post(models.Model):
     text = models.TextField()
-    pub_date = models.DateTimeField(auto_now_add=True)
+    # Дата создания по умолчанию, но не auto_now_add: импорт и bulk_create
+    # сохраняют заданную дату без второй записи
+    pub_date = models.DateTimeField(default=timezone.now, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -33,8 +70,157 @@ class Post(models.Model):
         related_name='posts'
     )
 
+    objects = PostQuerySet.as_manager()
+
     class Meta:
-        ordering = ['-pub_date']
+        ordering = ['-pub_date', '-id']
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                name='post_feed_idx'
+            ),
+            models.Index(
+                fields=['group', '-pub_date', '-id'],
+                name='post_group_feed_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_feed_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:15]
+
+
+class AuthorStats(models.Model):
+    user = models.OneToOneField(
+        User,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='stats'
+    )
+    posts_count = models.PositiveIntegerField(default=0)
+    followers_count = models.PositiveIntegerField(default=0)
+    first_post_at = models.DateTimeField(null=True, blank=True)
+    last_post_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.user}: {self.posts_count}'
+
+
+class AuthorMonthStats(models.Model):
+    """Число постов автора за месяц для сводки в профиле."""
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='month_stats'
+    )
+    month = models.DateField()
+    posts_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'month'],
+                name='unique_author_month'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user} {self.month:%Y-%m}: {self.posts_count}'
+
+
+class AuthorGroupStats(models.Model):
+    """Число постов автора в группе для сводки в профиле."""
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='group_stats'
+    )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    posts_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'group'],
+                name='unique_author_group'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user} в {self.group}: {self.posts_count}'
+
+
+class Follow(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='follower'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'author'],
+                name='unique_follow'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user} -> {self.author}'
+
+
+class TimelineEntry(models.Model):
+    """Пост в ленте подписчика, разложенный при публикации.
+
+    pub_date и author скопированы из поста, чтобы лента читалась по
+    своему индексу без соединения с постами.
+    """
+
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='timeline'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    pub_date = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['owner', 'post'],
+                name='unique_timeline_entry'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['owner', '-pub_date', '-post'],
+                name='timeline_feed_idx'
+            ),
+            models.Index(
+                fields=['owner', 'author'],
+                name='timeline_author_idx'
+            ),
+        ]
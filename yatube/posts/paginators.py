@@ -0,0 +1,243 @@
+import base64
+
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db.models import Max, Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+def encode_cursor(direction, post):
+    raw = f'{direction}|{post.pub_date.isoformat()}|{post.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Разбирает курсор в (направление, pub_date, id) или возвращает None."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        direction, pub_date, pk = raw.split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except ValueError:
+        return None
+    if direction not in (NEXT, PREVIOUS) or pub_date is None:
+        return None
+    return direction, pub_date, pk
+
+
+def encode_title_cursor(direction, group):
+    # Название может содержать «|», поэтому оно идёт последним
+    raw = f'{direction}|{group.pk}|{group.title}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_title_cursor(cursor):
+    """Разбирает курсор групп в (направление, title, id) или None."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        direction, pk, title = raw.split('|', 2)
+        pk = int(pk)
+    except ValueError:
+        return None
+    if direction not in (NEXT, PREVIOUS):
+        return None
+    return direction, title, pk
+
+
+def seek(queryset, direction, pub_date, pk, pk_field='pk'):
+    """Строки после позиции (pub_date, pk) в порядке чтения направления.
+
+    Диапазон по pub_date дублирует условие, чтобы база шла по индексу
+    ленты, а не проверяла OR на каждой строке.
+    """
+    if direction == NEXT:
+        return queryset.filter(
+            Q(pub_date__lt=pub_date) | Q(**{f'{pk_field}__lt': pk}),
+            pub_date__lte=pub_date,
+        ).order_by('-pub_date', f'-{pk_field}')
+    return queryset.filter(
+        Q(pub_date__gt=pub_date) | Q(**{f'{pk_field}__gt': pk}),
+        pub_date__gte=pub_date,
+    ).order_by('pub_date', pk_field)
+
+
+class CountedPaginator(Paginator):
+    """Paginator с заранее известным числом объектов вместо COUNT(*)."""
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = count
+
+
+class NoCountPage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class NoCountPaginator(Paginator):
+    """Нумерованные страницы без COUNT(*).
+
+    Страница читает per_page + 1 строк: лишняя строка говорит, есть ли
+    следующая. Число страниц и последняя страница неизвестны.
+    """
+
+    counts_pages = False
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы должен быть числом')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('На странице нет результатов')
+        return NoCountPage(
+            rows[:self.per_page], number, self, len(rows) > self.per_page
+        )
+
+    def get_page(self, number):
+        """Как Paginator.get_page, но за последней страницей — первая:
+        номер последней неизвестен."""
+        try:
+            return self.page(number)
+        except (PageNotAnInteger, EmptyPage):
+            return self.page(1)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator для больших таблиц в админке.
+
+    Без фильтров число строк оценивается по MAX(id) из индекса первичного
+    ключа, с фильтрами считается не дальше max_count строк.
+    """
+
+    max_count = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list.order_by()
+        if not queryset.query.where:
+            return queryset.aggregate(last_id=Max('pk'))['last_id'] or 0
+        return queryset.values('pk')[:self.max_count].count()
+
+
+class CursorPage(Page):
+    """Страница ленты по курсору.
+
+    Строки читаются при первом обращении, поэтому страница, которая
+    целиком взята из кэша фрагментов, не делает запроса к базе.
+    """
+
+    is_cursor = True
+
+    def __init__(self, queryset, paginator, direction, has_position):
+        self.number = None
+        self.paginator = paginator
+        self._queryset = queryset
+        self._direction = direction
+        self._has_position = has_position
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self.object_list)} objects>'
+
+    def encode_cursor(self, direction, post):
+        return encode_cursor(direction, post)
+
+    def fetch(self, limit):
+        return list(self._queryset[:limit])
+
+    @cached_property
+    def _rows(self):
+        per_page = self.paginator.per_page
+        rows = self.fetch(per_page + 1)
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        if self._direction == PREVIOUS:
+            rows.reverse()
+            return rows, bool(rows), has_more and bool(rows)
+        return rows, has_more, self._has_position and bool(rows)
+
+    @property
+    def object_list(self):
+        return self._rows[0]
+
+    def has_next(self):
+        return self._rows[1]
+
+    def has_previous(self):
+        return self._rows[2]
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return self.encode_cursor(NEXT, self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return self.encode_cursor(PREVIOUS, self.object_list[0])
+
+
+class TitleCursorPage(CursorPage):
+    def encode_cursor(self, direction, group):
+        return encode_title_cursor(direction, group)
+
+
+class CursorPaginator(Paginator):
+    """Пагинация по ключу (pub_date, id) без COUNT(*) и OFFSET.
+
+    Стоимость любой страницы одинакова: запрос начинается с позиции,
+    записанной в курсоре, и читает не больше per_page + 1 строк.
+    """
+
+    def get_cursor_page(self, cursor):
+        decoded = decode_cursor(cursor) if cursor else None
+        queryset = self.object_list
+        if decoded is None:
+            return CursorPage(
+                queryset.order_by('-pub_date', '-pk'), self, NEXT, False
+            )
+        direction, pub_date, pk = decoded
+        queryset = seek(queryset, direction, pub_date, pk)
+        return CursorPage(queryset, self, direction, True)
+
+
+class TitleCursorPaginator(Paginator):
+    """Пагинация групп по ключу (title, id) по индексу group_title_idx.
+    """
+
+    def get_cursor_page(self, cursor):
+        decoded = decode_title_cursor(cursor) if cursor else None
+        queryset = self.object_list
+        if decoded is None:
+            return TitleCursorPage(
+                queryset.order_by('title', 'pk'), self, NEXT, False
+            )
+        direction, title, pk = decoded
+        if direction == NEXT:
+            queryset = queryset.filter(
+                Q(title__gt=title) | Q(pk__gt=pk), title__gte=title
+            ).order_by('title', 'pk')
+        else:
+            queryset = queryset.filter(
+                Q(title__lt=title) | Q(pk__lt=pk), title__lte=title
+            ).order_by('-title', '-pk')
+        return TitleCursorPage(queryset, self, direction, True)
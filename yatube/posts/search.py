@@ -0,0 +1,113 @@
+import base64
+import re
+
+from django.core.paginator import Paginator
+from django.db import connection
+
+from posts.models import Post
+from posts.paginators import NEXT, PREVIOUS, CursorPage
+
+FTS_TABLE = 'posts_post_fts'
+MAX_TERMS = 10
+TERM_RE = re.compile(r'\w+')
+
+
+def build_match(query):
+    """Превращает ввод пользователя в выражение MATCH из слов в кавычках,
+    чтобы операторы FTS5 во вводе не ломали запрос."""
+    terms = TERM_RE.findall(query.lower())[:MAX_TERMS]
+    return ' '.join(f'"{term}"' for term in terms)
+
+
+def encode_search_cursor(direction, rank, pk):
+    raw = f'{direction}|{rank!r}|{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_search_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        direction, rank, pk = raw.split('|')
+        rank = float(rank)
+        pk = int(pk)
+    except ValueError:
+        return None
+    if direction not in (NEXT, PREVIOUS):
+        return None
+    return direction, rank, pk
+
+
+def search_ids(match, direction, position, limit):
+    """Возвращает [(id, rank)] по рангу BM25: меньший ранг — лучше."""
+    sql = f'SELECT rowid, rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+    params = [match]
+    operator, order = ('>', 'ASC') if direction == NEXT else ('<', 'DESC')
+    if position is not None:
+        rank, pk = position
+        sql += (
+            f' AND (rank {operator} %s OR (rank = %s AND rowid {operator} %s))'
+        )
+        params += [rank, rank, pk]
+    sql += f' ORDER BY rank {order}, rowid {order} LIMIT %s'
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+class SearchPage(CursorPage):
+    def __init__(self, match, paginator, direction, position):
+        super().__init__(None, paginator, direction, position is not None)
+        self._match = match
+        self._position = position
+
+    def encode_cursor(self, direction, post):
+        return encode_search_cursor(direction, post.search_rank, post.pk)
+
+    def fetch(self, limit):
+        if not self._match:
+            return []
+        ranked = search_ids(
+            self._match, self._direction, self._position, limit)
+        posts = Post.objects.select_related('author', 'group').in_bulk(
+            [pk for pk, _ in ranked])
+        found = []
+        for pk, rank in ranked:
+            post = posts.get(pk)
+            if post is not None:
+                post.search_rank = rank
+                found.append(post)
+        return found
+
+
+class SearchPaginator(Paginator):
+    """Курсорная пагинация результатов полнотекстового поиска по рангу."""
+
+    def __init__(self, query, per_page):
+        super().__init__([], per_page)
+        self.match = build_match(query)
+
+    def get_cursor_page(self, cursor):
+        decoded = decode_search_cursor(cursor) if cursor else None
+        if decoded is None:
+            return SearchPage(self.match, self, NEXT, None)
+        direction, rank, pk = decoded
+        return SearchPage(self.match, self, direction, (rank, pk))
+
+
+def rebuild_index():
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, text, group_title) '
+            'SELECT posts_post.id, posts_post.text, posts_group.title '
+            'FROM posts_post LEFT JOIN posts_group '
+            'ON posts_group.id = posts_post.group_id'
+        )
+
+
+def optimize_index():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
@@ -0,0 +1,248 @@
+from django.conf import settings
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from posts.counters import (
+    change_author_count, change_followers_count, change_group_count,
+    count_created_posts, refresh_last_posts
+)
+from posts.feed_cache import (
+    AUTHORS_SCOPE, GROUPS_SCOPE, USERS_SCOPE, author_scope, bump_generations,
+    post_scopes
+)
+from posts.models import (
+    AuthorStats, Follow, Group, Post, User, posts_bulk_created
+)
+from posts.summary import (
+    forget_post, move_post, record_created_posts, record_posts
+)
+from posts.tasks import fan_out_author_posts, fan_out_post, fan_out_posts
+from posts.timeline import BATCH_SIZE, backfill, remove_author
+
+
+@receiver(post_save, sender=User)
+def create_author_stats(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        AuthorStats.objects.get_or_create(user=instance)
+
+
+# Поля пользователя, которые выводятся в постах лент
+DISPLAY_FIELDS = ('username', 'first_name', 'last_name')
+
+
+def display_values(user):
+    return tuple(getattr(user, field) for field in DISPLAY_FIELDS)
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_names(sender, instance, raw, update_fields, **kwargs):
+    instance._previous_names = None
+    if instance.pk is None or raw:
+        return
+    # Вход сохраняет только last_login: имена перечитывать незачем
+    if update_fields is not None and not set(update_fields) & set(
+            DISPLAY_FIELDS):
+        return
+    instance._previous_names = (
+        User.objects.filter(pk=instance.pk)
+        .values_list(*DISPLAY_FIELDS)
+        .first()
+    )
+
+
+def names_changed(user):
+    previous = getattr(user, '_previous_names', None)
+    return previous is not None and previous != display_values(user)
+
+
+def username_changed(user):
+    previous = getattr(user, '_previous_names', None)
+    return previous is not None and previous[0] != user.username
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_pages(sender, instance, created, raw, **kwargs):
+    # Имя автора выводится в шапке профиля, а в общих лентах — у
+    # каждого его поста
+    if not created and not raw:
+        scopes = [author_scope(instance.pk)]
+        if names_changed(instance):
+            scopes.append(AUTHORS_SCOPE)
+        # Новое имя могло быть закэшировано как отсутствующее
+        if username_changed(instance):
+            scopes.append(USERS_SCOPE)
+        bump_generations(*scopes)
+
+
+@receiver(post_save, sender=User)
+def invalidate_missing_authors(sender, instance, created, **kwargs):
+    # Имя нового пользователя могло быть закэшировано как отсутствующее
+    if created:
+        bump_generations(USERS_SCOPE, author_scope(instance.pk))
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_author(sender, instance, **kwargs):
+    bump_generations(author_scope(instance.pk))
+
+
+def stored_group_id(post):
+    return (
+        Post.objects.filter(pk=post.pk)
+        .values_list('group_id', flat=True)
+        .first()
+    )
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_group(sender, instance, raw, **kwargs):
+    instance._previous_group_id = None
+    if instance.pk is not None and not raw:
+        instance._previous_group_id = stored_group_id(instance)
+
+
+@receiver(pre_delete, sender=Post)
+def refresh_deleted_group(sender, instance, **kwargs):
+    # Экземпляр мог устареть: счётчик уменьшаем у группы из базы
+    instance.group_id = stored_group_id(instance)
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    if created:
+        change_author_count(instance.author_id, 1)
+        change_group_count(instance.group_id, 1)
+        return
+    if instance._previous_group_id != instance.group_id:
+        change_group_count(instance._previous_group_id, -1)
+        change_group_count(instance.group_id, 1)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    change_author_count(instance.author_id, -1)
+    change_group_count(instance.group_id, -1)
+
+
+@receiver(posts_bulk_created, sender=Post)
+def count_bulk_created_posts(sender, posts, **kwargs):
+    count_created_posts(posts)
+
+
+@receiver(post_save, sender=Post)
+def update_group_last_post(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    if created or instance._previous_group_id != instance.group_id:
+        refresh_last_posts([instance.group_id, instance._previous_group_id])
+
+
+@receiver(post_delete, sender=Post)
+def update_deleted_group_last_post(sender, instance, **kwargs):
+    refresh_last_posts([instance.group_id])
+
+
+@receiver(posts_bulk_created, sender=Post)
+def update_bulk_created_last_posts(sender, posts, **kwargs):
+    refresh_last_posts(post.group_id for post in posts)
+
+
+@receiver(post_save, sender=Post)
+def summarize_saved_post(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    if created:
+        record_posts(instance.author_id, [instance])
+    elif instance._previous_group_id != instance.group_id:
+        move_post(
+            instance.author_id, instance._previous_group_id,
+            instance.group_id
+        )
+
+
+@receiver(post_delete, sender=Post)
+def summarize_deleted_post(sender, instance, **kwargs):
+    forget_post(instance)
+
+
+@receiver(posts_bulk_created, sender=Post)
+def summarize_bulk_created_posts(sender, posts, **kwargs):
+    record_created_posts(posts)
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post_feeds(sender, instance, raw, **kwargs):
+    bump_generations(*post_scopes(
+        instance.author_id,
+        instance.group_id,
+        getattr(instance, '_previous_group_id', None),
+    ))
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post_feeds(sender, instance, **kwargs):
+    bump_generations(*post_scopes(instance.author_id, instance.group_id))
+
+
+@receiver(posts_bulk_created, sender=Post)
+def invalidate_bulk_created_feeds(sender, posts, **kwargs):
+    scopes = []
+    for post in posts:
+        scopes.extend(post_scopes(post.author_id, post.group_id))
+    bump_generations(*scopes)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_choices(sender, **kwargs):
+    bump_generations(GROUPS_SCOPE)
+
+
+@receiver(post_save, sender=Post)
+def fan_out_saved_post(sender, instance, created, raw, **kwargs):
+    # У популярного автора тысячи подписчиков: раскладку делает
+    # обработчик очереди, запрос не ждёт её
+    if created and not raw:
+        fan_out_post.delay(instance.pk, dedup_key=f'fan_out:{instance.pk}')
+
+
+@receiver(posts_bulk_created, sender=Post)
+def fan_out_bulk_created_posts(sender, posts, **kwargs):
+    # Пачка импорта раскладывается в очереди, частями по BATCH_SIZE
+    # постов; посты без id передаются по автору и самой ранней дате
+    ids = [post.pk for post in posts if post.pk is not None]
+    for start in range(0, len(ids), BATCH_SIZE):
+        fan_out_posts.delay(ids[start:start + BATCH_SIZE])
+    since = {}
+    for post in posts:
+        if post.pk is None:
+            earliest = since.get(post.author_id, post.pub_date)
+            since[post.author_id] = min(earliest, post.pub_date)
+    for author_id, pub_date in since.items():
+        fan_out_author_posts.delay(author_id, pub_date.isoformat())
+
+
+@receiver(post_save, sender=Follow)
+def follow_author(sender, instance, created, raw, **kwargs):
+    if not created or raw:
+        return
+    change_followers_count(instance.author_id, 1)
+    # Подписка идёт в запросе: копируется только окно последних постов,
+    # а не вся история автора
+    backfill(
+        instance.user_id, instance.author_id,
+        settings.POSTS_TIMELINE_BACKFILL_LIMIT
+    )
+    # Кнопка подписки выводится в профиле
+    bump_generations(author_scope(instance.author_id))
+
+
+@receiver(post_delete, sender=Follow)
+def unfollow_author(sender, instance, **kwargs):
+    change_followers_count(instance.author_id, -1)
+    remove_author(instance.user_id, instance.author_id)
+    bump_generations(author_scope(instance.author_id))
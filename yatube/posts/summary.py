@@ -0,0 +1,229 @@
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Count, DateTimeField, F, OuterRef, Subquery, Value
+)
+from django.db.models.functions import Coalesce, Greatest, Least, TruncMonth
+from django.utils import timezone
+
+from posts.feed_cache import (
+    GROUPS_SCOPE, author_scope, bump_generations, get_cache, get_generation
+)
+from posts.models import (
+    AuthorGroupStats, AuthorMonthStats, AuthorStats, Post, User
+)
+
+BATCH_SIZE = 500
+# Сколько последних месяцев с постами показывать в профиле
+MONTHS_SHOWN = 12
+
+
+def post_month(pub_date):
+    return timezone.localtime(pub_date).date().replace(day=1)
+
+
+def change_row(model, delta, **lookup):
+    """Меняет счётчик строки сводки; опустевшая строка удаляется."""
+    updated = model.objects.filter(**lookup).update(
+        posts_count=F('posts_count') + delta
+    )
+    if delta > 0 and not updated:
+        model.objects.get_or_create(**lookup, defaults={'posts_count': delta})
+    elif delta < 0:
+        model.objects.filter(**lookup, posts_count__lte=0).delete()
+
+
+def record_posts(author_id, posts):
+    """Учитывает новые посты автора: даты первого и последнего поста,
+    месяцы и группы."""
+    dates = [post.pub_date for post in posts]
+    first = Value(min(dates), output_field=DateTimeField())
+    last = Value(max(dates), output_field=DateTimeField())
+    AuthorStats.objects.filter(user_id=author_id).update(
+        first_post_at=Least(Coalesce('first_post_at', first), first),
+        last_post_at=Greatest(Coalesce('last_post_at', last), last),
+    )
+    months = Counter(post_month(date) for date in dates)
+    for month, delta in months.items():
+        change_row(AuthorMonthStats, delta, user_id=author_id, month=month)
+    groups = Counter(post.group_id for post in posts if post.group_id)
+    for group_id, delta in groups.items():
+        change_row(AuthorGroupStats, delta, user_id=author_id,
+                   group_id=group_id)
+
+
+def add_counts(model, field, deltas):
+    """Прибавляет счётчики пачки к строкам сводки {(user_id, значение
+    field): прирост}: недостающие строки создаются INSERT OR IGNORE,
+    затем по UPDATE на каждое значение прироста."""
+    if not deltas:
+        return
+    model.objects.bulk_create(
+        [model(user_id=user_id, posts_count=0, **{field: value})
+         for user_id, value in deltas],
+        batch_size=BATCH_SIZE, ignore_conflicts=True
+    )
+    user_ids = sorted({user_id for user_id, _ in deltas})
+    by_delta = {}
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        rows = model.objects.filter(
+            user_id__in=user_ids[start:start + BATCH_SIZE]
+        ).values_list('pk', 'user_id', field)
+        for pk, user_id, value in rows:
+            delta = deltas.get((user_id, value))
+            if delta:
+                by_delta.setdefault(delta, []).append(pk)
+    for delta, pks in by_delta.items():
+        for start in range(0, len(pks), BATCH_SIZE):
+            model.objects.filter(pk__in=pks[start:start + BATCH_SIZE]).update(
+                posts_count=F('posts_count') + delta
+            )
+
+
+def record_created_posts(posts):
+    """Учитывает пачку bulk_create: число запросов зависит от размера
+    пачки и разброса приростов, а не от числа авторов."""
+    author_ids = sorted({post.author_id for post in posts})
+    months = Counter(
+        (post.author_id, post_month(post.pub_date)) for post in posts
+    )
+    groups = Counter(
+        (post.author_id, post.group_id) for post in posts if post.group_id
+    )
+    with transaction.atomic():
+        for start in range(0, len(author_ids), BATCH_SIZE):
+            refresh_post_dates(author_ids[start:start + BATCH_SIZE])
+        add_counts(AuthorMonthStats, 'month', months)
+        add_counts(AuthorGroupStats, 'group_id', groups)
+
+
+def move_post(author_id, previous_group_id, group_id):
+    if previous_group_id is not None:
+        change_row(AuthorGroupStats, -1, user_id=author_id,
+                   group_id=previous_group_id)
+    if group_id is not None:
+        change_row(AuthorGroupStats, 1, user_id=author_id, group_id=group_id)
+
+
+def forget_post(post):
+    change_row(AuthorMonthStats, -1, user_id=post.author_id,
+               month=post_month(post.pub_date))
+    move_post(post.author_id, post.group_id, None)
+    refresh_post_dates([post.author_id])
+
+
+def refresh_post_dates(author_ids):
+    """Перечитывает даты первого и последнего поста одним UPDATE по
+    индексу постов автора."""
+    posts = Post.objects.filter(author_id=OuterRef('user_id'))
+    AuthorStats.objects.filter(user_id__in=author_ids).update(
+        first_post_at=Subquery(
+            posts.order_by('pub_date').values('pub_date')[:1]),
+        last_post_at=Subquery(
+            posts.order_by('-pub_date').values('pub_date')[:1]),
+    )
+
+
+def build_summary(author):
+    stats = getattr(author, 'stats', None)
+    # Групп у автора немного: сортировка в Python вместо временного
+    # B-дерева в базе
+    groups = sorted(
+        AuthorGroupStats.objects.filter(user=author).values_list(
+            'group__slug', 'group__title', 'posts_count'),
+        key=lambda row: (-row[2], row[1])
+    )
+    months = (
+        AuthorMonthStats.objects.filter(user=author)
+        .order_by('-month')
+        .values_list('month', 'posts_count')[:MONTHS_SHOWN]
+    )
+    return {
+        'posts_count': stats.posts_count if stats else 0,
+        'first_post_at': stats.first_post_at if stats else None,
+        'last_post_at': stats.last_post_at if stats else None,
+        'groups': [
+            {'slug': slug, 'title': title, 'posts_count': count}
+            for slug, title, count in groups
+        ],
+        'months': [
+            {'month': month, 'posts_count': count}
+            for month, count in months
+        ],
+    }
+
+
+def get_author_summary(author):
+    """Сводка автора из кэша.
+
+    Ключ включает поколения области автора и групп: любая запись поста
+    автора или изменение группы делает старую сводку недоступной.
+    """
+    key = (
+        f'posts:summary:{author.pk}:'
+        f'{get_generation(author_scope(author.pk))}:'
+        f'{get_generation(GROUPS_SCOPE)}'
+    )
+    cache = get_cache()
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_summary(author)
+        cache.set(key, summary, settings.POSTS_FEED_CACHE_TIMEOUT)
+    return summary
+
+
+def rebuild_batch(author_ids):
+    refresh_post_dates(author_ids)
+    posts = Post.objects.filter(author_id__in=author_ids).order_by()
+    AuthorMonthStats.objects.filter(user_id__in=author_ids).delete()
+    months = (
+        posts.annotate(month=TruncMonth('pub_date'))
+        .values('author_id', 'month')
+        .annotate(total=Count('pk'))
+    )
+    AuthorMonthStats.objects.bulk_create([
+        AuthorMonthStats(
+            user_id=row['author_id'],
+            month=row['month'].date(),
+            posts_count=row['total'],
+        )
+        for row in months
+    ])
+    AuthorGroupStats.objects.filter(user_id__in=author_ids).delete()
+    groups = (
+        posts.filter(group__isnull=False)
+        .values('author_id', 'group_id')
+        .annotate(total=Count('pk'))
+    )
+    AuthorGroupStats.objects.bulk_create([
+        AuthorGroupStats(
+            user_id=row['author_id'],
+            group_id=row['group_id'],
+            posts_count=row['total'],
+        )
+        for row in groups
+    ])
+
+
+def rebuild_summaries(batch_size=BATCH_SIZE):
+    """Пересобирает сводки всех авторов пачками по batch_size
+    пользователей; возвращает число пользователей."""
+    missing = User.objects.filter(stats__isnull=True).values_list(
+        'pk', flat=True)
+    AuthorStats.objects.bulk_create(
+        [AuthorStats(user_id=pk) for pk in missing], ignore_conflicts=True
+    )
+    users = User.objects.order_by('pk').values_list('pk', flat=True)
+    total = 0
+    last_pk = 0
+    while True:
+        batch = list(users.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return total
+        with transaction.atomic():
+            rebuild_batch(batch)
+        bump_generations(*(author_scope(pk) for pk in batch))
+        total += len(batch)
+        last_pk = batch[-1]
@@ -0,0 +1,32 @@
+from django.utils.dateparse import parse_datetime
+
+from posts.models import Post
+from posts.timeline import fan_out
+from tasks.queue import task
+
+FAN_OUT_FIELDS = ('pk', 'author_id', 'pub_date')
+
+
+@task('posts.fan_out_post')
+def fan_out_post(post_id):
+    """Раскладывает опубликованный пост по лентам подписчиков."""
+    post = Post.objects.filter(pk=post_id).only(*FAN_OUT_FIELDS).first()
+    if post is not None:
+        fan_out([post])
+
+
+@task('posts.fan_out_posts')
+def fan_out_posts(post_ids):
+    """Раскладывает посты пачки bulk_create по лентам подписчиков."""
+    fan_out(list(Post.objects.filter(pk__in=post_ids).only(*FAN_OUT_FIELDS)))
+
+
+@task('posts.fan_out_author_posts')
+def fan_out_author_posts(author_id, since):
+    """Раскладывает посты автора, опубликованные начиная с since: так
+    передаётся пачка, для которой SQLite не вернул id."""
+    fan_out(list(
+        Post.objects.filter(
+            author_id=author_id, pub_date__gte=parse_datetime(since)
+        ).only(*FAN_OUT_FIELDS)
+    ))
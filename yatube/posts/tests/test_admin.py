@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.feed_cache import get_cache
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class PostAdminTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass')
+        self.client = Client()
+        self.client.force_login(self.admin)
+        self.groups = [
+            Group.objects.create(
+                title=f'Группа {i}', slug=f'group-{i}', description='-')
+            for i in range(30)
+        ]
+        self.changelist = reverse('admin:posts_post_changelist')
+
+    def create_posts(self, count):
+        Post.objects.bulk_create([
+            Post(author=self.admin, text=f'Пост {i}',
+                 group=self.groups[i % len(self.groups)])
+            for i in range(count)
+        ])
+
+    def changelist_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.changelist)
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Число запросов списка постов не зависит от числа строк."""
+        self.create_posts(5)
+        # Первый запрос кладёт сессию и пользователя в кэш
+        self.changelist_queries()
+        _, few = self.changelist_queries()
+        self.create_posts(60)
+        _, many = self.changelist_queries()
+        self.assertEqual(len(few), len(many))
+
+    def test_changelist_skips_exact_count(self):
+        """Список постов не считает COUNT(*) по всей таблице."""
+        self.create_posts(20)
+        _, queries = self.changelist_queries()
+        for sql in queries:
+            with self.subTest(sql=sql):
+                self.assertNotIn('COUNT(*)', sql)
+
+    def test_group_column_is_not_full_dropdown(self):
+        """В строках нет выпадающего списка из всех групп."""
+        self.create_posts(10)
+        response, _ = self.changelist_queries()
+        self.assertNotContains(response, self.groups[-1].title + '</option>')
+        group = self.groups[0]
+        self.assertContains(
+            response, f'<option value="{group.pk}" selected>{group.title}')
+
+    def test_group_autocomplete_is_cached_and_invalidated(self):
+        """Выбор группы отдаётся из кэша до изменения групп."""
+        url = reverse('admin:posts_group_autocomplete')
+        self.client.get(url, {'term': 'Группа'})
+        with self.assertNumQueries(0):
+            # Сессия и пользователь тоже берутся из кэша
+            self.client.get(url, {'term': 'Группа'})
+        Group.objects.create(title='Группа новая', slug='new', description='-')
+        response = self.client.get(url, {'term': 'новая'})
+        titles = [item['text'] for item in response.json()['results']]
+        self.assertEqual(titles, ['Группа новая'])
@@ -0,0 +1,117 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.feed_cache import get_cache
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class ApiTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='author', first_name='Лев', last_name='Толстой')
+        self.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug',
+            description='Тестовое описание')
+        Post.objects.bulk_create([
+            Post(author=self.user, text=f'Пост {i}',
+                 group=self.group if i % 2 else None)
+            for i in range(13)
+        ])
+
+    def test_cursor_pagination(self):
+        """Посты листаются курсором по (pub_date, id) без повторов."""
+        url = reverse('posts:api_posts')
+        first = self.client.get(url).json()
+        self.assertEqual(len(first['results']), 10)
+        self.assertIsNone(first['previous'])
+        second = self.client.get(first['next']).json()
+        self.assertEqual(len(second['results']), 3)
+        self.assertIsNone(second['next'])
+        ids = [post['id'] for post in first['results'] + second['results']]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertEqual(len(set(ids)), 13)
+        back = self.client.get(second['previous']).json()
+        self.assertEqual(back['results'], first['results'])
+
+    def test_group_cursor_pagination(self):
+        """Группы листаются курсором по (title, id) с limit."""
+        Group.objects.bulk_create([
+            Group(title=f'Группа|{i % 3}', slug=f'group-{i}')
+            for i in range(6)
+        ])
+        url = reverse('posts:api_groups')
+        first = self.client.get(url, {'limit': 4, 'fields': 'slug'}).json()
+        self.assertEqual(len(first['results']), 4)
+        self.assertIsNone(first['previous'])
+        second = self.client.get(first['next']).json()
+        self.assertEqual(len(second['results']), 3)
+        self.assertIsNone(second['next'])
+        slugs = [
+            group['slug'] for group in first['results'] + second['results']
+        ]
+        expected = list(
+            Group.objects.order_by('title', 'pk').values_list(
+                'slug', flat=True)
+        )
+        self.assertEqual(slugs, expected)
+        back = self.client.get(second['previous']).json()
+        self.assertEqual(back['results'], first['results'])
+
+    def test_sparse_fields_select_only_needed_columns(self):
+        """?fields ограничивает ответ и колонки запроса."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('posts:api_posts'), {'fields': 'id,author'})
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'author'})
+        sql = queries.captured_queries[-1]['sql']
+        self.assertNotIn('"text"', sql)
+        self.assertNotIn('posts_group', sql)
+        response = self.client.get(
+            reverse('posts:api_posts'), {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_scoped_resources(self):
+        """Группы, профили и их посты."""
+        group = self.client.get(
+            reverse('posts:api_group_detail', args=['test-slug'])).json()
+        self.assertEqual(group['posts_count'], 6)
+        posts = self.client.get(
+            reverse('posts:api_group_posts', args=['test-slug']),
+            {'fields': 'group'}).json()['results']
+        self.assertEqual({post['group'] for post in posts}, {'test-slug'})
+        profile = self.client.get(
+            reverse('posts:api_profile_detail', args=['author']),
+            {'fields': 'username,posts_count'}).json()
+        self.assertEqual(profile, {'username': 'author', 'posts_count': 13})
+        groups = self.client.get(reverse('posts:api_groups')).json()
+        self.assertEqual(groups['results'][0]['slug'], 'test-slug')
+        response = self.client.get(
+            reverse('posts:api_profile_posts', args=['nobody']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_cacheable(self):
+        """Ответ с ETag: повтор из кэша, If-None-Match даёт 304,
+        новый пост меняет ответ."""
+        url = reverse('posts:api_posts')
+        response = self.client.get(url)
+        self.assertIn('public', response['Cache-Control'])
+        with self.assertNumQueries(0):
+            self.client.get(url)
+            not_modified = self.client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        Post.objects.create(author=self.user, text='Свежий пост')
+        fresh = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(fresh.json()['results'][0]['text'], 'Свежий пост')
+
+    def test_read_only(self):
+        """Запись через API запрещена."""
+        response = self.client.post(reverse('posts:api_posts'))
+        self.assertEqual(response.status_code, 405)
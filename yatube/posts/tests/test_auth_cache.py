@@ -0,0 +1,108 @@
+import tempfile
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+)
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.auth import ensure_shared_caches
+from posts.feed_cache import get_cache
+
+User = get_user_model()
+
+
+class CachedAuthTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.user = User.objects.create_user(
+            username='reader', password='Old-pass-123')
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.url = reverse('posts:index')
+
+    def auth_queries(self, client):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.url)
+        tables = ('django_session', 'auth_user')
+        return response, [
+            query['sql'] for query in context.captured_queries
+            if any(f'FROM "{table}"' in query['sql'] for table in tables)
+        ]
+
+    def test_session_and_user_from_cache(self):
+        """Повторный запрос не читает сессию и пользователя из базы."""
+        self.client.get(self.url)
+        response, queries = self.auth_queries(self.client)
+        self.assertEqual(queries, [])
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_anonymous_does_not_touch_session(self):
+        """Гость без cookie сессии не обращается к таблице сессий."""
+        _, queries = self.auth_queries(Client())
+        self.assertEqual(queries, [])
+
+    def test_profile_change_invalidates_cached_user(self):
+        """Изменение пользователя сразу видно в следующем запросе."""
+        self.client.get(self.url)
+        self.user.first_name = 'Лев'
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['user'].first_name, 'Лев')
+
+    def test_password_change_ends_other_sessions(self):
+        """После смены пароля старая сессия из кэша недействительна."""
+        self.client.get(self.url)
+        self.user.set_password('New-pass-456')
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    def test_sessions_of_model_backend_kept(self):
+        """Сессия, открытая через ModelBackend, остаётся действительной.
+        """
+        engine = import_module(settings.SESSION_ENGINE)
+        session = engine.SessionStore()
+        session[SESSION_KEY] = str(self.user.pk)
+        session[BACKEND_SESSION_KEY] = (
+            'django.contrib.auth.backends.ModelBackend')
+        session[HASH_SESSION_KEY] = self.user.get_session_auth_hash()
+        session.save()
+        client = Client()
+        client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+        response = client.get(self.url)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_shared_cache_keeps_many_sessions(self):
+        """Общий кэш не вытесняет сессии после первых сотен записей."""
+        cache = caches[settings.SESSION_CACHE_ALIAS]
+        cache.clear()
+        cache.set_many({f'session:{i}': i for i in range(2000)})
+        self.assertEqual(cache.get('session:0'), 0)
+        self.assertEqual(len(cache.get_many(
+            [f'session:{i}' for i in range(2000)])), 2000)
+        cache.clear()
+
+    def test_process_cache_rejected_outside_debug(self):
+        """Вне DEBUG кэш сессий или ограничения запросов в памяти
+        процесса — ошибка настройки."""
+        with override_settings(DEBUG=False):
+            with self.assertRaises(ImproperlyConfigured):
+                ensure_shared_caches()
+        shared = {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': tempfile.gettempdir(),
+        }
+        caches = {**settings.CACHES, 'shared': shared}
+        with override_settings(DEBUG=False, CACHES=caches):
+            ensure_shared_caches()
+        with override_settings(
+                DEBUG=False, CACHES=caches, THROTTLE_CACHE_ALIAS='default'):
+            with self.assertRaises(ImproperlyConfigured):
+                ensure_shared_caches()
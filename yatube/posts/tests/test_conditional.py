@@ -0,0 +1,91 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.feed_cache import get_cache
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.guest_client = Client()
+        self.user = User.objects.create_user(username='author')
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug',
+            description='Тестовое описание')
+        self.post = Post.objects.create(
+            author=self.user, text='Тестовый пост', group=self.group)
+        self.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=[self.group.slug]),
+            reverse('posts:profile', args=[self.user.username]),
+            reverse('posts:post_detail', args=[self.post.id]),
+        )
+
+    def revalidate(self, url, client):
+        etag = client.get(url)['ETag']
+        return client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_matching_etag_returns_304_without_main_query(self):
+        """Совпавший ETag даёт 304 без основного запроса и рендера."""
+        # Группа и автор берутся из кэша поиска
+        queries = {self.urls[3]: 1}
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.guest_client.get(url)['ETag']
+                with self.assertNumQueries(queries.get(url, 0)):
+                    response = self.guest_client.get(
+                        url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+
+    def test_writes_change_etag(self):
+        """Правка, удаление поста и смена группы меняют ETag."""
+        etags = {url: self.guest_client.get(url)['ETag'] for url in self.urls}
+        self.post.text = 'Исправленный пост'
+        self.post.save()
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etags[url])
+                self.assertEqual(response.status_code, 200)
+        etag = self.guest_client.get(self.urls[0])['ETag']
+        Post.objects.create(author=self.user, text='Второй пост').delete()
+        response = self.guest_client.get(
+            self.urls[0], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_depends_on_page_and_viewer(self):
+        """ETag различается для страниц и для гостя и автора."""
+        url = self.urls[0]
+        guest = self.guest_client.get(url)['ETag']
+        second_page = self.guest_client.get(url, {'page': 2})['ETag']
+        self.assertNotEqual(guest, second_page)
+        self.assertNotEqual(guest, self.authorized_client.get(url)['ETag'])
+        response = self.revalidate(url, self.authorized_client)
+        self.assertEqual(response.status_code, 304)
+
+    def test_last_modified(self):
+        """If-Modified-Since сравнивается с временем изменения ленты."""
+        # Отметки областей, которых ещё не касались записи, ставит
+        # первый запрос
+        self.guest_client.get(self.urls[0])
+        with mock.patch('posts.conditional.time.time',
+                        return_value=2 ** 32):
+            response = self.guest_client.get(self.urls[0])
+            last_modified = response['Last-Modified']
+            response = self.guest_client.get(
+                self.urls[0], HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_fresh_change_has_no_last_modified(self):
+        """Изменение в текущей секунде не попадает в Last-Modified."""
+        response = self.guest_client.get(self.urls[0])
+        self.assertFalse(response.has_header('Last-Modified'))
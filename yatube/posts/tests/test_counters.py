@@ -0,0 +1,81 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.feed_cache import get_cache
+from posts.models import AuthorStats, Group, Post
+
+User = get_user_model()
+
+
+class PostCountersTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='TestUser')
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.group_1 = Group.objects.create(
+            title='Тестовая группа1',
+            slug='test-slug1',
+            description='Тестовое описание1',
+        )
+        self.group_2 = Group.objects.create(
+            title='Тестовая группа2',
+            slug='test-slug2',
+            description='Тестовое описание2',
+        )
+
+    def assert_counts(self, author, group_1, group_2):
+        self.user.stats.refresh_from_db()
+        self.group_1.refresh_from_db()
+        self.group_2.refresh_from_db()
+        self.assertEqual(self.user.stats.posts_count, author)
+        self.assertEqual(self.group_1.posts_count, group_1)
+        self.assertEqual(self.group_2.posts_count, group_2)
+
+    def test_counters_follow_create_edit_delete(self):
+        """Счётчики меняются при создании, смене группы и удалении."""
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            {'text': 'Новая запись', 'group': self.group_1.id},
+        )
+        self.assert_counts(1, 1, 0)
+        post = Post.objects.get(author=self.user)
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.id}),
+            {'text': 'Новая запись', 'group': self.group_2.id},
+        )
+        self.assert_counts(1, 0, 1)
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.id}),
+            {'text': 'Другой текст', 'group': self.group_2.id},
+        )
+        self.assert_counts(1, 0, 1)
+        post.delete()
+        self.assert_counts(0, 0, 0)
+
+    def test_rebuild_counters_command(self):
+        """Команда rebuild_counters восстанавливает рассинхронизированные
+        счётчики."""
+        Post.objects.bulk_create([
+            Post(author=self.user, text='Пост', group=self.group_1)
+            for _ in range(3)
+        ])
+        AuthorStats.objects.all().delete()
+        Group.objects.update(posts_count=0)
+        call_command('rebuild_counters', stdout=StringIO())
+        self.assert_counts(3, 3, 0)
+
+    def test_profile_reads_stored_count(self):
+        """Профиль не считает посты автора через COUNT(*)."""
+        Post.objects.create(author=self.user, text='Пост')
+        url = reverse('posts:profile', kwargs={'username': 'TestUser'})
+        response = Client().get(url)
+        self.assertEqual(response.context['posts_count'], 1)
+        self.assertEqual(response.context['page_obj'].paginator.count, 1)
+        get_cache().clear()
+        # Пользователь со счётчиками, страница, месяцы и группы сводки
+        with self.assertNumQueries(4):
+            Client().get(url)
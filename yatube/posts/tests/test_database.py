@@ -0,0 +1,75 @@
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+)
+from django.test.utils import CaptureQueriesContext
+
+from core.middleware import ReadReplicaMiddleware
+from core.routers import ReadReplicaRouter, read_replica
+from posts.models import Post
+
+
+class SQLiteSettingsTests(TransactionTestCase):
+    def test_pragmas_applied_on_connect(self):
+        """PRAGMA из OPTIONS выполняются на новом соединении."""
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_transactions_begin_immediate(self):
+        """Транзакция сразу берёт блокировку на запись."""
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                Post.objects.exists()
+        self.assertEqual(queries.captured_queries[0]['sql'], 'BEGIN IMMEDIATE')
+
+
+@override_settings(DATABASE_READ_ALIAS='replica', DATABASE_REPLICA_LAG=5)
+class ReadReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = ReadReplicaRouter()
+
+    def routed(self, request, view):
+        seen = {}
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            seen['read'] = self.router.db_for_read(Post)
+            seen['write'] = self.router.db_for_write(Post)
+            return HttpResponse()
+
+        middleware = ReadReplicaMiddleware(get_response)
+        response = middleware(request)
+        return seen, response
+
+    def test_read_only_view_reads_replica(self):
+        """Представление с @read_replica читает из реплики, пишет в
+        основную базу."""
+        seen, _ = self.routed(
+            self.factory.get('/'), read_replica(lambda request: None))
+        self.assertEqual(seen, {'read': 'replica', 'write': 'default'})
+        self.assertIsNone(self.router.db_for_read(Post))
+
+    def test_other_views_read_primary(self):
+        """Непомеченные представления и изменяющие запросы читают из
+        основной базы, после записи клиент закрепляется за ней."""
+        seen, _ = self.routed(self.factory.get('/'), lambda request: None)
+        self.assertIsNone(seen['read'])
+        seen, response = self.routed(
+            self.factory.post('/'), read_replica(lambda request: None))
+        self.assertIsNone(seen['read'])
+        cookie = response.cookies[ReadReplicaMiddleware.pin_cookie]
+        self.assertEqual(cookie['max-age'], 5)
+        request = self.factory.get('/')
+        request.COOKIES[ReadReplicaMiddleware.pin_cookie] = '1'
+        seen, _ = self.routed(request, read_replica(lambda request: None))
+        self.assertIsNone(seen['read'])
+
+    def test_no_migrations_on_replica(self):
+        """Миграции не применяются к реплике."""
+        self.assertFalse(self.router.allow_migrate('replica', 'posts'))
+        self.assertIsNone(self.router.allow_migrate('default', 'posts'))
@@ -0,0 +1,85 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.export import export_rows
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.guest_client = Client()
+        self.user = User.objects.create_user(username='writer')
+        self.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug',
+            description='Тестовое описание')
+        Post.objects.bulk_create([
+            Post(author=self.user, text=f'Пост, "с кавычками" {i}',
+                 group=self.group if i % 2 else None)
+            for i in range(5)
+        ])
+        self.profile_url = reverse(
+            'posts:profile_export', args=[self.user.username])
+
+    def content(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_profile_export_jsonl(self):
+        """Выгрузка автора — по строке JSON на пост."""
+        response = self.guest_client.get(self.profile_url)
+        self.assertIn('attachment', response['Content-Disposition'])
+        rows = [
+            json.loads(line)
+            for line in self.content(response).decode().splitlines()
+        ]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(
+            set(rows[0]), {'id', 'text', 'pub_date', 'author', 'group'})
+        self.assertEqual({row['author'] for row in rows}, {'writer'})
+
+    def test_group_export_csv_gzip(self):
+        """CSV группы сжимается gzip потоком и читается обратно."""
+        response = self.guest_client.get(
+            reverse('posts:group_export', args=[self.group.slug]),
+            {'format': 'csv', 'compress': 'gzip'}
+        )
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        text = gzip.decompress(self.content(response)).decode()
+        rows = list(csv.DictReader(io.StringIO(text)))
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(rows[0]['text'].startswith('Пост, "с кавычками"'))
+
+    def test_unknown_format(self):
+        """Неизвестный формат — ошибка 400."""
+        response = self.guest_client.get(self.profile_url, {'format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_rows_are_lazy(self):
+        """Посты читаются только при чтении потока."""
+        with self.assertNumQueries(0):
+            rows = export_rows(Post.objects.all(), chunk_size=2)
+        with self.assertNumQueries(1):
+            self.assertEqual(len(list(rows)), 5)
+
+    def test_command_output_imports_back(self):
+        """Выгрузка export_posts загружается обратно через import_posts."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'posts.jsonl')
+            call_command('export_posts', author='writer', output=path)
+            Post.objects.all().delete()
+            call_command(
+                'import_posts', path, stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(Post.objects.filter(author=self.user).count(), 5)
+        self.assertEqual(Post.objects.filter(group=self.group).count(), 2)
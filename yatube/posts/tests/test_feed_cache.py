@@ -0,0 +1,190 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.feed_cache import (
+    AUTHORS_SCOPE, GLOBAL_SCOPE, author_scope, get_cache, get_generation,
+    group_scope
+)
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class FeedCacheTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.guest_client = Client()
+        self.user = User.objects.create_user(username='author')
+        self.group_1 = Group.objects.create(
+            title='Тестовая группа1',
+            slug='test-slug1',
+            description='Тестовое описание1',
+        )
+        self.group_2 = Group.objects.create(
+            title='Тестовая группа2',
+            slug='test-slug2',
+            description='Тестовое описание2',
+        )
+        self.post = Post.objects.create(
+            author=self.user,
+            text='Тестовый пост',
+            group=self.group_1,
+        )
+        self.urls = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group_1.slug}),
+            reverse('posts:profile', kwargs={'username': 'author'}),
+        ]
+
+    def get_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            self.guest_client.get(url)
+        return [query['sql'] for query in context.captured_queries]
+
+    def test_cached_feed_skips_post_query(self):
+        """Повторный запрос ленты не читает посты из базы."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.guest_client.get(url)
+                for query in self.get_queries(url):
+                    self.assertNotIn('"posts_post"."text"', query)
+
+    def test_post_save_bumps_matching_generations(self):
+        """Новый пост меняет поколения своей группы, автора и общее,
+        но не чужой группы."""
+        scopes = {
+            GLOBAL_SCOPE: True,
+            author_scope(self.user.id): True,
+            group_scope(self.group_1.id): True,
+            group_scope(self.group_2.id): False,
+        }
+        before = {scope: get_generation(scope) for scope in scopes}
+        Post.objects.create(
+            author=self.user, text='Новый пост', group=self.group_1)
+        for scope, changed in scopes.items():
+            with self.subTest(scope=scope):
+                self.assertEqual(
+                    get_generation(scope) != before[scope], changed)
+
+    def test_new_post_is_shown_on_cached_feeds(self):
+        """После сохранения поста закэшированные ленты его показывают."""
+        for url in self.urls:
+            self.guest_client.get(url)
+        Post.objects.create(
+            author=self.user, text='Свежий пост', group=self.group_1)
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertContains(response, 'Свежий пост')
+
+    def test_group_change_refreshes_previous_group(self):
+        """Перенос поста в другую группу сбрасывает кэш прежней группы."""
+        url = self.urls[1]
+        self.guest_client.get(url)
+        self.post.group = self.group_2
+        self.post.save()
+        response = self.guest_client.get(url)
+        self.assertNotContains(response, 'Тестовый пост')
+
+    def test_group_and_author_changes_refresh_feeds(self):
+        """Новый slug группы и новое имя автора видны в закэшированных
+        лентах, а вход пользователя ленты не сбрасывает."""
+        for url in self.urls:
+            self.guest_client.get(url)
+        # Счётчик постов группы изменился в базе после её создания
+        self.group_1.refresh_from_db()
+        self.group_1.slug = 'renamed-slug'
+        self.group_1.save()
+        self.user.first_name = 'Лев'
+        self.user.last_name = 'Толстой'
+        self.user.save()
+        urls = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'renamed-slug'}),
+            reverse('posts:profile', kwargs={'username': 'author'}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertContains(response, '/group/renamed-slug/')
+                self.assertNotContains(response, '/group/test-slug1/')
+                if 'profile' not in url:
+                    self.assertContains(response, 'Лев Толстой')
+        generation = get_generation(AUTHORS_SCOPE)
+        self.user.set_password('password')
+        self.user.save()
+        self.assertTrue(
+            self.guest_client.login(username='author', password='password'))
+        self.assertEqual(get_generation(AUTHORS_SCOPE), generation)
+
+
+class FileBasedFeedCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.cache_dir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.cache_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_file_based_backend(self):
+        """Кэш лент работает с файловым бэкендом."""
+        caches = {
+            **settings.CACHES,
+            'feeds': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': self.cache_dir,
+            },
+        }
+        with override_settings(CACHES=caches, POSTS_CACHE_ALIAS='feeds'):
+            user = User.objects.create_user(username='author')
+            Post.objects.create(author=user, text='Первый пост')
+            client = Client()
+            client.get(reverse('posts:index'))
+            Post.objects.create(author=user, text='Второй пост')
+            response = client.get(reverse('posts:index'))
+            self.assertContains(response, 'Второй пост')
+
+
+class PostDetailTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.guest_client = Client()
+        self.user = User.objects.create_user(username='author')
+        self.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        self.post = Post.objects.create(
+            author=self.user,
+            text='Тестовый пост',
+            group=self.group,
+        )
+        self.url = reverse(
+            'posts:post_detail', kwargs={'post_id': self.post.id})
+
+    def test_post_detail_single_query(self):
+        """Пост, группа, автор и число его постов читаются одним запросом.
+        """
+        with self.assertNumQueries(1):
+            response = self.guest_client.get(self.url)
+        self.assertEqual(response.context['post'].author_posts_count, 1)
+
+    def test_edited_post_is_rendered_again(self):
+        """Кэш статьи привязан к updated_at и сбрасывается правкой."""
+        self.guest_client.get(self.url)
+        self.post.text = 'Исправленный пост'
+        self.post.save()
+        response = self.guest_client.get(self.url)
+        self.assertContains(response, 'Исправленный пост')
@@ -0,0 +1,92 @@
+from xml.etree import ElementTree
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.feed_cache import get_cache
+from posts.feeds import FEED_ITEMS
+from posts.models import Group, Post
+
+User = get_user_model()
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+
+class FeedTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.guest_client = Client()
+        self.user = User.objects.create_user(username='author')
+        self.other = User.objects.create_user(username='other')
+        self.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug',
+            description='Тестовое описание')
+        self.post = Post.objects.create(
+            author=self.user, text='Пост в группе', group=self.group)
+        Post.objects.create(author=self.other, text='Пост без группы')
+
+    def rss_titles(self, url):
+        response = self.guest_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        root = ElementTree.fromstring(response.content)
+        return [item.findtext('title') for item in root.iter('item')]
+
+    def test_scopes(self):
+        """Ленты сайта, группы и автора содержат посты своей области."""
+        self.assertEqual(
+            len(self.rss_titles(reverse('posts:index_rss'))), 2)
+        self.assertEqual(
+            self.rss_titles(
+                reverse('posts:group_rss', args=[self.group.slug])),
+            ['Пост в группе']
+        )
+        self.assertEqual(
+            self.rss_titles(reverse('posts:profile_rss', args=['other'])),
+            ['Пост без группы']
+        )
+        self.assertEqual(
+            self.guest_client.get(
+                reverse('posts:group_rss', args=['missing'])).status_code,
+            404
+        )
+
+    def test_atom(self):
+        """Atom-лента отдаёт записи с категорией группы."""
+        response = self.guest_client.get(
+            reverse('posts:group_atom', args=[self.group.slug]))
+        self.assertTrue(response['Content-Type'].startswith(
+            'application/atom+xml'))
+        entries = list(ElementTree.fromstring(response.content).iter(
+            f'{ATOM}entry'))
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(
+            entries[0].find(f'{ATOM}category').get('term'), self.group.title)
+
+    def test_recent_posts_only(self):
+        """В ленту попадают только последние посты."""
+        Post.objects.bulk_create([
+            Post(author=self.user, text=f'Пост {i}')
+            for i in range(FEED_ITEMS)
+        ])
+        self.assertEqual(
+            len(self.rss_titles(reverse('posts:index_rss'))), FEED_ITEMS)
+
+    def test_cached_until_scope_changes(self):
+        """XML берётся из кэша, запись в области его обновляет."""
+        url = reverse('posts:profile_rss', args=[self.user.username])
+        self.guest_client.get(url)
+        with self.assertNumQueries(0):
+            self.guest_client.get(url)
+        Post.objects.create(author=self.other, text='Чужой пост')
+        with self.assertNumQueries(0):
+            self.guest_client.get(url)
+        Post.objects.create(author=self.user, text='Новый пост')
+        self.assertIn('Новый пост', self.rss_titles(url))
+
+    def test_conditional_get(self):
+        """Совпавший ETag даёт 304."""
+        url = reverse('posts:index_atom')
+        etag = self.guest_client.get(url)['ETag']
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.feed_cache import get_cache
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class GroupIndexTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.author = User.objects.create_user(username='author')
+        self.cats = Group.objects.create(title='Коты', slug='cats')
+        self.dogs = Group.objects.create(title='Собаки', slug='dogs')
+        Post.objects.create(
+            author=self.author, text='Старый пост', group=self.cats)
+        self.latest = Post.objects.create(
+            author=self.author, text='Новый пост ' + 'x' * 200,
+            group=self.cats)
+        self.url = reverse('posts:group_index')
+
+    def groups(self, response):
+        return {group.slug: group for group in response.context['page_obj']}
+
+    def test_directory_lists_groups_with_last_post(self):
+        """Каталог показывает число постов и начало последнего поста."""
+        response = self.client.get(self.url)
+        groups = self.groups(response)
+        self.assertEqual(list(groups), ['cats', 'dogs'])
+        self.assertEqual(groups['cats'].posts_count, 2)
+        self.assertEqual(groups['cats'].last_post_at, self.latest.pub_date)
+        self.assertContains(response, 'Новый пост')
+        self.assertNotContains(response, 'x' * 150)
+        self.assertIsNone(groups['dogs'].last_post_at)
+
+    def test_single_query_for_page(self):
+        """Страница каталога читается одним запросом, повторно — из
+        кэша без запросов."""
+        self.client.get(self.url)
+        get_cache().clear()
+        # Число групп и страница групп с последними постами
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_last_post_follows_writes(self):
+        """Удаление и перенос поста меняют последний пост группы и
+        сбрасывают кэш каталога."""
+        self.client.get(self.url)
+        self.latest.group = self.dogs
+        self.latest.save()
+        groups = self.groups(self.client.get(self.url))
+        self.assertEqual(groups['dogs'].last_post_at, self.latest.pub_date)
+        self.assertEqual(groups['cats'].posts_count, 1)
+        self.latest.delete()
+        response = self.client.get(self.url)
+        self.assertIsNone(self.groups(response)['dogs'].last_post_at)
+        self.assertNotContains(response, 'Новый пост')
@@ -0,0 +1,150 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class ImportPostsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='legacy')
+        self.group = Group.objects.create(
+            title='Архив', slug='archive', description='Тестовое описание')
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as source:
+            source.write(content)
+        return path
+
+    def import_posts(self, *args, **options):
+        call_command(
+            'import_posts', *args, stdout=StringIO(), stderr=StringIO(),
+            **options
+        )
+
+    def test_import_jsonl_keeps_derived_data(self):
+        """JSONL импортируется пачками, счётчики и поиск обновляются."""
+        records = [
+            {'text': f'Старый пост {i}', 'author': 'legacy',
+             'group': 'archive', 'pub_date': '2015-03-01T10:00:00'}
+            for i in range(5)
+        ] + [
+            {'text': 'Без автора', 'author': 'nobody'},
+            {'text': 'Чужая группа', 'author': 'legacy', 'group': 'none'},
+        ]
+        path = self.write(
+            'posts.jsonl', '\n'.join(json.dumps(r) for r in records))
+        self.import_posts(path, chunk_size=2)
+        self.assertEqual(Post.objects.count(), 5)
+        self.assertEqual(
+            set(Post.objects.values_list('pub_date__year', flat=True)),
+            {2015}
+        )
+        self.user.stats.refresh_from_db()
+        self.group.refresh_from_db()
+        self.assertEqual(self.user.stats.posts_count, 5)
+        self.assertEqual(self.group.posts_count, 5)
+        response = self.client.get('/search/', {'q': 'старый'})
+        self.assertEqual(len(response.context['page_obj']), 5)
+
+    def test_malformed_lines_rejected(self):
+        """Битая строка, запись не-объект и нераспознанная дата
+        отклоняются, импорт идёт дальше."""
+        path = self.write('broken.jsonl', '\n'.join([
+            json.dumps({'text': 'До', 'author': 'legacy'}),
+            '{"text": "обрыв',
+            json.dumps(['не', 'объект']),
+            json.dumps({'text': 'Список', 'author': ['legacy']}),
+            json.dumps({'text': 'Вчера', 'author': 'legacy',
+                        'pub_date': 'yesterday'}),
+            json.dumps({'text': 'После', 'author': 'legacy',
+                        'pub_date': '2015-03-01T10:00:00'}),
+        ]))
+        out = StringIO()
+        call_command('import_posts', path, stdout=out, stderr=StringIO())
+        self.assertEqual(
+            sorted(Post.objects.values_list('text', flat=True)),
+            ['До', 'После']
+        )
+        self.assertIn('отклонено 4', out.getvalue())
+
+    def test_pub_date_kept_without_second_write(self):
+        """Даты импорта записываются тем же INSERT и доходят до
+        сводки."""
+        path = self.write('dated.jsonl', json.dumps(
+            {'text': 'Старый', 'author': 'legacy',
+             'pub_date': '2015-03-01T10:00:00'}))
+        with CaptureQueriesContext(connection) as queries:
+            self.import_posts(path)
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "posts_post"')
+        ])
+        self.assertEqual(
+            list(self.user.month_stats.values_list('month__year', flat=True)),
+            [2015]
+        )
+        self.user.stats.refresh_from_db()
+        self.assertEqual(self.user.stats.last_post_at.year, 2015)
+
+    def test_import_csv(self):
+        """CSV читается по заголовку, группа необязательна."""
+        path = self.write(
+            'posts.csv', 'text,author,group\nПервый,legacy,\nВторой,legacy,'
+            'archive\n')
+        self.import_posts(path)
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(Post.objects.filter(group=self.group).count(), 1)
+
+    def test_resume_from_checkpoint(self):
+        """После сбоя импорт продолжается с последней сохранённой пачки."""
+        path = self.write('resume.jsonl', '\n'.join(
+            json.dumps({'text': f'Пост {i}', 'author': 'legacy'})
+            for i in range(6)
+        ))
+        checkpoint = os.path.join(self.directory, 'resume.checkpoint')
+        original = Post.objects.bulk_create
+        calls = []
+
+        def failing_bulk_create(objs, *args, **kwargs):
+            calls.append(len(objs))
+            if len(calls) == 2:
+                raise RuntimeError('сбой')
+            return original(objs, *args, **kwargs)
+
+        with mock.patch.object(
+                type(Post.objects), 'bulk_create',
+                side_effect=failing_bulk_create, autospec=False):
+            with self.assertRaises(RuntimeError):
+                self.import_posts(path, chunk_size=2, checkpoint=checkpoint)
+        self.assertEqual(Post.objects.count(), 2)
+        with open(checkpoint) as saved:
+            self.assertEqual(saved.read(), '2')
+        self.import_posts(path, chunk_size=2, checkpoint=checkpoint)
+        self.assertEqual(
+            sorted(Post.objects.values_list('text', flat=True)),
+            [f'Пост {i}' for i in range(6)]
+        )
+        self.assertFalse(os.path.exists(checkpoint))
@@ -0,0 +1,64 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.signals import request_finished
+from django.db import close_old_connections
+from django.test import TestCase
+
+from core.loadtest import LoadDriver, build_routes
+from posts.models import AuthorStats, Group, Post
+from posts.urls import urlpatterns
+
+
+class LoadHarnessTests(TestCase):
+    def test_seed_dataset_creates_consistent_rows(self):
+        """seed_dataset создаёт данные пачками и держит счётчики."""
+        call_command(
+            'seed_dataset', users=5, groups=3, posts=120, batch_size=50,
+            seed=1, stdout=StringIO()
+        )
+        self.assertEqual(Post.objects.count(), 120)
+        self.assertEqual(Group.objects.count(), 3)
+        stats_total = sum(
+            AuthorStats.objects.values_list('posts_count', flat=True))
+        self.assertEqual(stats_total, 120)
+        # Даты раскиданы по периоду, а не совпадают у всей пачки
+        self.assertGreater(
+            Post.objects.values('pub_date').distinct().count(), 100)
+
+    def test_routes_cover_posts_urls(self):
+        """Нагрузка строится по всем маршрутам posts.urls."""
+        call_command(
+            'seed_dataset', users=1, groups=1, posts=1, group_share=1,
+            seed=1, stdout=StringIO()
+        )
+        post = Post.objects.select_related('author', 'group').first()
+        names = {
+            route.name
+            for route in build_routes(post, post.group, post.author)
+        }
+        for pattern in urlpatterns:
+            with self.subTest(name=pattern.name):
+                self.assertIn(f'posts:{pattern.name}', names)
+
+    def test_load_driver_reports_every_route(self):
+        """Нагрузка проходит все маршруты и отдаёт перцентили."""
+        call_command(
+            'seed_dataset', users=2, groups=1, posts=10, group_share=1,
+            seed=1, stdout=StringIO()
+        )
+        post = Post.objects.select_related('author', 'group').first()
+        routes = build_routes(post, post.group, post.author, post.author)
+        driver = LoadDriver(routes, requests=150, seed=1)
+        # Как и тестовый клиент, не даём обработчику закрыть соединение
+        request_finished.disconnect(close_old_connections)
+        try:
+            report = driver.run()
+        finally:
+            request_finished.connect(close_old_connections)
+        self.assertEqual(report['total']['requests'], 150)
+        self.assertEqual(report['total']['errors'], 0)
+        for name, summary in report['routes'].items():
+            with self.subTest(route=name):
+                self.assertIsNotNone(summary['latency_ms']['p99'])
+                self.assertIsNotNone(summary['queries_per_request']['mean'])
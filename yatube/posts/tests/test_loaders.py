@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.template import engines
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from core.loaders import CachedLoader, strip_whitespace, warm_templates
+
+User = get_user_model()
+
+
+def cached_loader():
+    loader, = engines['django'].engine.template_loaders
+    return loader
+
+
+class StripWhitespaceTests(SimpleTestCase):
+    def test_indentation_removed(self):
+        """Отступы, пустые строки и строки из одних тегов удаляются."""
+        source = (
+            '<div>\n    {% if a %}\n\n      <p>{{ a }}</p>\n'
+            '    {% endif %}\n</div>\n'
+        )
+        self.assertEqual(
+            strip_whitespace(source),
+            '<div>\n{% if a %}<p>{{ a }}</p>\n{% endif %}</div>\n'
+        )
+
+    def test_output_tags_keep_newline(self):
+        """После строки из тегов с выводом перевод строки остаётся."""
+        source = (
+            "{% load i18n %}\n{% trans 'a' %}\n{% url 'b' %}\n"
+            "{% include 'c' %}\n{% block d %}\nx{% endblock %}\n"
+        )
+        self.assertEqual(
+            strip_whitespace(source),
+            "{% load i18n %}{% trans 'a' %}\n{% url 'b' %}\n"
+            "{% include 'c' %}\n{% block d %}x{% endblock %}\n"
+        )
+
+    def test_pre_preserved(self):
+        """Содержимое <pre> и <textarea> не меняется."""
+        source = '<pre>\n  a\n  {% b %}\n</pre>\n  <textarea>\n x</textarea>'
+        self.assertEqual(
+            strip_whitespace(source),
+            '<pre>\n  a\n  {% b %}\n</pre>\n<textarea>\n x</textarea>'
+        )
+
+
+class CachedLoaderTests(TestCase):
+    def setUp(self):
+        self.loader = cached_loader()
+        self.loader.reset()
+
+    def test_templates_compiled_once(self):
+        """Скомпилированный шаблон переиспользуется между запросами."""
+        self.assertIsInstance(self.loader, CachedLoader)
+        template = self.loader.get_template('posts/index.html')
+        self.assertIs(self.loader.get_template('posts/index.html'), template)
+
+    def test_warm_compiles_all_templates(self):
+        """Прогрев кладёт в кэш все шаблоны проекта."""
+        self.assertGreater(warm_templates(), 0)
+        compiled = self.loader.get_template_cache
+        self.assertIn('posts/index.html', compiled)
+        self.assertIn('includes/paginator.html', compiled)
+
+    def test_rendered_page_not_indented(self):
+        """В ответе нет строк с отступом из шаблонов."""
+        response = self.client.get(reverse('posts:index'))
+        lines = response.content.decode().splitlines()
+        self.assertFalse([line for line in lines if line.startswith('  ')])
+
+    def test_email_templates_untouched(self):
+        """Письмо для сброса пароля сохраняет абзацы и ссылку на
+        отдельной строке."""
+        User.objects.create_user(
+            username='user', email='user@example.com', password='pass')
+        self.client.post(
+            reverse('password_reset'), {'email': 'user@example.com'})
+        body = mail.outbox[0].body
+        self.assertIn('\n\n', body)
+        self.assertTrue([
+            line for line in body.splitlines()
+            if line.startswith('http://testserver/auth/reset/')
+        ])
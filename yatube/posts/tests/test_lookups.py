@@ -0,0 +1,105 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.http import Http404
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.feed_cache import get_cache
+from posts.lookups import (
+    LOOKUPS, author_lookup, get_author, get_group, group_lookup
+)
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class ObjectLookupTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        for lookup in LOOKUPS:
+            lookup.clear()
+        self.group = Group.objects.create(title='Коты', slug='cats')
+        self.author = User.objects.create_user(username='author')
+
+    def test_local_and_shared_hits(self):
+        """Повторный поиск идёт из словаря процесса, затем из общего
+        кэша, без запросов к базе."""
+        get_group('cats')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_group('cats'), self.group)
+        get_author('author')
+        author_lookup.local.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_author('author'), self.author)
+        self.assertEqual(author_lookup.stats['shared_hits'], 1)
+        self.assertEqual(group_lookup.stats['local_hits'], 1)
+
+    def test_missing_cached(self):
+        """Отсутствующий slug кэшируется до создания группы."""
+        with self.assertRaises(Http404):
+            get_group('dogs')
+        with self.assertNumQueries(0), self.assertRaises(Http404):
+            get_group('dogs')
+        Group.objects.create(title='Собаки', slug='dogs')
+        self.assertEqual(get_group('dogs').title, 'Собаки')
+        with self.assertRaises(Http404):
+            get_author('reader')
+        User.objects.create_user(username='reader')
+        self.assertEqual(get_author('reader').username, 'reader')
+
+    def test_invalidated_on_change(self):
+        """Изменение, удаление и новые посты видны при следующем поиске."""
+        get_group('cats')
+        get_author('author')
+        Post.objects.create(author=self.author, group=self.group, text='Пост')
+        self.assertEqual(get_group('cats').posts_count, 1)
+        self.assertEqual(get_author('author').stats.posts_count, 1)
+        self.author.username = 'writer'
+        self.author.save()
+        with self.assertRaises(Http404):
+            get_author('author')
+        self.group.delete()
+        with self.assertRaises(Http404):
+            get_group('cats')
+
+    def test_renamed_user_found_by_new_name(self):
+        """Новое имя пользователя, раньше не найденное, находится сразу
+        после переименования."""
+        with self.assertRaises(Http404):
+            get_author('writer')
+        response = self.client.get(reverse('posts:profile', args=['writer']))
+        self.assertEqual(response.status_code, 404)
+        self.author.username = 'writer'
+        self.author.save()
+        self.assertEqual(get_author('writer'), self.author)
+        response = self.client.get(reverse('posts:profile', args=['writer']))
+        self.assertEqual(response.status_code, 200)
+
+    def test_views_use_cache(self):
+        """Лента группы и профиль ищут объект в базе один раз,
+        несуществующий slug — тоже."""
+        for _ in range(2):
+            self.client.get(reverse('posts:group_list', args=['cats']))
+            self.client.get(reverse('posts:profile', args=['author']))
+            response = self.client.get(
+                reverse('posts:group_list', args=['missing']))
+            self.assertEqual(response.status_code, 404)
+        self.assertEqual(group_lookup.stats['misses'], 2)
+        self.assertEqual(group_lookup.stats['local_hits'], 2)
+        self.assertEqual(group_lookup.stats['not_found'], 2)
+        self.assertEqual(author_lookup.stats['misses'], 1)
+
+    @override_settings(POSTS_LOOKUP_STATS_FLUSH=2)
+    def test_stats_command(self):
+        """lookup_stats показывает сброшенные в общий кэш счётчики."""
+        get_group('cats')
+        get_group('cats')
+        out = StringIO()
+        call_command('lookup_stats', reset=True, stdout=out)
+        self.assertIn('"local_hits": 1', out.getvalue())
+        self.assertIn('"misses": 1', out.getvalue())
+        out = StringIO()
+        call_command('lookup_stats', stdout=out)
+        self.assertNotIn('"misses": 1', out.getvalue())
@@ -0,0 +1,167 @@
+from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core.templatetags.pagination import page_window
+from posts.feed_cache import get_cache
+from posts.models import Group, Post
+from posts.paginators import CursorPage, NoCountPaginator, decode_cursor
+
+COUNT_TEST_POSTS = 25
+POSTS_ON_PAGE = 10
+
+User = get_user_model()
+
+
+class CursorPaginatorViewsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create([
+            Post(author=cls.author, text=f'Тестовый пост № {i}',
+                 group=cls.group)
+            for i in range(COUNT_TEST_POSTS)
+        ])
+        # Одинаковая дата у всех постов: порядок держится только на id
+        first = Post.objects.order_by('pk').first()
+        Post.objects.update(pub_date=first.pub_date)
+        cls.expected = list(
+            Post.objects.order_by('-pub_date', '-pk').values_list(
+                'pk', flat=True)
+        )
+        cls.urls = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile',
+                    kwargs={'username': cls.author.username}),
+        ]
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def walk(self, url):
+        """Проходит ленту вперёд по курсорам и возвращает страницы."""
+        pages = []
+        cursor = ''
+        while cursor is not None:
+            page_obj = self.guest_client.get(
+                url, {'cursor': cursor}).context['page_obj']
+            pages.append(page_obj)
+            cursor = page_obj.next_cursor
+        return pages
+
+    def test_cursor_pages_cover_feed_in_order(self):
+        """Курсоры проходят всю ленту без пропусков и повторов."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                pages = self.walk(url)
+                self.assertIsInstance(pages[0], CursorPage)
+                self.assertEqual(
+                    [len(page) for page in pages], [10, 10, 5])
+                seen = [post.pk for page in pages for post in page]
+                self.assertEqual(seen, self.expected)
+
+    def test_previous_cursor_returns_previous_page(self):
+        """Курсор назад возвращает ту же страницу, что была раньше."""
+        url = self.urls[0]
+        first, second, third = self.walk(url)
+        self.assertFalse(first.has_previous())
+        response = self.guest_client.get(
+            url, {'cursor': third.previous_cursor})
+        back = response.context['page_obj']
+        self.assertEqual(list(back), list(second))
+        self.assertTrue(back.has_next())
+        self.assertTrue(back.has_previous())
+
+    def test_deep_page_query_count_does_not_grow(self):
+        """Страница по курсору не считает COUNT(*) и не зависит от глубины.
+        """
+        url = self.urls[0]
+        _, second, third = self.walk(url)
+        get_cache().clear()
+        with self.assertNumQueries(1):
+            self.guest_client.get(url, {'cursor': third.previous_cursor})
+        get_cache().clear()
+        with self.assertNumQueries(1):
+            self.guest_client.get(url, {'cursor': second.next_cursor})
+
+    def test_broken_cursor_returns_first_page(self):
+        """Неразборчивый курсор отдаёт первую страницу."""
+        self.assertIsNone(decode_cursor('not-a-cursor'))
+        response = self.guest_client.get(self.urls[0], {'cursor': '!!!'})
+        page_obj = response.context['page_obj']
+        self.assertEqual(len(page_obj), POSTS_ON_PAGE)
+        self.assertEqual(page_obj[0].pk, self.expected[0])
+
+
+class PageWindowTest(SimpleTestCase):
+    def page(self, pages, number, paginator=Paginator):
+        objects = range(pages * POSTS_ON_PAGE)
+        return paginator(objects, POSTS_ON_PAGE).page(number)
+
+    def test_window_around_current_page(self):
+        """Окно вокруг текущей страницы, первая и последняя страницы."""
+        self.assertEqual(page_window(self.page(5, 3)), [1, 2, 3, 4, 5])
+        self.assertEqual(
+            page_window(self.page(100000, 500)),
+            [1, None, 498, 499, 500, 501, 502, None, 100000]
+        )
+        # Пропуск в одну страницу заменяется её номером
+        self.assertEqual(
+            page_window(self.page(10, 5)),
+            [1, 2, 3, 4, 5, 6, 7, None, 10]
+        )
+
+    def test_window_without_count(self):
+        """Без числа страниц окно заканчивается следующей страницей."""
+        self.assertEqual(
+            page_window(self.page(100, 50, NoCountPaginator)),
+            [1, None, 48, 49, 50, 51, None]
+        )
+        self.assertEqual(
+            page_window(self.page(3, 3, NoCountPaginator)), [1, 2, 3])
+
+    def test_rendered_links_do_not_grow_with_pages(self):
+        """Размер пагинатора не зависит от числа страниц."""
+        small = render_to_string(
+            'includes/paginator.html', {'page_obj': self.page(10, 5)})
+        huge = render_to_string(
+            'includes/paginator.html', {'page_obj': self.page(100000, 5)})
+        self.assertLess(len(huge), len(small) + 100)
+        self.assertIn('?page=100000', huge)
+        self.assertNotIn('?page=50000', huge)
+
+
+@override_settings(POSTS_PAGINATION='offset_no_count')
+class NoCountPaginatorViewsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        author = User.objects.create_user(username='author')
+        Post.objects.bulk_create([
+            Post(author=author, text=f'Пост {i}')
+            for i in range(COUNT_TEST_POSTS)
+        ])
+
+    def setUp(self):
+        get_cache().clear()
+
+    def test_index_pages_without_count(self):
+        """Главная листается без COUNT(*), лишняя страница ведёт на
+        первую."""
+        url = reverse('posts:index')
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'page': 3})
+        page_obj = response.context['page_obj']
+        self.assertEqual(len(page_obj), COUNT_TEST_POSTS % POSTS_ON_PAGE)
+        self.assertFalse(page_obj.has_next())
+        response = self.client.get(url, {'page': 4})
+        self.assertEqual(response.context['page_obj'].number, 1)
@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.loadtest import posts_routes
+from core.testing import QueryBudgetMixin
+from posts import urls
+from posts.feed_cache import get_cache
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(15):
+            cls.post = Post.objects.create(
+                author=cls.user,
+                text=f'Тестовый пост № {i}',
+                group=cls.group,
+            )
+
+    def setUp(self):
+        get_cache().clear()
+        self.guest_client = Client()
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+
+    def test_every_posts_view_has_budget(self):
+        """У каждого представления posts задан бюджет запросов."""
+        for pattern in urls.urlpatterns:
+            with self.subTest(name=pattern.name):
+                self.assertIn(
+                    f'{urls.app_name}:{pattern.name}', settings.SQL_BUDGETS)
+
+    def test_every_budget_has_view(self):
+        """В SQL_BUDGETS нет бюджетов для несуществующих адресов."""
+        names = {f'{urls.app_name}:{p.name}' for p in urls.urlpatterns}
+        for name in settings.SQL_BUDGETS:
+            with self.subTest(name=name):
+                self.assertIn(name, names)
+
+    def test_get_views_fit_budget(self):
+        """Все GET-адреса posts укладываются в бюджет для гостя
+        и автора."""
+        # Адреса строятся по urlconf: новый маршрут сразу проверяется
+        addresses = [reverse('posts:index') + '?page=2'] + [
+            f'{route.path}?{route.query}'
+            for route in posts_routes(self.post, self.group, self.user)
+            if route.method == 'GET'
+        ]
+        for client in (self.guest_client, self.author_client):
+            for address in addresses:
+                with self.subTest(address=address):
+                    get_cache().clear()
+                    self.assertQueryBudget(client.get(address))
+
+    def test_post_views_fit_budget(self):
+        """Создание и редактирование поста укладываются в бюджет."""
+        form_data = {'text': 'Новая запись', 'group': self.group.id}
+        addresses = [
+            reverse('posts:post_create'),
+            reverse('posts:post_edit', kwargs={'post_id': self.post.id}),
+        ]
+        for address in addresses:
+            with self.subTest(address=address):
+                self.assertQueryBudget(
+                    self.author_client.post(address, form_data))
+
+    def test_follow_views_fit_budget(self):
+        """Подписка и отписка укладываются в бюджет."""
+        User.objects.create_user(username='reader')
+        reader_client = Client()
+        reader_client.force_login(User.objects.get(username='reader'))
+        for name in ('profile_follow', 'profile_unfollow'):
+            with self.subTest(name=name):
+                self.assertQueryBudget(reader_client.post(
+                    reverse(f'posts:{name}', kwargs={'username': 'author'})))
+
+    def test_server_timing_header(self):
+        """Ответ несёт число запросов и время в базе в Server-Timing."""
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertRegex(
+            response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ q"$')
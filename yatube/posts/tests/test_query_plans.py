@@ -0,0 +1,206 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.feed_cache import get_cache
+from posts.models import Group, Post
+from posts.paginators import NEXT, encode_title_cursor
+from posts.search import FTS_TABLE
+
+User = get_user_model()
+
+# Полный просмотр таблицы или индекса без упорядоченного обхода
+FULL_SCAN = re.compile(
+    r'\bSCAN (TABLE )?(?P<table>\w+)(?!\w)'
+    r'(?! USING (INTEGER PRIMARY KEY|INDEX))'
+)
+TEMP_SORT = 'USE TEMP B-TREE'
+# Список групп в форме поста по смыслу читает все группы
+ALLOWED_FULL_SCANS = {'posts_group'}
+# Число страниц главной в режиме offset: COUNT(*) без условия читает
+# самый узкий индекс целиком, иначе его не посчитать
+FEED_COUNT = re.compile(r'^SELECT COUNT\(\*\) AS "__count" FROM "posts_post"$')
+COVERING_INDEX = 'USING COVERING INDEX'
+# Поиск: MATCH читает индекс FTS5, а ранг BM25 считается для каждого
+# найденного поста, поэтому сортировка по нему во временном B-дереве
+# неизбежна. Она ограничена найденными постами
+FTS_RANK_QUERY = re.compile(
+    rf'^SELECT rowid, rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH '
+    r'.* ORDER BY rank (ASC|DESC), rowid (ASC|DESC) LIMIT %s$'
+)
+FTS_MATCH = re.compile(rf'^SCAN {FTS_TABLE} VIRTUAL TABLE INDEX \d+:M')
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith('SELECT'):
+            self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+@override_settings(POSTS_PAGINATION='cursor')
+class QueryPlanTests(TestCase):
+    """Запросы представлений posts не делают полных просмотров
+    и сортировок во временном B-дереве."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create([
+            Post(author=cls.user, text=f'Тестовый пост № {i}',
+                 group=cls.group)
+            for i in range(15)
+        ])
+        cls.post = Post.objects.first()
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+
+    def explain(self, sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assert_plans_use_indexes(self, request):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            request()
+        self.assertTrue(recorder.queries)
+        for sql, params in recorder.queries:
+            plan = self.explain(sql, params)
+            for step in plan:
+                with self.subTest(sql=sql, step=step):
+                    if FTS_RANK_QUERY.match(sql):
+                        self.assertTrue(
+                            FTS_MATCH.match(step)
+                            or step == 'USE TEMP B-TREE FOR ORDER BY'
+                        )
+                        continue
+                    self.assertNotIn(TEMP_SORT, step)
+                    match = FULL_SCAN.search(step)
+                    if FEED_COUNT.match(sql):
+                        self.assertIn(COVERING_INDEX, step)
+                    elif match:
+                        self.assertIn(
+                            match.group('table'), ALLOWED_FULL_SCANS)
+
+    def test_read_views_use_indexes(self):
+        """Ленты и страница поста читаются по индексам."""
+        first_page = self.author_client.get(reverse('posts:index'))
+        next_cursor = first_page.context['page_obj'].next_cursor
+        urls = [
+            reverse('posts:index'),
+            reverse('posts:index') + '?cursor=' + next_cursor,
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:group_index'),
+            reverse('posts:api_groups'),
+            reverse('posts:api_groups') + '?cursor='
+            + encode_title_cursor(NEXT, self.group),
+            reverse('posts:profile',
+                    kwargs={'username': self.user.username}),
+            reverse('posts:post_detail',
+                    kwargs={'post_id': self.post.id}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                get_cache().clear()
+                self.assert_plans_use_indexes(
+                    lambda: self.author_client.get(url))
+
+    def test_follow_index_uses_indexes(self):
+        """Лента подписок читается по индексам и с разложенными
+        постами, и с постами нескольких популярных авторов."""
+        other = User.objects.create_user(username='other')
+        Post.objects.create(author=other, text='Пост другого автора')
+        reader = Client()
+        reader.force_login(User.objects.create_user(username='reader'))
+        for author in (self.user, other):
+            reader.post(reverse('posts:profile_follow',
+                                kwargs={'username': author.username}))
+        url = reverse('posts:follow_index')
+        for limit in (1000, 0):
+            with self.subTest(fanout_limit=limit), override_settings(
+                    POSTS_TIMELINE_FANOUT_LIMIT=limit):
+                get_cache().clear()
+                self.assert_plans_use_indexes(lambda: reader.get(url))
+
+    def test_search_and_exports_use_indexes(self):
+        """Поиск и выгрузки читают по индексам."""
+        first_page = self.author_client.get(
+            reverse('posts:search'), {'q': 'тестовый'})
+        next_cursor = first_page.context['page_obj'].next_cursor
+        search_url = reverse('posts:search') + '?q=тестовый'
+        urls = [
+            search_url,
+            f'{search_url}&cursor={next_cursor}',
+            reverse('posts:profile_export',
+                    kwargs={'username': self.user.username}),
+            reverse('posts:group_export', kwargs={'slug': self.group.slug}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assert_plans_use_indexes(lambda: self.read(url))
+
+    def read(self, url):
+        response = self.author_client.get(url)
+        if response.streaming:
+            # Выгрузки читают посты, пока отдаётся поток
+            b''.join(response.streaming_content)
+        return response
+
+    @override_settings(POSTS_PAGINATION='offset')
+    def test_offset_pages_use_indexes(self):
+        """Нумерованные страницы по умолчанию (COUNT и OFFSET) тоже
+        читаются по индексам."""
+        self.assert_pages_use_indexes()
+
+    @override_settings(POSTS_PAGINATION='offset_no_count')
+    def test_no_count_pages_use_indexes(self):
+        """Страницы без COUNT(*) читаются по индексам."""
+        self.assert_pages_use_indexes()
+
+    def assert_pages_use_indexes(self):
+        feeds = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile',
+                    kwargs={'username': self.user.username}),
+        ]
+        for feed in feeds:
+            for page in (1, 2):
+                url = f'{feed}?page={page}'
+                with self.subTest(url=url):
+                    get_cache().clear()
+                    self.assert_plans_use_indexes(
+                        lambda: self.author_client.get(url))
+
+    def test_write_views_use_indexes(self):
+        """Создание и редактирование поста читают по индексам."""
+        form_data = {'text': 'Новый текст', 'group': self.group.id}
+        create_url = reverse('posts:post_create')
+        edit_url = reverse('posts:post_edit',
+                           kwargs={'post_id': self.post.id})
+        requests = {
+            'create_get': lambda: self.author_client.get(create_url),
+            'create_post': lambda: self.author_client.post(
+                create_url, form_data),
+            'edit_get': lambda: self.author_client.get(edit_url),
+            'edit_post': lambda: self.author_client.post(
+                edit_url, form_data),
+        }
+        for name, request in requests.items():
+            with self.subTest(name=name):
+                self.assert_plans_use_indexes(request)
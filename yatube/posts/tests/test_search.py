@@ -0,0 +1,86 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class SearchViewTests(TestCase):
+    def setUp(self):
+        self.guest_client = Client()
+        self.user = User.objects.create_user(username='author')
+        self.group = Group.objects.create(
+            title='Астрономия',
+            slug='astro',
+            description='Тестовое описание',
+        )
+        self.url = reverse('posts:search')
+
+    def found(self, query, **params):
+        response = self.guest_client.get(self.url, {'q': query, **params})
+        return response, [post.pk for post in response.context['page_obj']]
+
+    def test_search_by_text_and_group_title(self):
+        """Находятся посты по тексту и по названию группы."""
+        by_text = Post.objects.create(author=self.user, text='Сверхновая')
+        in_group = Post.objects.create(
+            author=self.user, text='Телескоп', group=self.group)
+        Post.objects.create(author=self.user, text='Про котиков')
+        self.assertEqual(self.found('сверхновая')[1], [by_text.pk])
+        self.assertEqual(self.found('астрономия')[1], [in_group.pk])
+
+    def test_index_follows_writes(self):
+        """Правка, удаление, bulk_create и смена названия группы
+        попадают в индекс."""
+        post = Post.objects.create(author=self.user, text='Комета')
+        post.text = 'Метеорит'
+        post.save()
+        self.assertEqual(self.found('комета')[1], [])
+        self.assertEqual(self.found('метеорит')[1], [post.pk])
+        post.delete()
+        self.assertEqual(self.found('метеорит')[1], [])
+        Post.objects.bulk_create([
+            Post(author=self.user, text='Туманность', group=self.group)
+        ])
+        self.group.title = 'Космос'
+        self.group.save()
+        self.assertEqual(len(self.found('туманность космос')[1]), 1)
+        self.assertEqual(self.found('астрономия')[1], [])
+
+    def test_results_ranked_and_paginated(self):
+        """Результаты упорядочены по BM25 и листаются курсором."""
+        best = Post.objects.create(
+            author=self.user, text='звезда звезда звезда')
+        Post.objects.bulk_create([
+            Post(author=self.user, text=f'звезда и пост номер {i}')
+            for i in range(14)
+        ])
+        response, first_page = self.found('звезда')
+        self.assertEqual(len(first_page), 10)
+        self.assertEqual(first_page[0], best.pk)
+        page_obj = response.context['page_obj']
+        self.assertContains(
+            response, f'?q=%D0%B7%D0%B2%D0%B5%D0%B7%D0%B4%D0%B0&amp;cursor='
+            f'{page_obj.next_cursor}')
+        _, second_page = self.found('звезда', cursor=page_obj.next_cursor)
+        self.assertEqual(len(second_page), 5)
+        self.assertFalse(set(first_page) & set(second_page))
+
+    def test_fts_syntax_in_query_is_harmless(self):
+        """Операторы FTS5 во вводе не ломают страницу."""
+        Post.objects.create(author=self.user, text='Орбита')
+        for query in ('"', 'орбита OR', 'NEAR(', '*', ''):
+            with self.subTest(query=query):
+                response, _ = self.found(query)
+                self.assertEqual(response.status_code, 200)
+
+    def test_search_index_command(self):
+        """search_index пересобирает индекс с нуля."""
+        post = Post.objects.create(author=self.user, text='Галактика')
+        call_command('search_index', 'rebuild', stdout=StringIO())
+        self.assertEqual(self.found('галактика')[1], [post.pk])
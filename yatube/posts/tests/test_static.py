@@ -0,0 +1,110 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core.storage import purge_css
+
+CSS = 'css/bootstrap.min.css'
+
+
+class PurgeCssTests(SimpleTestCase):
+    def test_unused_rules_removed(self):
+        """Правила с неиспользуемыми классами удаляются, остальные и
+        правила без классов остаются."""
+        css = (
+            '@charset "UTF-8";body{margin:0}.btn,.carousel{color:red}'
+            '.carousel-item{display:none}.btn:not(.disabled){cursor:pointer}'
+        )
+        self.assertEqual(
+            purge_css(css, {'btn'}),
+            '@charset "UTF-8";body{margin:0}.btn{color:red}'
+            '.btn:not(.disabled){cursor:pointer}'
+        )
+
+    def test_nested_at_rules(self):
+        """@media разбирается рекурсивно и пропадает, если опустел;
+        @keyframes и лицензия сохраняются."""
+        css = (
+            '/*! License */@media (min-width:576px){.row{margin:0}}'
+            '@media print{.modal{display:none}}'
+            '@keyframes spin{to{transform:rotate(360deg)}}'
+            '.x{content:"}"}'
+        )
+        self.assertEqual(
+            purge_css(css, {'row'}),
+            '@media (min-width:576px){.row{margin:0}}'
+            '@keyframes spin{to{transform:rotate(360deg)}}/*! License */'
+        )
+
+
+class StaticPipelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.static_root = tempfile.mkdtemp()
+        cls.static_settings = override_settings(STATIC_ROOT=cls.static_root)
+        cls.static_settings.enable()
+        super().setUpClass()
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.static_settings.disable()
+        shutil.rmtree(cls.static_root, ignore_errors=True)
+
+    def test_hashed_names_in_templates(self):
+        """Шаблоны ссылаются на имена с хешем содержимого."""
+        hashed = staticfiles_storage.stored_name(CSS)
+        self.assertNotEqual(hashed, CSS)
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, staticfiles_storage.url(CSS))
+
+    def test_missing_file_raises(self):
+        """Ссылка на несобранный файл — ошибка, а не имя без хеша."""
+        with self.assertRaises(ValueError):
+            staticfiles_storage.stored_name('css/missing.css')
+
+    def test_css_purged_and_compressed(self):
+        """Собранный CSS меньше исходного, а .gz совпадает с ним."""
+        hashed = staticfiles_storage.path(
+            staticfiles_storage.stored_name(CSS))
+        source = os.path.join(settings.STATICFILES_DIRS[0], CSS)
+        self.assertLess(os.path.getsize(hashed), os.path.getsize(source))
+        with open(hashed, 'rb') as file:
+            content = file.read()
+        self.assertIn(b'.navbar', content)
+        self.assertNotIn(b'.carousel', content)
+        with gzip.open(hashed + '.gz') as file:
+            self.assertEqual(file.read(), content)
+
+    def test_serves_precompressed_with_immutable_cache(self):
+        """Имя с хешем отдаётся сжатым и кэшируется навсегда."""
+        url = staticfiles_storage.url(CSS)
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        body = gzip.decompress(b''.join(response.streaming_content))
+        self.assertIn(b'.navbar', body)
+
+    def test_serves_plain_without_accept_encoding(self):
+        """Без Accept-Encoding отдаётся несжатый файл; имя без хеша
+        клиент перепроверяет."""
+        response = self.client.get(f'/static/{CSS}')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_path_traversal_not_served(self):
+        """Пути за пределами STATIC_ROOT не отдаются."""
+        response = self.client.get('/static/../manage.py')
+        self.assertEqual(response.status_code, 404)
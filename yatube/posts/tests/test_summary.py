@@ -0,0 +1,139 @@
+import re
+from datetime import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.feed_cache import get_cache
+from posts.models import (
+    AuthorGroupStats, AuthorMonthStats, AuthorStats, Group, Post
+)
+from posts.summary import get_author_summary
+
+User = get_user_model()
+
+SUMMARY_SQL = re.compile(r'authormonthstats|authorgroupstats|first_post_at')
+
+
+def moment(year, month, day=1):
+    return timezone.make_aware(datetime(year, month, day, 12))
+
+
+class AuthorSummaryTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.author = User.objects.create_user(username='author')
+        self.cats = Group.objects.create(title='Коты', slug='cats')
+        self.dogs = Group.objects.create(title='Собаки', slug='dogs')
+        self.first, _, self.last = [
+            Post.objects.create(
+                author=self.author, text=text, group=group, pub_date=date)
+            for text, group, date in (
+                ('Первый', self.cats, moment(2026, 1, 5)),
+                ('Второй', self.cats, moment(2026, 1, 20)),
+                ('Третий', self.dogs, moment(2026, 3, 2)),
+            )
+        ]
+
+    def summary(self):
+        self.author.stats.refresh_from_db()
+        return get_author_summary(self.author)
+
+    def test_updated_on_create(self):
+        """Новые посты меняют даты, месяцы и группы сводки."""
+        summary = self.summary()
+        self.assertEqual(summary['posts_count'], 3)
+        self.assertEqual(summary['first_post_at'], moment(2026, 1, 5))
+        self.assertEqual(summary['last_post_at'], moment(2026, 3, 2))
+        self.assertEqual(
+            [(g['slug'], g['posts_count']) for g in summary['groups']],
+            [('cats', 2), ('dogs', 1)]
+        )
+        self.assertEqual(
+            [(m['month'].month, m['posts_count']) for m in summary['months']],
+            [(3, 1), (1, 2)]
+        )
+
+    def test_bulk_create_batched(self):
+        """Пачка постов многих авторов учитывается числом запросов, не
+        зависящим от числа авторов, и совпадает с пересборкой."""
+        authors = [
+            User.objects.create_user(username=f'writer{i}')
+            for i in range(20)
+        ]
+        posts = [
+            Post(author=author, text='Пост', group=group,
+                 pub_date=moment(2026, month))
+            for author in authors
+            for month, group in ((1, self.cats), (1, None), (2, self.dogs))
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            Post.objects.bulk_create(posts)
+        summary_queries = [
+            query['sql'] for query in queries.captured_queries
+            if SUMMARY_SQL.search(query['sql'])
+        ]
+        # Даты одним UPDATE; месяцы и группы — INSERT, SELECT и UPDATE
+        # на каждое значение прироста (у месяцев их два)
+        self.assertEqual(len(summary_queries), 8)
+        rows = sorted(AuthorMonthStats.objects.values_list(
+            'user_id', 'month', 'posts_count'))
+        groups = sorted(AuthorGroupStats.objects.values_list(
+            'user_id', 'group_id', 'posts_count'))
+        call_command('rebuild_summaries', stdout=StringIO())
+        self.assertEqual(rows, sorted(AuthorMonthStats.objects.values_list(
+            'user_id', 'month', 'posts_count')))
+        self.assertEqual(groups, sorted(AuthorGroupStats.objects.values_list(
+            'user_id', 'group_id', 'posts_count')))
+        stats = AuthorStats.objects.get(user=authors[0])
+        self.assertEqual(stats.first_post_at, moment(2026, 1))
+        self.assertEqual(stats.last_post_at, moment(2026, 2))
+
+    def test_updated_on_edit_and_delete(self):
+        """Смена группы и удаление поста учитываются в сводке."""
+        self.first.group = self.dogs
+        self.first.save()
+        self.last.delete()
+        summary = self.summary()
+        self.assertEqual(summary['last_post_at'], moment(2026, 1, 20))
+        self.assertEqual(
+            [(g['slug'], g['posts_count']) for g in summary['groups']],
+            [('cats', 1), ('dogs', 1)]
+        )
+        self.assertEqual(
+            [(m['month'].month, m['posts_count']) for m in summary['months']],
+            [(1, 2)]
+        )
+
+    def test_served_from_cache(self):
+        """Повторная сводка не обращается к базе."""
+        self.summary()
+        with self.assertNumQueries(0):
+            get_author_summary(self.author)
+
+    def test_rebuild_command(self):
+        """rebuild_summaries восстанавливает сводку из постов."""
+        AuthorMonthStats.objects.all().delete()
+        AuthorGroupStats.objects.all().delete()
+        AuthorStats.objects.update(first_post_at=None, last_post_at=None)
+        out = StringIO()
+        call_command('rebuild_summaries', batch_size=1, stdout=out)
+        self.assertIn('авторов: 1', out.getvalue())
+        summary = self.summary()
+        self.assertEqual(summary['first_post_at'], moment(2026, 1, 5))
+        self.assertEqual(len(summary['groups']), 2)
+        self.assertEqual(len(summary['months']), 2)
+
+    def test_profile_shows_summary(self):
+        """Профиль показывает группы и месяцы автора."""
+        response = self.client.get(
+            reverse('posts:profile', args=[self.author.username]))
+        self.assertContains(response, 'Коты')
+        self.assertContains(response, '(2)')
+        self.assertEqual(response.context['summary']['posts_count'], 3)
@@ -0,0 +1,149 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Follow, Post, TimelineEntry, posts_bulk_created
+from tasks.models import Job
+from tasks.queue import claim, run_pending, task
+
+User = get_user_model()
+
+CALLS = []
+
+
+@task('tests.record')
+def record(value):
+    CALLS.append(value)
+
+
+@task('tests.broken', max_attempts=2)
+def broken():
+    raise RuntimeError('сбой')
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_dedup_key(self):
+        """Ждущая задача с тем же ключом не дублируется."""
+        record.delay(1, dedup_key='same')
+        record.delay(2, dedup_key='same')
+        record.delay(3)
+        self.assertEqual(Job.objects.count(), 2)
+        self.assertEqual(run_pending(), 2)
+        self.assertEqual(CALLS, [1, 3])
+        self.assertFalse(Job.objects.exists())
+
+    def test_batched_claim(self):
+        """Задачи забираются пачкой и достаются одному обработчику."""
+        for value in range(5):
+            record.delay(value)
+        first = claim('first', 3)
+        second = claim('second', 3)
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 2)
+        self.assertEqual(
+            Job.objects.filter(status=Job.RUNNING).count(), 5)
+        self.assertEqual(claim('third', 3), [])
+
+    def test_retry_with_backoff(self):
+        """Упавшая задача откладывается, после последней попытки
+        помечается невыполненной."""
+        broken.delay()
+        with self.assertLogs('tasks', 'ERROR'):
+            self.assertEqual(run_pending(), 1)
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('RuntimeError', job.last_error)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertEqual(run_pending(), 0)
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs('tasks', 'ERROR'):
+            run_pending()
+        self.assertEqual(Job.objects.get().status, Job.FAILED)
+
+    def test_stale_job_reclaimed(self):
+        """Задача упавшего обработчика забирается заново."""
+        record.delay(1)
+        claim('dead', 1)
+        self.assertEqual(run_pending(), 0)
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(CALLS, [1])
+
+    def test_stale_job_without_attempts_failed(self):
+        """Брошенная задача с исчерпанными попытками не забирается
+        снова, а помечается невыполненной."""
+        broken.delay()
+        claim('dead', 1)
+        claim('dead', 1)
+        Job.objects.update(
+            attempts=2, locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(claim('alive', 1), [])
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn('TASKS_LOCK_TIMEOUT', job.last_error)
+
+    def test_run_workers_once(self):
+        """run_workers --once выполняет готовые задачи и выходит."""
+        record.delay(1)
+        out = StringIO()
+        call_command('run_workers', once=True, stdout=out)
+        self.assertIn('1', out.getvalue())
+        self.assertEqual(CALLS, [1])
+
+
+class PostCreateQueueTests(TestCase):
+    def test_fan_out_left_to_workers(self):
+        """post_create только ставит раскладку в очередь."""
+        cache.clear()
+        author = User.objects.create_user(username='author')
+        reader = User.objects.create_user(username='reader')
+        Follow.objects.create(user=reader, author=author)
+        client = Client()
+        client.force_login(author)
+        client.post(reverse('posts:post_create'), {'text': 'Пост'})
+        self.assertEqual(Job.objects.get().name, 'posts.fan_out_post')
+        self.assertFalse(TimelineEntry.objects.exists())
+        run_pending()
+        self.assertEqual(TimelineEntry.objects.get().owner, reader)
+
+    def test_bulk_fan_out_left_to_workers(self):
+        """Пачка постов раскладывается обработчиком: посты с id частями
+        по BATCH_SIZE, без id (SQLite) — одной задачей на автора."""
+        author = User.objects.create_user(username='author')
+        reader = User.objects.create_user(username='reader')
+        Follow.objects.create(user=reader, author=author)
+        Post.objects.bulk_create([
+            Post(author=author, text=f'Пост {i}',
+                 pub_date=timezone.now() - timedelta(days=i))
+            for i in range(3)
+        ])
+        self.assertEqual(
+            Job.objects.get().name, 'posts.fan_out_author_posts')
+        run_pending()
+        self.assertEqual(
+            TimelineEntry.objects.filter(owner=reader).count(), 3)
+        # На базах, которые возвращают id, пачка приходит с ними
+        posts = [
+            Post.objects.create(author=author, text=f'Пост {i}')
+            for i in range(3)
+        ]
+        Job.objects.all().delete()
+        TimelineEntry.objects.all().delete()
+        with patch('posts.signals.BATCH_SIZE', 2):
+            posts_bulk_created.send(sender=Post, posts=posts)
+        self.assertEqual(
+            Job.objects.filter(name='posts.fan_out_posts').count(), 2)
+        run_pending()
+        self.assertEqual(
+            TimelineEntry.objects.filter(owner=reader).count(), 3)
@@ -0,0 +1,77 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.cache import caches
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.throttling import TokenBucket, take_tokens
+from posts.models import Post
+
+User = get_user_model()
+
+RATES = {
+    'post_create': {'user': ('1/m', 2), 'ip': ('10/m', 3)},
+    'signup': {'ip': ('1/h', 1)},
+}
+
+
+@override_settings(THROTTLE_RATES=RATES)
+class ThrottlingTests(TestCase):
+    def setUp(self):
+        caches[settings.THROTTLE_CACHE_ALIAS].clear()
+        self.url = reverse('posts:post_create')
+
+    def login(self, username):
+        client = Client()
+        client.force_login(User.objects.create_user(username=username))
+        return client
+
+    def create(self, client):
+        return client.post(self.url, {'text': 'Пост'})
+
+    def test_user_bucket(self):
+        """После всплеска пользователь получает 429 с Retry-After,
+        токен возвращается со временем."""
+        client = self.login('writer')
+        self.assertEqual(self.create(client).status_code, 302)
+        self.assertEqual(self.create(client).status_code, 302)
+        response = self.create(client)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(client.get(self.url).status_code, 200)
+        with mock.patch('core.throttling.time.time',
+                        return_value=10 ** 10):
+            self.assertEqual(self.create(client).status_code, 302)
+
+    def test_ip_bucket(self):
+        """Корзина IP общая для всех пользователей с адреса."""
+        statuses = [
+            self.create(self.login(f'user{i}')).status_code
+            for i in range(4)
+        ]
+        self.assertEqual(statuses, [302, 302, 302, 429])
+
+    def test_signup(self):
+        """Регистрация ограничена по IP."""
+        url = reverse('users:signup')
+        data = {
+            'username': 'newbie', 'password1': 'Sup3r-secret',
+            'password2': 'Sup3r-secret',
+        }
+        self.assertEqual(self.client.post(url, data).status_code, 302)
+        data['username'] = 'another'
+        self.assertEqual(self.client.post(url, data).status_code, 429)
+
+    def test_check_does_not_touch_database(self):
+        """Проверка корзины не обращается к базе и не тратит токены
+        при отказе."""
+        buckets = [
+            TokenBucket('a', '1/m', 1), TokenBucket('b', '1/m', 2)
+        ]
+        with self.assertNumQueries(0):
+            self.assertEqual(take_tokens(buckets), 0)
+            self.assertGreater(take_tokens(buckets), 0)
+        self.assertEqual(take_tokens(buckets[1:]), 0)
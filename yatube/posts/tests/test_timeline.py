@@ -0,0 +1,124 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Follow, Post, TimelineEntry
+from tasks.queue import run_pending
+
+User = get_user_model()
+
+
+@override_settings(POSTS_TIMELINE_FANOUT_LIMIT=1)
+class TimelineTests(TestCase):
+    def setUp(self):
+        self.reader = User.objects.create_user(username='reader')
+        self.client = Client()
+        self.client.force_login(self.reader)
+        self.author = User.objects.create_user(username='author')
+        self.star = User.objects.create_user(username='star')
+        self.fan = User.objects.create_user(username='fan')
+
+    def follow(self, author, client=None):
+        client = client or self.client
+        return client.post(
+            reverse('posts:profile_follow', args=[author.username]))
+
+    def timeline(self, **params):
+        response = self.client.get(reverse('posts:follow_index'), params)
+        page_obj = response.context['page_obj']
+        return page_obj, [post.text for post in page_obj]
+
+    @override_settings(POSTS_TIMELINE_BACKFILL_LIMIT=2)
+    def test_follow_backfills_newest_window(self):
+        """При подписке в ленту копируются только последние посты."""
+        for i in range(3):
+            Post.objects.create(author=self.author, text=f'Пост {i}')
+        self.follow(self.author)
+        _, texts = self.timeline()
+        self.assertEqual(texts, ['Пост 2', 'Пост 1'])
+
+    def test_follow_and_unfollow(self):
+        """Подписка добавляет посты автора в ленту, отписка убирает."""
+        Post.objects.create(author=self.author, text='До подписки')
+        self.follow(self.author)
+        self.follow(self.author)
+        self.follow(self.reader)
+        self.assertEqual(Follow.objects.count(), 1)
+        self.author.stats.refresh_from_db()
+        self.assertEqual(self.author.stats.followers_count, 1)
+        Post.objects.create(author=self.author, text='После подписки')
+        run_pending()
+        self.assertEqual(
+            self.timeline()[1], ['После подписки', 'До подписки'])
+        self.client.post(
+            reverse('posts:profile_unfollow', args=['author']))
+        self.assertEqual(self.timeline()[1], [])
+        self.assertFalse(TimelineEntry.objects.exists())
+
+    def test_prolific_author_merged_on_read(self):
+        """Посты популярного автора не раскладываются, а подмешиваются
+        при чтении в общем порядке."""
+        fan_client = Client()
+        fan_client.force_login(self.fan)
+        self.follow(self.star, fan_client)
+        self.follow(self.star)
+        self.follow(self.author)
+        for i in range(8):
+            Post.objects.create(author=self.author, text=f'author {i}')
+            Post.objects.create(author=self.star, text=f'star {i}')
+        run_pending()
+        self.assertFalse(
+            TimelineEntry.objects.filter(author=self.star).exists())
+        page_obj, first = self.timeline()
+        self.assertEqual(first[:4], ['star 7', 'author 7', 'star 6',
+                                     'author 6'])
+        _, second = self.timeline(cursor=page_obj.next_cursor)
+        self.assertEqual(len(first) + len(second), 16)
+        self.assertFalse(set(first) & set(second))
+        self.assertEqual(second[-1], 'author 0')
+
+    @override_settings(POSTS_TIMELINE_FANOUT_LIMIT=0)
+    def test_prolific_authors_read_separately(self):
+        """Посты нескольких популярных авторов читаются отдельным
+        запросом на автора и сливаются в общем порядке."""
+        self.follow(self.author)
+        self.follow(self.star)
+        for i in range(6):
+            Post.objects.create(author=self.author, text=f'author {i}')
+            Post.objects.create(author=self.star, text=f'star {i}')
+        page_obj, first = self.timeline()
+        self.assertEqual(first[:3], ['star 5', 'author 5', 'star 4'])
+        _, second = self.timeline(cursor=page_obj.next_cursor)
+        self.assertEqual(sorted(first + second), sorted(
+            [f'author {i}' for i in range(6)]
+            + [f'star {i}' for i in range(6)]
+        ))
+
+    def test_bulk_created_posts_fan_out(self):
+        """bulk_create ставит раскладку постов без id в очередь."""
+        self.follow(self.author)
+        Post.objects.bulk_create([
+            Post(author=self.author, text=f'Пачка {i}') for i in range(3)
+        ])
+        self.assertEqual(self.timeline()[1], [])
+        run_pending()
+        self.assertEqual(len(self.timeline()[1]), 3)
+
+    def test_rebuild_timelines(self):
+        """rebuild_timelines восстанавливает ленты из подписок."""
+        self.follow(self.author)
+        Post.objects.create(author=self.author, text='Пост')
+        run_pending()
+        TimelineEntry.objects.all().delete()
+        call_command('rebuild_timelines', stdout=StringIO())
+        self.assertEqual(self.timeline()[1], ['Пост'])
+
+    def test_follow_requires_post(self):
+        """Подписка по GET не выполняется."""
+        response = self.client.get(
+            reverse('posts:profile_follow', args=['author']))
+        self.assertEqual(response.status_code, 405)
+        self.assertFalse(Follow.objects.exists())
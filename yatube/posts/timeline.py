@@ -0,0 +1,174 @@
+import heapq
+from itertools import islice
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import transaction
+
+from posts.models import AuthorStats, Follow, Post, TimelineEntry
+from posts.paginators import NEXT, CursorPage, decode_cursor, seek
+
+BATCH_SIZE = 1000
+
+
+def fanout_limit():
+    return settings.POSTS_TIMELINE_FANOUT_LIMIT
+
+
+def followers_count(author_id):
+    return (
+        AuthorStats.objects.filter(user_id=author_id)
+        .values_list('followers_count', flat=True)
+        .first()
+    ) or 0
+
+
+def is_prolific(author_id):
+    """У автора столько подписчиков, что его посты не раскладываются
+    по лентам, а подмешиваются при чтении."""
+    return followers_count(author_id) > fanout_limit()
+
+
+def insert_entries(entries):
+    entries = iter(entries)
+    while True:
+        batch = list(islice(entries, BATCH_SIZE))
+        if not batch:
+            return
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def fan_out(posts):
+    """Раскладывает новые посты по лентам подписчиков авторов.
+
+    bulk_create на SQLite не возвращает id, поэтому посты пачки
+    перечитываются по индексу автора начиная с самого раннего.
+    """
+    by_author = {}
+    for post in posts:
+        by_author.setdefault(post.author_id, []).append(post)
+    for author_id, author_posts in by_author.items():
+        followers = followers_count(author_id)
+        if not followers or followers > fanout_limit():
+            continue
+        if all(post.pk is not None for post in author_posts):
+            rows = [(post.pk, post.pub_date) for post in author_posts]
+        else:
+            rows = list(
+                Post.objects.filter(
+                    author_id=author_id,
+                    pub_date__gte=min(post.pub_date for post in author_posts)
+                ).values_list('pk', 'pub_date')
+            )
+        owners = Follow.objects.filter(author_id=author_id).values_list(
+            'user_id', flat=True)
+        insert_entries(
+            TimelineEntry(
+                owner_id=owner_id, post_id=pk, author_id=author_id,
+                pub_date=pub_date
+            )
+            for owner_id in owners.iterator()
+            for pk, pub_date in rows
+        )
+
+
+def backfill(owner_id, author_id, limit=None):
+    """Добавляет в ленту подписчика уже опубликованные посты автора,
+    с limit — только limit последних."""
+    if is_prolific(author_id):
+        return
+    posts = Post.objects.filter(author_id=author_id).values_list(
+        'pk', 'pub_date')
+    if limit is not None:
+        posts = posts.order_by('-pub_date', '-pk')[:limit]
+    insert_entries(
+        TimelineEntry(
+            owner_id=owner_id, post_id=pk, author_id=author_id,
+            pub_date=pub_date
+        )
+        for pk, pub_date in posts.iterator()
+    )
+
+
+def remove_author(owner_id, author_id):
+    TimelineEntry.objects.filter(
+        owner_id=owner_id, author_id=author_id
+    ).delete()
+
+
+def rebuild_timelines(owner_ids=None):
+    """Собирает ленты заново из подписок и постов.
+
+    Нужна после изменения POSTS_TIMELINE_FANOUT_LIMIT или когда автор
+    снова стал обычным: пока он был популярным, его посты не
+    раскладывались.
+    """
+    follows = Follow.objects.exclude(
+        author__stats__followers_count__gt=fanout_limit()
+    )
+    entries = TimelineEntry.objects.all()
+    if owner_ids is not None:
+        follows = follows.filter(user_id__in=owner_ids)
+        entries = entries.filter(owner_id__in=owner_ids)
+    with transaction.atomic():
+        entries.delete()
+        for owner_id, author_id in follows.values_list(
+                'user_id', 'author_id').iterator():
+            backfill(owner_id, author_id)
+
+
+class TimelinePage(CursorPage):
+    """Страница ленты подписок: разложенные записи плюс посты
+    популярных авторов, слитые по (pub_date, id)."""
+
+    def __init__(self, owner, paginator, direction, position):
+        super().__init__(None, paginator, direction, position is not None)
+        self._owner = owner
+        self._position = position
+
+    def positioned(self, queryset, pk_field):
+        if self._position is None:
+            return queryset.order_by('-pub_date', f'-{pk_field}')
+        pub_date, pk = self._position
+        return seek(queryset, self._direction, pub_date, pk, pk_field)
+
+    def fetch(self, limit):
+        prolific = list(
+            Follow.objects.filter(
+                user=self._owner,
+                author__stats__followers_count__gt=fanout_limit(),
+            ).values_list('author_id', flat=True)
+        )
+        entries = TimelineEntry.objects.filter(owner=self._owner).exclude(
+            author_id__in=prolific)
+        sources = [
+            self.positioned(entries, 'post_id')
+            .values_list('pub_date', 'post_id')[:limit]
+        ]
+        # По отдельному проходу по индексу автора на каждого популярного:
+        # author_id IN (...) сортировал бы все их посты
+        sources.extend(
+            self.positioned(
+                Post.objects.filter(author_id=author_id), 'pk'
+            ).values_list('pub_date', 'pk')[:limit]
+            for author_id in prolific
+        )
+        merged = heapq.merge(*sources, reverse=self._direction == NEXT)
+        ids = [pk for _, pk in islice(merged, limit)]
+        posts = Post.objects.select_related('author', 'group').in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+
+class TimelinePaginator(Paginator):
+    """Курсорная пагинация ленты подписок пользователя."""
+
+    def __init__(self, owner, per_page):
+        super().__init__([], per_page)
+        self.owner = owner
+
+    def get_cursor_page(self, cursor):
+        decoded = decode_cursor(cursor) if cursor else None
+        if decoded is None:
+            return TimelinePage(self.owner, self, NEXT, None)
+        direction, pub_date, pk = decoded
+        return TimelinePage(self.owner, self, direction, (pub_date, pk))
@@ -1,13 +1,64 @@
 from django.urls import path
-from posts import views
+from posts import api, feeds, views
 
 app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('rss/', feeds.PostsFeed(), name='index_rss'),
+    path('atom/', feeds.PostsAtomFeed(), name='index_atom'),
+    path('groups/', views.group_index, name='group_index'),
     path('group/<slug>/', views.group_posts, name='group_list'),
+    path('group/<slug>/export/', views.group_export, name='group_export'),
+    path('group/<slug>/rss/', feeds.GroupPostsFeed(), name='group_rss'),
+    path(
+        'group/<slug>/atom/', feeds.GroupPostsAtomFeed(), name='group_atom'
+    ),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path(
+        'profile/<str:username>/export/', views.profile_export,
+        name='profile_export'
+    ),
+    path(
+        'profile/<str:username>/rss/', feeds.AuthorPostsFeed(),
+        name='profile_rss'
+    ),
+    path(
+        'profile/<str:username>/atom/', feeds.AuthorPostsAtomFeed(),
+        name='profile_atom'
+    ),
+    path(
+        'profile/<str:username>/follow/', views.profile_follow,
+        name='profile_follow'
+    ),
+    path(
+        'profile/<str:username>/unfollow/', views.profile_unfollow,
+        name='profile_unfollow'
+    ),
+    path('follow/', views.follow_index, name='follow_index'),
+    path('search/', views.search, name='search'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path('api/v1/posts/', api.post_list, name='api_posts'),
+    path(
+        'api/v1/posts/<int:post_id>/', api.post_detail,
+        name='api_post_detail'
+    ),
+    path('api/v1/groups/', api.group_list, name='api_groups'),
+    path(
+        'api/v1/groups/<slug>/', api.group_detail, name='api_group_detail'
+    ),
+    path(
+        'api/v1/groups/<slug>/posts/', api.group_posts,
+        name='api_group_posts'
+    ),
+    path(
+        'api/v1/profiles/<str:username>/', api.profile_detail,
+        name='api_profile_detail'
+    ),
+    path(
+        'api/v1/profiles/<str:username>/posts/', api.profile_posts,
+        name='api_profile_posts'
+    ),
 ]
@@ -1,64 +1,281 @@
+from urllib.parse import urlencode
+
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
+from django.conf import settings
 from django.core.paginator import Paginator
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.db.models.functions import Coalesce, Substr
+from django.views.decorators.http import require_POST
+from core.routers import read_replica
+from core.throttling import throttle
+from posts.conditional import Validators, is_conditional, page_position
+from posts.counters import author_posts_count
+from posts.export import EXPORT_FORMATS, export_queryset, export_stream
+from posts.feed_cache import (
+    FEED_SHARED_SCOPES, GLOBAL_SCOPE, GROUPS_SCOPE, author_scope,
+    feed_fragment_key, get_cache, get_generation, group_scope
+)
 from posts.forms import PostForm
-from posts.models import Post, Group, User
+from posts.lookups import get_author, get_group
+from posts.models import Follow, Post, Group, User
+from posts.paginators import (
+    CountedPaginator, CursorPaginator, NoCountPaginator
+)
+from posts.search import SearchPaginator
+from posts.summary import get_author_summary
+from posts.timeline import TimelinePaginator
 
 POSTS_PER_PAGE = 10
+GROUPS_PER_PAGE = 30
+# Сколько символов последнего поста показывать в каталоге групп
+EXCERPT_LENGTH = 100
+
+
+def get_cursor_page(request, post_list, per_page=POSTS_PER_PAGE):
+    paginator = CursorPaginator(post_list, per_page)
+    return paginator.get_cursor_page(request.GET.get('cursor'))
 
 
-def get_page(request, post_list):
-    paginator = Paginator(post_list, POSTS_PER_PAGE)
+def get_page(request, post_list, count=None):
+    cursor = request.GET.get('cursor')
+    if cursor is not None or settings.POSTS_PAGINATION == 'cursor':
+        return get_cursor_page(request, post_list)
+    if count is not None:
+        paginator = CountedPaginator(post_list, POSTS_PER_PAGE, count)
+    elif settings.POSTS_PAGINATION == 'offset_no_count':
+        paginator = NoCountPaginator(post_list, POSTS_PER_PAGE)
+    else:
+        paginator = Paginator(post_list, POSTS_PER_PAGE)
     page_numer = request.GET.get('page')
     return paginator.get_page(page_numer)
 
 
+def feed_cache_context(request, scope, page_obj, *shared_scopes):
+    return {
+        'feed_key': feed_fragment_key(
+            scope, page_obj, request, *shared_scopes),
+        'feed_cache_timeout': settings.POSTS_FEED_CACHE_TIMEOUT,
+        'feed_cache_alias': settings.POSTS_CACHE_ALIAS,
+    }
+
+
+@read_replica
 def index(request):
+    validators = Validators(
+        request, (GLOBAL_SCOPE, *FEED_SHARED_SCOPES), page_position(request)
+    )
+    not_modified = validators.not_modified(request)
+    if not_modified:
+        return not_modified
     post_list = Post.objects.select_related('author', 'group')
     page_obj = get_page(request, post_list)
     context = {
         'page_obj': page_obj,
+        **feed_cache_context(
+            request, GLOBAL_SCOPE, page_obj, *FEED_SHARED_SCOPES),
     }
-    return render(request, 'posts/index.html', context)
+    return validators.apply(render(request, 'posts/index.html', context))
+
+
+def groups_count():
+    """Число групп из кэша: меняется только с записью группы."""
+    cache = get_cache()
+    key = f'posts:groups_count:{get_generation(GROUPS_SCOPE)}'
+    count = cache.get(key)
+    if count is None:
+        count = Group.objects.count()
+        cache.set(key, count, settings.POSTS_FEED_CACHE_TIMEOUT)
+    return count
 
 
+@read_replica
+def group_index(request):
+    """Каталог групп с числом постов и последним постом.
+
+    Всё берётся из полей группы, которые обновляются при записи постов,
+    одним запросом с соединением с последним постом.
+    """
+    validators = Validators(
+        request, (GLOBAL_SCOPE, GROUPS_SCOPE), page_position(request)
+    )
+    not_modified = validators.not_modified(request)
+    if not_modified:
+        return not_modified
+    groups = (
+        Group.objects.annotate(
+            last_post_excerpt=Substr('last_post__text', 1, EXCERPT_LENGTH + 1)
+        )
+        .only('title', 'slug', 'posts_count', 'last_post_at')
+        .order_by('title', 'pk')
+    )
+    paginator = CountedPaginator(groups, GROUPS_PER_PAGE, groups_count())
+    page_obj = paginator.get_page(request.GET.get('page'))
+    context = {
+        'page_obj': page_obj,
+        'excerpt_length': EXCERPT_LENGTH,
+        # Фрагмент зависит и от постов, и от самих групп
+        **feed_cache_context(request, GLOBAL_SCOPE, page_obj, GROUPS_SCOPE),
+    }
+    return validators.apply(
+        render(request, 'posts/group_index.html', context)
+    )
+
+
+@read_replica
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
+    group = get_group(slug)
+    validators = Validators(
+        request, (group_scope(group.id), *FEED_SHARED_SCOPES),
+        page_position(request)
+    )
+    not_modified = validators.not_modified(request)
+    if not_modified:
+        return not_modified
     posts = Post.objects.filter(group=group).select_related('author', 'group')
-    page_obj = get_page(request, posts)
+    page_obj = get_page(request, posts, group.posts_count)
     context = {
         'group': group,
         'page_obj': page_obj,
+        **feed_cache_context(
+            request, group_scope(group.id), page_obj, *FEED_SHARED_SCOPES),
     }
-    return render(request, 'posts/group_list.html', context)
+    return validators.apply(
+        render(request, 'posts/group_list.html', context)
+    )
 
 
+@read_replica
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    page_obj = get_page(request, author.posts.select_related('group'))
+    author = get_author(username)
+    validators = Validators(
+        request, (author_scope(author.id), GROUPS_SCOPE),
+        page_position(request)
+    )
+    not_modified = validators.not_modified(request)
+    if not_modified:
+        return not_modified
+    posts_count = author_posts_count(author)
+    summary = get_author_summary(author)
+    following = request.user.is_authenticated and Follow.objects.filter(
+        user=request.user, author=author
+    ).exists()
+    page_obj = get_page(
+        request, author.posts.select_related('group'), posts_count
+    )
     context = {
         'author': author,
+        'posts_count': posts_count,
+        'summary': summary,
+        'following': following,
+        'page_obj': page_obj,
+        # Имя автора входит в его собственную область
+        **feed_cache_context(
+            request, author_scope(author.id), page_obj, GROUPS_SCOPE),
+    }
+    return validators.apply(
+        render(request, 'posts/profile.html', context)
+    )
+
+
+def export_response(request, queryset, filename):
+    file_format = request.GET.get('format', 'jsonl')
+    if file_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest('Неизвестный формат выгрузки')
+    compress = request.GET.get('compress') == 'gzip'
+    filename = f'{filename}.{file_format}'
+    if compress:
+        content_type = 'application/gzip'
+        filename += '.gz'
+    elif file_format == 'csv':
+        content_type = 'text/csv; charset=utf-8'
+    else:
+        content_type = 'application/x-ndjson; charset=utf-8'
+    response = StreamingHttpResponse(
+        export_stream(queryset, file_format, compress),
+        content_type=content_type
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def profile_export(request, username):
+    author = get_author(username)
+    return export_response(
+        request, export_queryset(author=author), f'posts-{author.username}'
+    )
+
+
+def group_export(request, slug):
+    group = get_group(slug)
+    return export_response(
+        request, export_queryset(group=group), f'posts-{group.slug}'
+    )
+
+
+@read_replica
+def search(request):
+    query = request.GET.get('q', '').strip()
+    paginator = SearchPaginator(query, POSTS_PER_PAGE)
+    page_obj = paginator.get_cursor_page(request.GET.get('cursor'))
+    context = {
+        'query': query,
         'page_obj': page_obj,
+        'pagination_query': urlencode({'q': query}) + '&',
     }
-    return render(request, 'posts/profile.html', context)
+    return render(request, 'posts/search.html', context)
+
 
+def detail_validators(request, post_id, author_id):
+    return Validators(
+        request, (author_scope(author_id), GROUPS_SCOPE), f'post{post_id}'
+    )
 
+
+@read_replica
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    validators = None
+    if is_conditional(request):
+        # Без заголовков проверки автора берём из основного запроса
+        author_id = (
+            Post.objects.filter(pk=post_id)
+            .values_list('author_id', flat=True)
+            .first()
+        )
+        if author_id is not None:
+            validators = detail_validators(request, post_id, author_id)
+            not_modified = validators.not_modified(request)
+            if not_modified:
+                return not_modified
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'group').annotate(
+            author_posts_count=Coalesce('author__stats__posts_count', 0)
+        ),
+        id=post_id
+    )
     context = {
         'post': post,
+        'detail_cache_timeout': settings.POSTS_DETAIL_CACHE_TIMEOUT,
+        'detail_cache_alias': settings.POSTS_CACHE_ALIAS,
     }
-    return render(request, 'posts/post_detail.html', context)
+    if validators is None:
+        validators = detail_validators(request, post_id, post.author_id)
+    return validators.apply(
+        render(request, 'posts/post_detail.html', context)
+    )
 
 
 @login_required
+@throttle('post_create')
 def post_create(request):
     if request.method == 'POST':
         form = PostForm(request.POST)
         if form.is_valid():
             post = form.save(commit=False)
             post.author = request.user
-            post.save()
+            with transaction.atomic():
+                post.save()
             return redirect('posts:profile', post.author)
         context = {'form': form}
         return render(request, 'posts/post_create.html', context)
@@ -67,13 +284,43 @@ def post_create(request):
 
 
 @login_required
+@throttle('post_edit')
 def post_edit(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
-    if request.user != post.author:
+    if request.user.id != post.author_id:
         return redirect('posts:post_detail', post_id)
     form = PostForm(request.POST or None, instance=post)
     if not form.is_valid():
         context = {'form': form, 'is_edit': True}
         return render(request, 'posts/post_create.html', context)
-    post = form.save()
+    with transaction.atomic():
+        post = form.save()
     return redirect('posts:post_detail', post_id)
+
+
+@login_required
+def follow_index(request):
+    paginator = TimelinePaginator(request.user, POSTS_PER_PAGE)
+    page_obj = paginator.get_cursor_page(request.GET.get('cursor'))
+    return render(request, 'posts/follow.html', {'page_obj': page_obj})
+
+
+@login_required
+@require_POST
+@throttle('follow')
+def profile_follow(request, username):
+    author = get_object_or_404(User, username=username)
+    if author != request.user:
+        Follow.objects.get_or_create(user=request.user, author=author)
+    return redirect('posts:profile', username)
+
+
+@login_required
+@require_POST
+@throttle('follow')
+def profile_unfollow(request, username):
+    # delete() у QuerySet шлёт post_delete, лента подписчика очищается
+    Follow.objects.filter(
+        user=request.user, author__username=username
+    ).delete()
+    return redirect('posts:profile', username)
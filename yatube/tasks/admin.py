@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from tasks.models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk', 'name', 'status', 'attempts', 'run_at', 'locked_by'
+    )
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'dedup_key')
+    readonly_fields = ('created', 'last_error')
+
+
+admin.site.register(Job, JobAdmin)
@@ -0,0 +1,56 @@
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from tasks.queue import run_pending, work, worker_name
+
+
+def work_in_thread(worker, batch_size, poll_interval, stop):
+    try:
+        work(worker, batch_size, poll_interval, stop)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Запускает обработчики очереди фоновых задач'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=settings.TASKS_WORKERS)
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.TASKS_BATCH_SIZE)
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=settings.TASKS_POLL_INTERVAL
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и выйти'
+        )
+
+    def handle(self, *args, **options):
+        if options['once']:
+            count = run_pending(batch_size=options['batch_size'])
+            self.stdout.write(f'Выполнено задач: {count}')
+            return
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stop.set())
+        workers = options['workers']
+        self.stdout.write(f'Запущено обработчиков: {workers}')
+        with ThreadPoolExecutor(workers) as pool:
+            futures = [
+                pool.submit(
+                    work_in_thread, worker_name(f':{index}'),
+                    options['batch_size'], options['poll_interval'], stop
+                )
+                for index in range(workers)
+            ]
+            for future in futures:
+                future.result()
+        self.stdout.write('Обработчики остановлены')
@@ -0,0 +1,53 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """Отложенный вызов зарегистрированной задачи.
+
+    Строка пишется в той же транзакции, что и изменение, которое её
+    породило, поэтому задача не теряется и не выполняется до фиксации.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUSES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Не выполнена'),
+    )
+
+    name = models.CharField(max_length=200)
+    # Аргументы вызова в JSON
+    args = models.TextField(default='[]')
+    dedup_key = models.CharField(max_length=200, null=True, blank=True)
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default=QUEUED
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_claim_idx'),
+        ]
+        constraints = [
+            # Одинаковая задача в очереди одна; выполняемая не мешает
+            # поставить следующую
+            models.UniqueConstraint(
+                fields=['dedup_key'],
+                condition=models.Q(status='queued'),
+                name='unique_queued_job'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
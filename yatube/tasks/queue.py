@@ -0,0 +1,175 @@
+import json
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from tasks.models import Job
+
+logger = logging.getLogger('tasks')
+
+REGISTRY = {}
+
+ABANDONED = 'Обработчик не завершил последнюю попытку за TASKS_LOCK_TIMEOUT'
+
+
+class Task:
+    """Функция, которую можно выполнить сразу или поставить в очередь."""
+
+    def __init__(self, func, name, max_attempts):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+
+    def __call__(self, *args):
+        return self.func(*args)
+
+    def delay(self, *args, dedup_key=None, countdown=0):
+        enqueue(
+            self.name, args, dedup_key=dedup_key, countdown=countdown,
+            max_attempts=self.max_attempts
+        )
+
+
+def task(name=None, max_attempts=None):
+    """Регистрирует функцию как задачу; аргументы должны сериализоваться
+    в JSON."""
+    def decorator(func):
+        registered = Task(
+            func,
+            name or f'{func.__module__}.{func.__name__}',
+            max_attempts or settings.TASKS_MAX_ATTEMPTS,
+        )
+        REGISTRY[registered.name] = registered
+        return registered
+    return decorator
+
+
+def enqueue(name, args=(), dedup_key=None, countdown=0, max_attempts=None):
+    """Добавляет задачу в очередь в текущей транзакции.
+
+    Если задача с тем же dedup_key ещё ждёт выполнения, новая не
+    добавляется: INSERT OR IGNORE по частичному уникальному индексу.
+    """
+    Job.objects.bulk_create([Job(
+        name=name,
+        args=json.dumps(list(args)),
+        dedup_key=dedup_key,
+        max_attempts=max_attempts or settings.TASKS_MAX_ATTEMPTS,
+        run_at=timezone.now() + timedelta(seconds=countdown),
+    )], ignore_conflicts=True)
+
+
+def backoff(attempts):
+    """Пауза перед повтором: удваивается с каждой попыткой."""
+    delay = settings.TASKS_BACKOFF_BASE * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.TASKS_BACKOFF_MAX))
+
+
+def worker_name(suffix=''):
+    return f'{socket.gethostname()}:{os.getpid()}{suffix}'
+
+
+def claim(worker, limit):
+    """Забирает до limit готовых задач одним SELECT ... LIMIT.
+
+    Задачи, которые слишком долго числятся за упавшим обработчиком,
+    забираются заново, а если попытки кончились — помечаются
+    невыполненными. На SQLite транзакция начинается с BEGIN
+    IMMEDIATE и сериализует обработчиков; на базах с блокировками строк
+    они не ждут друг друга благодаря skip_locked.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.TASKS_LOCK_TIMEOUT)
+    ready = Q(status=Job.QUEUED, run_at__lte=now) | Q(
+        status=Job.RUNNING, locked_at__lt=stale,
+        attempts__lt=F('max_attempts')
+    )
+    with transaction.atomic():
+        Job.objects.filter(
+            status=Job.RUNNING, locked_at__lt=stale,
+            attempts__gte=F('max_attempts')
+        ).update(status=Job.FAILED, last_error=ABANDONED)
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(ready)
+            .order_by('run_at', 'pk')
+            .values_list('pk', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        Job.objects.filter(pk__in=ids).update(
+            status=Job.RUNNING, locked_by=worker, locked_at=now,
+            attempts=F('attempts') + 1
+        )
+        return list(
+            Job.objects.filter(pk__in=ids, locked_by=worker).order_by(
+                'run_at', 'pk')
+        )
+
+
+def run_job(job):
+    """Выполняет задачу; при ошибке откладывает повтор или помечает
+    задачу невыполненной после последней попытки."""
+    registered = REGISTRY.get(job.name)
+    try:
+        if registered is None:
+            raise LookupError(f'Задача {job.name} не зарегистрирована')
+        with transaction.atomic():
+            registered(*json.loads(job.args))
+    except Exception:
+        logger.exception('Задача %s #%s не выполнена', job.name, job.pk)
+        final = registered is None or job.attempts >= job.max_attempts
+        retry(job, traceback.format_exc(), final)
+        return False
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by).delete()
+    return True
+
+
+def retry(job, error, final):
+    jobs = Job.objects.filter(pk=job.pk, locked_by=job.locked_by)
+    if final:
+        jobs.update(status=Job.FAILED, last_error=error)
+        return
+    try:
+        with transaction.atomic():
+            jobs.update(
+                status=Job.QUEUED, locked_by='', locked_at=None,
+                run_at=timezone.now() + backoff(job.attempts),
+                last_error=error
+            )
+    except IntegrityError:
+        # Пока задача выполнялась, такую же поставили в очередь заново
+        jobs.delete()
+
+
+def run_pending(worker=None, batch_size=None):
+    """Выполняет все готовые задачи в текущем потоке; возвращает число
+    выполненных попыток."""
+    worker = worker or worker_name()
+    batch_size = batch_size or settings.TASKS_BATCH_SIZE
+    count = 0
+    while True:
+        jobs = claim(worker, batch_size)
+        if not jobs:
+            return count
+        for job in jobs:
+            run_job(job)
+        count += len(jobs)
+
+
+def work(worker, batch_size, poll_interval, stop):
+    """Цикл обработчика: забирает пачки задач, пока не выставлен stop."""
+    while not stop.is_set():
+        close_old_connections()
+        jobs = claim(worker, batch_size)
+        for job in jobs:
+            run_job(job)
+        if not jobs:
+            stop.wait(poll_interval)
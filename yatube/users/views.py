@@ -1,8 +1,11 @@
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView
 from django.urls import reverse_lazy
+from core.throttling import throttle
 from users.forms import CreationForm
 
 
+@method_decorator(throttle('signup'), name='dispatch')
 class SignUp(CreateView):
     form_class = CreationForm
     success_url = reverse_lazy('posts:index')
@@ -18,6 +18,7 @@ INSTALLED_APPS = [
     'core.apps.CoreConfig',
     'users.apps.UsersConfig',
     'posts.apps.PostsConfig',
+    'tasks.apps.TasksConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -27,13 +28,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReadReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'yatube.urls'
@@ -42,8 +46,15 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Страницы проекта без отступов; все шаблоны компилируются
+            # один раз на процесс
+            'loaders': [
+                ('core.loaders.CachedLoader', [
+                    'core.loaders.FilesystemLoader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -57,12 +68,41 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
+SQLITE_PRAGMAS = {
+    # Читатели не блокируют писателя и наоборот
+    'journal_mode': 'WAL',
+    # Ждать освобождения блокировки вместо «database is locked»
+    'busy_timeout': 5000,
+    # В режиме WAL fsync только на контрольных точках
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'core.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-    }
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': {
+            'pragmas': SQLITE_PRAGMAS,
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+    # Реплика для чтения подключается так, и DATABASE_READ_ALIAS
+    # переключается на 'replica':
+    # 'replica': {
+    #     'ENGINE': 'core.backends.sqlite3',
+    #     'NAME': '/path/to/replica.sqlite3',
+    #     'CONN_MAX_AGE': 60,
+    #     'OPTIONS': {'pragmas': {**SQLITE_PRAGMAS, 'query_only': 'ON'}},
+    #     'TEST': {'MIRROR': 'default'},
+    # },
 }
+DATABASE_ROUTERS = ['core.routers.ReadReplicaRouter']
+# Алиас, из которого читают представления с @read_replica
+DATABASE_READ_ALIAS = 'default'
+# Сколько секунд после записи клиент читает из основной базы
+DATABASE_REPLICA_LAG = 5
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -91,6 +131,134 @@ USE_TZ = True
 
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
 STATIC_URL = '/static/'
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+# Из этих файлов collectstatic убирает правила для классов, которых нет
+# в шаблонах
+STATIC_CSS_PURGE = ['css/bootstrap.min.css']
+# Классы, которые появляются без упоминания в шаблонах
+STATIC_CSS_SAFELIST = [
+    'show', 'active', 'disabled', 'fade', 'collapse', 'collapsing',
+    'is-invalid', 'is-valid', 'invalid-feedback', 'errorlist',
+]
+
+# Общий кэш по умолчанию держит 300 записей и сверх них на каждой
+# записи удаляет треть: сессии и пользователи вытеснялись бы уже при
+# паре сотен активных пользователей. Лимит — сессия и пользователь на
+# активного пользователя плюс корзины ограничения запросов; сверх него
+# удаляется десятая часть
+SHARED_CACHE_OPTIONS = {'MAX_ENTRIES': 50000, 'CULL_FREQUENCY': 10}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Сессии и пользователь запроса: выход, смена пароля и блокировка
+    # должны сразу быть видны всем процессам, поэтому кэш общий. Там же
+    # корзины ограничения запросов, иначе лимит умножится на число
+    # процессов. Память процесса допустима только при DEBUG (см.
+    # core.auth). Файлы общие лишь для процессов одного сервера и
+    # перечисляются при каждой записи: для нескольких серверов или
+    # большего числа пользователей нужен memcached или redis
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'shared',
+        'OPTIONS': SHARED_CACHE_OPTIONS,
+    } if DEBUG else {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache'),
+        'OPTIONS': SHARED_CACHE_OPTIONS,
+    },
+}
+
+POSTS_CACHE_ALIAS = 'default'
+POSTS_FEED_CACHE_TIMEOUT = 60 * 15
+POSTS_DETAIL_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Группы по slug и авторы по username: записей в словаре процесса,
+# время жизни в общем кэше и через сколько обращений счётчики
+# попаданий сбрасываются в общий кэш
+POSTS_LOOKUP_LOCAL_SIZE = 1000
+POSTS_LOOKUP_CACHE_TIMEOUT = 60 * 60
+POSTS_LOOKUP_STATS_FLUSH = 100
+
+# 'offset' — нумерованные страницы, 'offset_no_count' — они же без
+# COUNT(*) там, где число постов не хранится, 'cursor' — пагинация по ключу
+POSTS_PAGINATION = 'offset'
+
+# Посты авторов, у которых подписчиков больше этого числа, не
+# раскладываются по лентам подписок, а подмешиваются при чтении
+POSTS_TIMELINE_FANOUT_LIMIT = 1000
+# Сколько последних постов автора копируется в ленту при подписке
+POSTS_TIMELINE_BACKFILL_LIMIT = 100
+
+# Бюджеты считаются для авторизованного пользователя с пустым кэшем
+# и включают чтение сессии и пользователя
+SQL_BUDGETS = {
+    'posts:index': 4,
+    'posts:group_list': 4,
+    'posts:group_index': 4,
+    # Месяцы и группы сводки автора при пустом кэше
+    'posts:profile': 7,
+    'posts:follow_index': 6,
+    'posts:profile_follow': 11,
+    'posts:profile_unfollow': 6,
+    'posts:post_detail': 3,
+    'posts:search': 4,
+    'posts:index_rss': 3,
+    'posts:index_atom': 3,
+    'posts:group_rss': 3,
+    'posts:group_atom': 3,
+    'posts:profile_rss': 3,
+    'posts:profile_atom': 3,
+    'posts:api_posts': 1,
+    'posts:api_post_detail': 1,
+    'posts:api_groups': 1,
+    'posts:api_group_detail': 2,
+    'posts:api_group_posts': 2,
+    'posts:api_profile_detail': 2,
+    'posts:api_profile_posts': 2,
+    # Сами посты читаются уже после ответа, при отдаче потока
+    'posts:profile_export': 3,
+    'posts:group_export': 3,
+    'posts:post_create': 13,
+    'posts:post_edit': 9,
+}
+SQL_BUDGET_SLOWEST = 3
+
+THROTTLE_CACHE_ALIAS = 'shared'
+# Корзины токенов изменяющих запросов: (скорость, размер всплеска)
+# для вошедшего пользователя и для IP-адреса
+THROTTLE_RATES = {
+    'post_create': {'user': ('10/m', 10), 'ip': ('60/m', 60)},
+    'post_edit': {'user': ('20/m', 20), 'ip': ('60/m', 60)},
+    'follow': {'user': ('30/m', 30), 'ip': ('120/m', 120)},
+    'signup': {'ip': ('5/h', 5)},
+}
+
+# Сессия и пользователь запроса читаются из кэша, база — при промахе
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'shared'
+# ModelBackend остаётся для сессий, открытых до кэширования: в них
+# записан его путь, и без него в списке все бы разлогинились
+AUTHENTICATION_BACKENDS = [
+    'core.auth.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+AUTH_USER_CACHE_ALIAS = 'shared'
+AUTH_USER_CACHE_TIMEOUT = 60 * 5
+
+# Очередь фоновых задач: обработчики запускает manage.py run_workers
+TASKS_WORKERS = 2
+TASKS_BATCH_SIZE = 20
+TASKS_POLL_INTERVAL = 1.0
+TASKS_MAX_ATTEMPTS = 5
+# Повторы через 2, 4, 8... секунд, но не реже раза в 10 минут
+TASKS_BACKOFF_BASE = 2
+TASKS_BACKOFF_MAX = 60 * 10
+# Задача, которая дольше этого числится за обработчиком, считается
+# брошенной и забирается заново
+TASKS_LOCK_TIMEOUT = 60 * 5
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
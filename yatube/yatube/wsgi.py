@@ -3,3 +3,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 application = get_wsgi_application()
+
+# Шаблоны компилируются до первого запроса к процессу
+from core.loaders import warm_templates  # noqa: E402
+
+warm_templates()